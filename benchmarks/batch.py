@@ -0,0 +1,56 @@
+"""
+Report the throughput of the NumPy batch solver against one SolverSystem per
+dimension set, and the largest difference between their solutions.
+
+    python -m benchmarks.batch --steps 1000 10000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from slvstopy import Slvstopy
+
+from benchmarks.synthetic import SAMPLE_FILE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", default=SAMPLE_FILE)
+    parser.add_argument("--constraint", default="0000000d")
+    parser.add_argument("--track", nargs="+", default=["00060000", "00070000"])
+    parser.add_argument("--steps", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    system_factory = Slvstopy(file_path=args.file)
+    solver = system_factory.batch_solver()
+
+    for steps in args.steps:
+        values = np.linspace(0.0, 360.0, steps)
+
+        start = time.perf_counter()
+        expected = system_factory.sweep(args.constraint, values, track=args.track)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = solver.solve(
+            {args.constraint: values}, track=args.track, chunk_size=args.chunk_size
+        )
+        batched = time.perf_counter() - start
+
+        same = result.results == expected.results
+        error = np.nanmax(
+            np.abs(result.coordinates[same] - expected.coordinates[same]), initial=0.0,
+        )
+        print(f"steps:      {steps}")
+        print(f"per system: {serial * 1000:.0f} ms ({steps / serial:.0f}/s)")
+        print(
+            f"batch:      {batched * 1000:.0f} ms ({steps / batched:.0f}/s, "
+            f"{serial / batched:.1f}x)"
+        )
+        print(f"results:    {same.mean():.1%} equal, max difference {error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
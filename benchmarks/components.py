@@ -0,0 +1,76 @@
+"""
+Compare solving a model of many disjoint linkages, each drawn in its own
+workplane, as one system with solving each connected component as its own
+system, and with solving only the component of one queried point.
+
+    python -m benchmarks.components --copies 10 50 200 --workers 4
+"""
+import argparse
+import time
+
+from slvstopy import Slvstopy
+from slvstopy.components import find_components, query_component, solve_components
+from slvstopy.constants import EntityType
+from slvstopy.plan import compile_plan
+
+from benchmarks.synthetic import SAMPLE_FILE, replicate_linkages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", default=SAMPLE_FILE)
+    parser.add_argument("--copies", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    template = Slvstopy(file_path=args.file)
+
+    for copies in args.copies:
+        entities, constraints = replicate_linkages(
+            template.entity_definition, template.constraint_definition, copies
+        )
+
+        start = time.perf_counter()
+        system, _ = compile_plan(entities, constraints).replay()
+        result = system.solve()
+        whole = time.perf_counter() - start
+
+        start = time.perf_counter()
+        components = find_components(entities, constraints)
+        analysis = time.perf_counter() - start
+        sizes = sorted({component.size for component in components})
+        if len(components) != copies or len(sizes) != 1:
+            raise RuntimeError(
+                f"Expected {copies} identical components, found {len(components)} "
+                f"{sizes}"
+            )
+
+        start = time.perf_counter()
+        solution = solve_components(components, workers=args.workers)
+        split = time.perf_counter() - start
+
+        target = next(
+            record.h
+            for record in reversed(entities)
+            if record.type == EntityType.POINT_IN_2D
+        )
+        start = time.perf_counter()
+        query = query_component(components, [target])
+        system, _ = query.compile().replay()
+        system.solve()
+        queried = time.perf_counter() - start
+
+        print(
+            f"{copies:4d} copies: {len(components)} components {sizes}, "
+            f"analysis {analysis * 1000:.1f} ms"
+        )
+        print(f"  one system: {whole * 1000:.0f} ms (result {result})")
+        print(
+            f"  components: {split * 1000:.0f} ms (result {solution.result}, "
+            f"{whole / split:.1f}x)"
+        )
+        print(f"  query {target}: {queried * 1000:.1f} ms ({whole / queried:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Report how long importing slvstopy takes in a new interpreter, for parsing only
+and for solving, and whether python_solvespace and numpy were loaded.
+
+    python -m benchmarks.import_time --repeat 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "package": "import slvstopy",
+    "parser": "from slvstopy import iter_records, EntityRecord",
+    "solver": "from slvstopy import Slvstopy",
+}
+
+SCRIPT = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(elapsed, "python_solvespace" in sys.modules, "numpy" in sys.modules)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, statement in STATEMENTS.items():
+        timings = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, "-c", SCRIPT.format(statement=statement)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            timings.append(float(output[0]))
+        print(
+            f"{name:8s} {statistics.median(timings) * 1000:7.1f} ms  "
+            f"python_solvespace={output[1]} numpy={output[2]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
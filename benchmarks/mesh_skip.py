@@ -0,0 +1,47 @@
+"""
+Compare loading a model with a large mesh tail through the text parser and the
+memory mapped parser.
+
+    python -m benchmarks.mesh_skip --triangles 200000
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+from slvstopy import Slvstopy
+
+from benchmarks.synthetic import write_model_with_mesh
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--triangles", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "mesh.slvs")
+        write_model_with_mesh(path, args.triangles)
+        size = os.path.getsize(path) / 2 ** 20
+
+        text = min(
+            timeit.repeat(
+                lambda: Slvstopy(file_path=path), number=1, repeat=args.repeat
+            )
+        )
+        mapped = min(
+            timeit.repeat(
+                lambda: Slvstopy(file_path=path, memory_map=True),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+
+    print(f"file size:  {size:.1f} MiB ({args.triangles} triangles)")
+    print(f"text:       {text * 1000:.1f} ms")
+    print(f"memory map: {mapped * 1000:.1f} ms ({text / mapped:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Report the speedup of a process pool sweep over the single process sweep for
+an increasing number of workers.
+
+    python -m benchmarks.parallel_sweep --steps 20000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from slvstopy import Slvstopy
+
+from benchmarks.synthetic import SAMPLE_FILE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file", default=SAMPLE_FILE)
+    parser.add_argument("--constraint", default="0000000d")
+    parser.add_argument("--track", nargs="+", default=["00060000", "00070000"])
+    parser.add_argument("--steps", type=int, default=20000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=_worker_counts(os.cpu_count() or 1)
+    )
+    args = parser.parse_args()
+
+    system_factory = Slvstopy(file_path=args.file)
+    values = np.linspace(0.0, 360.0, args.steps)
+
+    start = time.perf_counter()
+    system_factory.sweep(args.constraint, values, track=args.track)
+    serial = time.perf_counter() - start
+
+    print(f"steps:      {args.steps}")
+    print(f"serial:     {serial * 1000:.0f} ms")
+    for workers in args.workers:
+        start = time.perf_counter()
+        system_factory.sweep(args.constraint, values, track=args.track, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{workers:3d} workers: {elapsed * 1000:.0f} ms "
+            f"({serial / elapsed:.1f}x, {serial / elapsed / workers:.0%} efficiency)"
+        )
+
+
+def _worker_counts(cpus):
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+if __name__ == "__main__":
+    main()
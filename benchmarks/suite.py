@@ -0,0 +1,143 @@
+"""
+Time parsing, building, solving and extracting generated models of increasing
+size, write the timings as JSON and compare them with a saved baseline.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 1.25
+
+Models are generated into a temporary directory, nothing is downloaded. Exits
+with status 1 if any phase is slower than the baseline by more than the
+threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+from slvstopy import Instrumentation, Slvstopy
+from slvstopy.constants import PACKAGE_VERSION
+
+from benchmarks.synthetic import (
+    write_linkage_chain,
+    write_model_with_mesh,
+    write_point_grid,
+)
+
+# Suite phase -> instrumentation phases it is made of
+PHASES = {
+    "parse": ("read", "seed"),
+    "build": ("entities", "constraints", "build"),
+    "solve": ("solve",),
+    "extract": ("extract",),
+}
+
+# Model name -> function writing a model of the given size to a path
+GENERATORS: Dict[str, Callable[[str, int], None]] = {
+    "chain": write_linkage_chain,
+    "grid": write_point_grid,
+    "mesh": write_model_with_mesh,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--chain", type=int, nargs="*", default=[10, 100, 400])
+    parser.add_argument("--grid", type=int, nargs="*", default=[5, 10, 20])
+    parser.add_argument("--mesh", type=int, nargs="*", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    cases = [(model, size) for model in GENERATORS for size in getattr(args, model)]
+    results = {
+        "meta": {
+            "slvstopy": PACKAGE_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": run(cases, args.repeat),
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(baseline["results"], results["results"], args.threshold):
+            sys.exit(1)
+
+
+def run(cases: List[Tuple[str, int]], repeat: int) -> List[Dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for model, size in cases:
+            path = os.path.join(directory, f"{model}-{size}.slvs")
+            GENERATORS[model](path, size)
+            result = measure(path, repeat)
+            result.update(model=model, size=size, bytes=os.path.getsize(path))
+            results.append(result)
+            print(
+                f"{model:6s}{size:8d}  "
+                + "  ".join(
+                    f"{phase} {result[phase] * 1000:9.2f} ms" for phase in PHASES
+                ),
+                flush=True,
+            )
+    return results
+
+
+def measure(path: str, repeat: int) -> Dict:
+    """Best time of each phase over `repeat` loads and solves of `path`."""
+    best = {phase: float("inf") for phase in PHASES}
+
+    for _ in range(repeat):
+        instrumentation = Instrumentation()
+        system_factory = Slvstopy(file_path=path, instrumentation=instrumentation)
+        solution = system_factory.solve()
+
+        timings = instrumentation.report.phases
+        for phase, parts in PHASES.items():
+            best[phase] = min(
+                best[phase], sum(timings.get(part, 0.0) for part in parts)
+            )
+
+    best.update(
+        entities=len(system_factory.entity_definition),
+        constraints=len(system_factory.constraint_definition),
+        result=int(solution.result),
+    )
+    return best
+
+
+def compare(baseline: List[Dict], results: List[Dict], threshold: float) -> bool:
+    """Print the ratio of each phase to the baseline, True if any regressed."""
+    previous = {(result["model"], result["size"]): result for result in baseline}
+    regressed = False
+
+    for result in results:
+        before = previous.get((result["model"], result["size"]))
+        if before is None:
+            continue
+        ratios = []
+        for phase in PHASES:
+            ratio = result[phase] / before[phase] if before[phase] else 1.0
+            flag = "!" if ratio > threshold else " "
+            regressed |= ratio > threshold
+            ratios.append(f"{phase} {ratio:5.2f}x{flag}")
+        print(f"{result['model']:6s}{result['size']:8d}  " + "  ".join(ratios))
+
+    return regressed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import copy
+import random
+from typing import Dict, List, TextIO
+
+from slvstopy.components import CONSTRAINT_REFERENCES, shared_entities
+from slvstopy.params import GROUP_DERIVED
+
+SAMPLE_FILE = "tests/files/crank_rocker.slvs"
+
+
+def write_mesh_tail(handle: TextIO, triangles: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+
+    for _ in range(triangles):
+        coordinates = " ".join(f"{rng.uniform(-100, 100):.20f}" for _ in range(9))
+        normals = " ".join(f"{rng.uniform(-1, 1):.20f}" for _ in range(9))
+        handle.write(f"Triangle 00000000 ff000000  {coordinates}  {normals}\n")
+
+    for surface in range(triangles // 100):
+        handle.write(f"Surface {surface:08x} 00000000 00000000 1 1\n")
+        for _ in range(4):
+            handle.write("SCtrl 0.0 0.0 0.0 1.0\n")
+        handle.write("TrimBy 00000001 0 0.0 0.0 0.0  0.0 0.0 0.0\n")
+        handle.write("AddSurface\n")
+
+    for curve in range(triangles // 100):
+        handle.write(f"Curve {curve:08x} 0 0 1 00000000 00000000\n")
+        handle.write("CCtrl 0.0 0.0 0.0 1.0\nCCtrl 1.0 1.0 0.0 1.0\n")
+        handle.write("CurvePt 0 0.0 0.0 0.0\nCurvePt 0 1.0 1.0 0.0\n")
+        handle.write("AddCurve\n")
+
+
+def write_model_with_mesh(path: str, triangles: int, template: str = SAMPLE_FILE):
+    with open(template, encoding="utf8", errors="ignore") as f:
+        body = f.read()
+
+    with open(path, "w", encoding="utf8") as f:
+        f.write(body)
+        write_mesh_tail(f, triangles)
+
+
+def replicate_linkages(entity_definition, constraint_definition, copies: int):
+    """
+    Records of `copies` disjoint copies of a model. The reference entities are
+    shared, every other handle, including the sketch workplane each copy is
+    drawn in, is offset per copy (up to 2048 copies).
+    """
+    shared = shared_entities(entity_definition, constraint_definition)
+
+    def rename(entity_id, copy_index):
+        if entity_id is None or entity_id in shared:
+            return entity_id
+        return f"{int(entity_id, 16) + (copy_index << 20):08x}"
+
+    entities = [record for record in entity_definition if record.h in shared]
+    constraints = []
+    for copy_index in range(copies):
+        for record in entity_definition:
+            if record.h in shared:
+                continue
+            record = copy.copy(record)
+            record.h = rename(record.h, copy_index)
+            record.point = tuple(rename(point, copy_index) for point in record.point)
+            record.normal = rename(record.normal, copy_index)
+            record.distance = rename(record.distance, copy_index)
+            record.workplane = rename(record.workplane, copy_index)
+            entities.append(record)
+
+        for record in constraint_definition:
+            record = copy.copy(record)
+            record.h = f"{int(record.h, 16) + (copy_index << 16):08x}"
+            for field in CONSTRAINT_REFERENCES + ("workplane",):
+                setattr(record, field, rename(getattr(record, field), copy_index))
+            constraints.append(record)
+
+    return entities, constraints
+
+
+# Sketch workplane and group of the sample file, generated entities use both
+SKETCH_WORKPLANE = "80020000"
+SKETCH_GROUP = "00000002"
+
+
+class SketchWriter(object):
+    """
+    Builds a .slvs file from the groups and reference entities of a template
+    file plus generated points, lines and constraints in the template's sketch
+    workplane. Params are written for every generated point, so the file also
+    opens in SolveSpace.
+    """
+
+    def __init__(self, template: str = SAMPLE_FILE):
+        with open(template, encoding="utf8", errors="ignore") as f:
+            header, _, body = f.read().partition("\n")
+        self.header = header
+        self.blocks: Dict[str, List[str]] = {
+            "Group": [],
+            "Param": [],
+            "Request": [],
+            "Entity": [],
+        }
+        for block in body.split("\n\n"):
+            block = block.strip("\n")
+            kind = block.split(".", 1)[0]
+            if kind == "Group" or (kind in self.blocks and _is_reference(block)):
+                self.blocks[kind].append(block)
+        self.constraints: List[str] = []
+        self._request = 0x100
+        self._constraint = 0
+
+    def point(self, x: float, y: float) -> str:
+        request = self._add_request(101)
+        return self._add_point(request, 0, x, y)
+
+    def line(self, start, end):
+        """Add a line segment, returns the ids of its start and end points."""
+        request = self._add_request(200)
+        line = f"{request:04x}0000"
+        points = (
+            self._add_point(request, 1, *start),
+            self._add_point(request, 2, *end),
+        )
+        self._add_block(
+            "Entity",
+            [
+                ("h.v", line),
+                ("type", 11000),
+                ("construction", 0),
+                ("point[0].v", points[0]),
+                ("point[1].v", points[1]),
+                ("workplane.v", SKETCH_WORKPLANE),
+                ("actVisible", 1),
+            ],
+        )
+        return points
+
+    def constraint(self, type: int, **fields) -> str:
+        self._constraint += 1
+        h = f"{self._constraint:08x}"
+        lines = [
+            ("h.v", h),
+            ("type", type),
+            ("group.v", SKETCH_GROUP),
+            ("workplane.v", SKETCH_WORKPLANE),
+        ]
+        if "valA" in fields:
+            lines.append(("valA", _number(fields.pop("valA"))))
+        lines += [(f"{key}.v", value) for key, value in fields.items()]
+        lines += [("other", 0), ("other2", 0), ("reference", 0)]
+        self.constraints.append(_format("Constraint", lines))
+        return h
+
+    def write(self, handle: TextIO) -> None:
+        handle.write(self.header + "\n\n\n")
+        for kind in ("Group", "Param", "Request", "Entity"):
+            for block in self.blocks[kind]:
+                handle.write(block + "\n\n")
+        for block in self.constraints:
+            handle.write(block + "\n\n")
+
+    def _add_request(self, type: int) -> int:
+        request = self._request
+        if request > 0x7FFF:
+            # Higher request numbers would set the group derived bit
+            raise ValueError("Too many requests for one file")
+        self._request += 1
+        self._add_block(
+            "Request",
+            [
+                ("h.v", f"{request:08x}"),
+                ("type", type),
+                ("workplane.v", SKETCH_WORKPLANE),
+                ("group.v", SKETCH_GROUP),
+                ("construction", 0),
+            ],
+        )
+        return request
+
+    def _add_point(self, request: int, index: int, x: float, y: float) -> str:
+        first = 16 + 3 * max(index - 1, 0)
+        for offset, value in enumerate((x, y)):
+            self._add_block(
+                "Param",
+                [
+                    ("h.v.", f"{request:04x}{first + offset:04x}"),
+                    ("val", _number(value)),
+                ],
+            )
+        h = f"{request:04x}{index:04x}"
+        self._add_block(
+            "Entity",
+            [
+                ("h.v", h),
+                ("type", 2001),
+                ("construction", 0),
+                ("workplane.v", SKETCH_WORKPLANE),
+                ("actPoint.x", _number(x)),
+                ("actPoint.y", _number(y)),
+                ("actVisible", 1),
+            ],
+        )
+        return h
+
+    def _add_block(self, kind: str, lines) -> None:
+        self.blocks[kind].append(_format(kind, lines))
+
+
+def _is_reference(block: str) -> bool:
+    # Requests 1-3 are the reference planes, 8000xxxx handles are derived from
+    # groups (ie. the sketch workplane)
+    handle = int(block.split("=", 1)[1].split("\n", 1)[0], 16)
+    if block.startswith("Request."):
+        return handle <= 3
+    return (handle >> 16) <= 3 or bool(handle & GROUP_DERIVED)
+
+
+def _format(kind: str, lines) -> str:
+    return "\n".join(f"{kind}.{key}={value}" for key, value in lines) + f"\nAdd{kind}"
+
+
+def _number(value: float) -> str:
+    return f"{value:.20f}"
+
+
+def write_linkage_chain(path: str, links: int, length: float = 10.0, seed: int = 0):
+    """
+    A chain of `links` line segments joined end to end, with a length on each
+    link and both ends of the chain dragged in place.
+    """
+    rng = random.Random(seed)
+    sketch = SketchWriter()
+
+    joints = [(0.0, 0.0)] + [
+        (length * index, rng.uniform(-0.2, 0.2) * length) for index in range(1, links)
+    ]
+    joints.append((length * links, 0.0))
+
+    previous = None
+    for index in range(links):
+        start, end = sketch.line(joints[index], joints[index + 1])
+        # Longer than the span, so the chain can always close
+        sketch.constraint(30, valA=length * 1.05, ptA=start, ptB=end)
+        if previous is None:
+            sketch.constraint(200, ptA=start)
+        else:
+            sketch.constraint(20, ptA=previous, ptB=start)
+        previous = end
+    sketch.constraint(200, ptA=previous)
+
+    with open(path, "w", encoding="utf8") as f:
+        sketch.write(f)
+
+
+def write_point_grid(path: str, size: int, spacing: float = 10.0, seed: int = 0):
+    """
+    A `size` by `size` grid of points with a distance between each point and
+    its right and lower neighbours, starting from jittered positions. The first
+    point is dragged in place.
+    """
+    rng = random.Random(seed)
+    sketch = SketchWriter()
+
+    def jitter():
+        return rng.uniform(-0.1, 0.1) * spacing
+
+    grid = [
+        [
+            sketch.point(column * spacing + jitter(), -row * spacing + jitter())
+            for column in range(size)
+        ]
+        for row in range(size)
+    ]
+    sketch.constraint(200, ptA=grid[0][0])
+    for row in range(size):
+        for column in range(size):
+            if column + 1 < size:
+                sketch.constraint(
+                    30, valA=spacing, ptA=grid[row][column], ptB=grid[row][column + 1]
+                )
+            if row + 1 < size:
+                sketch.constraint(
+                    30, valA=spacing, ptA=grid[row][column], ptB=grid[row + 1][column]
+                )
+
+    with open(path, "w", encoding="utf8") as f:
+        sketch.write(f)
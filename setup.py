@@ -18,6 +18,6 @@ setup(
     package_dir={"": "src"},
     packages=find_packages(where="src"),
     python_requires=">3.6",
-    install_requires=["Cython>=0.29.15", "python-solvespace==3.0.2"],
+    install_requires=["Cython>=0.29.15", "numpy>=1.17", "python-solvespace==3.0.2"],
     license="MPL2",
 )
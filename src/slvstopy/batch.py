@@ -0,0 +1,753 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from python_solvespace import Constraint, ResultFlag
+
+from slvstopy.plan import ConstructionPlan
+
+# Largest residual of a converged instance, SolveSpace's CONVERGE_TOLERANCE
+CONVERGE_TOLERANCE = 1e-8
+# Newton iterations before an instance is reported as DIDNT_CONVERGE
+MAX_ITERATIONS = 50
+# A step is halved while it grows the residual norm by more than this factor,
+# at most MAX_HALVINGS times. Newton steps often grow the residual on the way
+# to the solution, and halving those would leave SolveSpace's path
+GROWTH_LIMIT = 10.0
+MAX_HALVINGS = 8
+# Added to the diagonal of J J^T, so redundant constraints do not make it singular
+REGULARISATION = 1e-12
+# Smallest magnitude of a Jacobian row left after removing its components
+# along the rows before it, SolveSpace's RANK_MAG_TOLERANCE
+RANK_TOLERANCE = 1e-4
+
+# Projections are linear in at most 10 parameters: a 3D point, the workplane
+# origin and the workplane normal
+PROJECTION_WIDTH = 10
+
+Values = Union[float, Sequence[float], np.ndarray]
+
+
+class BatchResult(object):
+    __slots__ = ("handles", "coordinates", "results", "iterations")
+
+    def __init__(
+        self,
+        handles: Sequence[str],
+        coordinates: np.ndarray,
+        results: np.ndarray,
+        iterations: np.ndarray,
+    ):
+        # tracked entity ids, in the order of the second axis of coordinates
+        self.handles = tuple(handles)
+        # (batch, entities, dims) solved parameters, NaN padded for entities
+        # with fewer than `dims` parameters
+        self.coordinates = coordinates
+        # (batch,) ResultFlag of each instance
+        self.results = results
+        # (batch,) Newton iterations taken by each instance
+        self.iterations = iterations
+
+
+class _Model(NamedTuple):
+    """A plan compiled into parameter classes and equation tables."""
+
+    # Classes are the unknowns first, then constants, then a constant zero
+    unknowns: int
+    initial: np.ndarray
+    # entity id -> classes of its parameters
+    entity_columns: Dict[str, np.ndarray]
+    # (projections, PROJECTION_WIDTH) classes each projection depends on, and
+    # the derivatives of points projected onto their own workplane
+    projection_columns: np.ndarray
+    projection_template: np.ndarray
+    # Projections of 3D points
+    spatial: np.ndarray
+    # (projection pairs, dimension), (projection pairs, axis),
+    # (projection quadruples, sign, dimension or -1)
+    distances: Tuple[np.ndarray, ...]
+    differences: Tuple[np.ndarray, ...]
+    cosines: Tuple[np.ndarray, ...]
+    # (normals, 4) classes of the normals of the solved group
+    quaternions: np.ndarray
+    equations: int
+    dimension_values: np.ndarray
+    # constraint id -> dimension, None for constraints outside the solved group
+    dimension_columns: Dict[str, Optional[int]]
+
+
+class BatchSolver(object):
+    """
+    Solves one planar model for a whole batch of dimension sets at once, with
+    residuals and Jacobians stacked along a leading batch axis and a damped
+    Newton iteration written in NumPy. No SolverSystem is built.
+
+    The model is read from the ConstructionPlan, so it is the model SolveSpace
+    solves, and it is solved the way SolveSpace solves it: parameters that a
+    coincident, horizontal or vertical constraint makes equal are merged,
+    where-dragged points are fixed and each step is the least squares step of
+    smallest norm. Supported are points, normals, workplanes and lines, with
+    coincident, distance, angle, perpendicular, horizontal, vertical and
+    where-dragged constraints in a workplane. Anything else raises
+    NotImplementedError.
+
+    Like SolveSpace, an instance whose Jacobian loses rank (at the solution,
+    or at the initial values if it does not converge) is INCONSISTENT, such as
+    a linkage solved into a straight line.
+    """
+
+    def __init__(self, plan: ConstructionPlan):
+        self.plan = plan
+        self._model = _Compiler(plan).compile()
+
+    @property
+    def handles(self) -> Tuple[str, ...]:
+        """Entity ids with parameters, tracked by default."""
+        return tuple(self._model.entity_columns)
+
+    def solve(
+        self,
+        overrides: Optional[Dict[str, Values]] = None,
+        track: Optional[Sequence[str]] = None,
+        chunk_size: int = 4096,
+    ) -> BatchResult:
+        """
+        Solve one instance per dimension set. `overrides` maps constraint ids
+        to a value or a (batch,) array of values, broadcast against each other,
+        and `track` lists the entity ids to return (every point and normal if
+        None). Instances are solved `chunk_size` at a time.
+        """
+        dimensions = self._dimensions(overrides or {})
+        handles = self.handles if track is None else tuple(track)
+        for entity_id in handles:
+            if entity_id not in self._model.entity_columns:
+                raise KeyError(f"Entity {entity_id} does not have parameters")
+
+        size = len(dimensions)
+        counts = [len(self._model.entity_columns[entity_id]) for entity_id in handles]
+        width = max(counts, default=0)
+        coordinates = np.full((size, len(handles), width), np.nan)
+        results = np.empty(size, dtype=np.int64)
+        iterations = np.empty(size, dtype=np.int64)
+
+        for start in range(0, size, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            values, converged, full_rank, iterations[chunk] = self._newton(
+                dimensions[chunk]
+            )
+            results[chunk] = np.where(
+                full_rank,
+                np.where(converged, ResultFlag.OKAY, ResultFlag.DIDNT_CONVERGE),
+                ResultFlag.INCONSISTENT,
+            )
+            for row, entity_id in enumerate(handles):
+                columns = self._model.entity_columns[entity_id]
+                coordinates[chunk, row, : len(columns)] = values[:, columns]
+
+        return BatchResult(handles, coordinates, results, iterations)
+
+    def _dimensions(self, overrides: Dict[str, Values]) -> np.ndarray:
+        """(batch, dimensions) values of every dimensional constraint."""
+        columns = []
+        values = []
+        for constraint_id, value in overrides.items():
+            try:
+                columns.append(self._model.dimension_columns[constraint_id])
+            except KeyError:
+                raise KeyError(
+                    f"Constraint {constraint_id} does not have a value to override"
+                ) from None
+            values.append(np.asarray(value, dtype=np.float64))
+
+        arrays = np.broadcast_arrays(*values) if values else []
+        shape = arrays[0].shape if arrays else ()
+        if len(shape) > 1:
+            raise ValueError("Expected a value or a (batch,) array per constraint")
+        size = shape[0] if shape else 1
+
+        dimensions = np.repeat(self._model.dimension_values[None], size, axis=0)
+        for column, array in zip(columns, arrays):
+            if column is not None:
+                dimensions[:, column] = array
+        return dimensions
+
+    def _newton(
+        self, dimensions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Solved class values, convergence, full rank and iterations of a chunk."""
+        size = len(dimensions)
+        unknowns = self._model.unknowns
+        values = np.repeat(self._model.initial[None], size, axis=0)
+        iterations = np.zeros(size, dtype=np.int64)
+        identity = np.eye(self._model.equations)
+
+        residuals, jacobian = self._evaluate(values, dimensions)
+        assert jacobian is not None
+        initial_rank = _full_rank(jacobian[:, :, :unknowns])
+        for _ in range(MAX_ITERATIONS):
+            converged = np.abs(residuals).max(axis=1, initial=0.0) < CONVERGE_TOLERANCE
+            active = ~converged & np.isfinite(residuals).all(axis=1)
+            if not active.any():
+                break
+            assert jacobian is not None
+
+            # Least squares step of smallest norm: J^T (J J^T)^-1 r
+            j = jacobian[active, :, :unknowns]
+            normal = j @ j.transpose(0, 2, 1) + REGULARISATION * identity
+            multipliers = np.linalg.solve(normal, residuals[active, :, None])
+            step = np.zeros((size, unknowns))
+            step[active] = (j.transpose(0, 2, 1) @ multipliers)[..., 0]
+
+            # Damped: halve the step of instances whose residual grows too much
+            limit = GROWTH_LIMIT ** 2 * np.einsum("bm,bm->b", residuals, residuals)
+            scale = np.ones(size)
+            for _ in range(MAX_HALVINGS + 1):
+                trial = values.copy()
+                trial[:, :unknowns] -= scale[:, None] * step
+                trial_residuals, _ = self._evaluate(trial, dimensions, False)
+                worse = active & ~(
+                    np.einsum("bm,bm->b", trial_residuals, trial_residuals) <= limit
+                )
+                if not worse.any():
+                    break
+                scale[worse] *= 0.5
+
+            values = trial
+            iterations += active
+            residuals, jacobian = self._evaluate(values, dimensions)
+
+        converged = np.abs(residuals).max(axis=1, initial=0.0) < CONVERGE_TOLERANCE
+        assert jacobian is not None
+        full_rank = np.where(
+            converged, _full_rank(jacobian[:, :, :unknowns]), initial_rank
+        )
+        return values, converged, full_rank, iterations
+
+    def _evaluate(
+        self, values: np.ndarray, dimensions: np.ndarray, jacobian: bool = True
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        (batch, equations) residuals and, with `jacobian`, their (batch,
+        equations, classes) derivatives.
+        """
+        size = len(values)
+        uv, derivatives = self._project(values, jacobian)
+        residuals = np.empty((size, self._model.equations))
+        rows = []
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            offset = 0
+            for family in (
+                self._distance,
+                self._difference,
+                self._cosine,
+                self._quaternion,
+            ):
+                count, residual, gradients, columns = family(
+                    values, dimensions, uv, derivatives, jacobian
+                )
+                row = np.arange(offset, offset + count)
+                residuals[:, row] = residual
+                if jacobian:
+                    rows.append((row, gradients, columns))
+                offset += count
+
+        if not jacobian:
+            return residuals, None
+
+        result = np.zeros((size, self._model.equations, len(self._model.initial)))
+        for row, gradients, columns in rows:
+            # Each assignment touches every row once, so repeated columns add up
+            for slot in range(columns.shape[1]):
+                result[:, row, columns[:, slot]] += gradients[:, :, slot]
+        return residuals, result
+
+    def _project(
+        self, values: np.ndarray, jacobian: bool
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        (batch, projections, 2) workplane coordinates of every projected point
+        and their (batch, projections, 2, PROJECTION_WIDTH) derivatives.
+        """
+        size = len(values)
+        parameters = values[:, self._model.projection_columns]
+        uv = parameters[..., :2].copy()
+        derivatives = (
+            np.repeat(self._model.projection_template[None], size, axis=0)
+            if jacobian
+            else None
+        )
+
+        spatial = self._model.spatial
+        if len(spatial):
+            point = parameters[:, spatial]
+            offset = point[..., 0:3] - point[..., 3:6]
+            w, x, y, z = (point[..., 6 + index] for index in range(4))
+            u_axis = np.stack(
+                (
+                    w * w + x * x - y * y - z * z,
+                    2 * (w * z + x * y),
+                    2 * (x * z - w * y),
+                ),
+                axis=-1,
+            )
+            v_axis = np.stack(
+                (
+                    2 * (x * y - w * z),
+                    w * w - x * x + y * y - z * z,
+                    2 * (w * x + y * z),
+                ),
+                axis=-1,
+            )
+            uv[:, spatial, 0] = np.einsum("...i,...i->...", offset, u_axis)
+            uv[:, spatial, 1] = np.einsum("...i,...i->...", offset, v_axis)
+
+            if derivatives is not None:
+                # d(axis)/d(w, x, y, z), (batch, spatial, 3, 4)
+                du = 2 * np.stack(
+                    (
+                        np.stack((w, x, -y, -z), axis=-1),
+                        np.stack((z, y, x, w), axis=-1),
+                        np.stack((-y, z, -w, x), axis=-1),
+                    ),
+                    axis=-2,
+                )
+                dv = 2 * np.stack(
+                    (
+                        np.stack((-z, y, x, -w), axis=-1),
+                        np.stack((w, -x, y, -z), axis=-1),
+                        np.stack((x, w, z, y), axis=-1),
+                    ),
+                    axis=-2,
+                )
+                projected = derivatives[:, spatial]
+                projected[..., 0, 0:3] = u_axis
+                projected[..., 0, 3:6] = -u_axis
+                projected[..., 0, 6:10] = np.einsum("...i,...ij->...j", offset, du)
+                projected[..., 1, 0:3] = v_axis
+                projected[..., 1, 3:6] = -v_axis
+                projected[..., 1, 6:10] = np.einsum("...i,...ij->...j", offset, dv)
+                derivatives[:, spatial] = projected
+
+        return uv, derivatives
+
+    def _distance(self, values, dimensions, uv, derivatives, jacobian):
+        points, dimension = self._model.distances
+        delta = uv[:, points[:, 0]] - uv[:, points[:, 1]]
+        length = np.sqrt(np.einsum("bkj,bkj->bk", delta, delta))
+        residual = length - dimensions[:, dimension]
+        if not jacobian:
+            return len(points), residual, None, None
+
+        direction = delta / length[..., None]
+        gradients = _chain((direction, -direction), points, derivatives)
+        return len(points), residual, gradients, self._columns(points)
+
+    def _difference(self, values, dimensions, uv, derivatives, jacobian):
+        points, axis = self._model.differences
+        residual = uv[:, points[:, 0], axis] - uv[:, points[:, 1], axis]
+        if not jacobian:
+            return len(points), residual, None, None
+
+        first = derivatives[:, points[:, 0], axis]
+        second = derivatives[:, points[:, 1], axis]
+        gradients = np.concatenate((first, -second), axis=-1)
+        return len(points), residual, gradients, self._columns(points)
+
+    def _cosine(self, values, dimensions, uv, derivatives, jacobian):
+        points, sign, dimension = self._model.cosines
+        a = sign[:, None] * (uv[:, points[:, 0]] - uv[:, points[:, 1]])
+        b = uv[:, points[:, 2]] - uv[:, points[:, 3]]
+        length_a = np.sqrt(np.einsum("bkj,bkj->bk", a, a))
+        length_b = np.sqrt(np.einsum("bkj,bkj->bk", b, b))
+        cosine = np.einsum("bkj,bkj->bk", a, b) / (length_a * length_b)
+
+        # Perpendicular constraints have no dimension and a cosine of zero
+        angle = dimension >= 0
+        target = np.where(angle, np.cos(np.radians(dimensions[:, dimension])), 0.0)
+        # SolveSpace gains up the residual of angles near 0 and 180 degrees
+        magnitude = np.abs(target)
+        gain = np.where(angle & (magnitude > 0.99), 0.01 / (1.00001 - magnitude), 1.0)
+        residual = (cosine - target) * gain
+        if not jacobian:
+            return len(points), residual, None, None
+
+        product = (length_a * length_b)[..., None]
+        scaled = cosine[..., None]
+        da = b / product - scaled * a / (length_a ** 2)[..., None]
+        db = a / product - scaled * b / (length_b ** 2)[..., None]
+        da *= (gain * sign)[..., None]
+        db *= gain[..., None]
+        gradients = _chain((da, -da, db, -db), points, derivatives)
+        return len(points), residual, gradients, self._columns(points)
+
+    def _quaternion(self, values, dimensions, uv, derivatives, jacobian):
+        columns = self._model.quaternions
+        quaternion = values[:, columns]
+        magnitude = np.sqrt(np.einsum("bkj,bkj->bk", quaternion, quaternion))
+        residual = magnitude - 1.0
+        if not jacobian:
+            return len(columns), residual, None, None
+        return len(columns), residual, quaternion / magnitude[..., None], columns
+
+    def _columns(self, points: np.ndarray) -> np.ndarray:
+        """(rows, points * PROJECTION_WIDTH) classes the rows depend on."""
+        return self._model.projection_columns[points].reshape(
+            len(points), points.shape[1] * PROJECTION_WIDTH
+        )
+
+
+def _full_rank(jacobian: np.ndarray) -> np.ndarray:
+    """
+    Whether each (equations, unknowns) Jacobian has independent rows, by
+    SolveSpace's test: every row keeps a magnitude of at least RANK_TOLERANCE
+    once its components along the (non zero) rows before it are removed.
+    """
+    rows = np.nan_to_num(jacobian)
+    count = rows.shape[1]
+    magnitudes = np.zeros((len(rows), count))
+    tolerance = RANK_TOLERANCE ** 2
+    for row in range(count):
+        current = rows[:, row].copy()
+        for previous in range(row):
+            magnitude = magnitudes[:, previous]
+            dot = np.einsum("bj,bj->b", rows[:, previous], current)
+            ratio = np.divide(
+                dot, magnitude, out=np.zeros_like(dot), where=magnitude > tolerance
+            )
+            current -= ratio[:, None] * rows[:, previous]
+        rows[:, row] = current
+        magnitudes[:, row] = np.einsum("bj,bj->b", current, current)
+    return np.all(magnitudes > tolerance, axis=1)
+
+
+def _chain(
+    gradients: Sequence[np.ndarray], points: np.ndarray, derivatives: np.ndarray
+) -> np.ndarray:
+    """
+    Derivatives of each row by the classes of its projected points, from the
+    (batch, rows, 2) derivatives by each point's workplane coordinates.
+    """
+    return np.concatenate(
+        [
+            np.einsum("bkj,bkjs->bks", gradient, derivatives[:, points[:, index]])
+            for index, gradient in enumerate(gradients)
+        ],
+        axis=-1,
+    )
+
+
+class _Compiler(object):
+    """
+    Reads the entities and constraints of the solved group from a plan and
+    resolves every solver parameter to a class: a merged set of unknowns, or a
+    constant.
+    """
+
+    def __init__(self, plan: ConstructionPlan):
+        self.plan = plan
+        # Initial value and solver group of every parameter
+        self.values: List[float] = []
+        self.groups: List[int] = []
+        # slot -> (workplane slot, None for 3D points, parameters)
+        self.points: Dict[int, Tuple[Optional[int], Tuple[int, ...]]] = {}
+        self.normals: Dict[int, Tuple[int, ...]] = {}
+        # slot -> (origin slot, normal slot)
+        self.workplanes: Dict[int, Tuple[int, int]] = {}
+        # slot -> (point slot, point slot)
+        self.lines: Dict[int, Tuple[int, int]] = {}
+
+        self.parent: List[int] = []
+        # (parameter, value) fixed after every merge
+        self.pins: List[Tuple[int, float]] = []
+        # (point slot, workplane slot) -> projection index
+        self.projections: Dict[Tuple[int, int], int] = {}
+        self.distances: List[Tuple[int, int, int]] = []
+        self.differences: List[Tuple[int, int, int]] = []
+        # (projections of both lines, sign, dimension)
+        self.cosines: List[tuple] = []
+        self.dimension_values: List[float] = []
+        self.dimension_columns: Dict[str, Optional[int]] = {}
+
+    def compile(self) -> "_Model":
+        constraints = self._read_operations()
+
+        value_constraints = {
+            index: constraint_id
+            for constraint_id, (index, _) in self.plan.constraint_values.items()
+        }
+        # Constraints outside the solved group can be overridden, to no effect
+        self.dimension_columns = dict.fromkeys(self.plan.constraint_values)
+        for index, name, args, slots in constraints:
+            self._read_constraint(index, name, args, slots, value_constraints)
+
+        columns, initial, unknowns = self._classes()
+
+        entity_columns = {}
+        for entity_id, slot in self.plan.entity_slots.items():
+            params = self.points.get(slot, (None, None))[1] or self.normals.get(slot)
+            if params:
+                entity_columns[entity_id] = np.array(
+                    [columns[param] for param in params], dtype=np.intp
+                )
+
+        # The last class is a constant zero, padding short projections
+        pad = len(initial) - 1
+        projection_columns = np.full(
+            (len(self.projections), PROJECTION_WIDTH), pad, dtype=np.intp
+        )
+        template = np.zeros((len(self.projections), 2, PROJECTION_WIDTH))
+        spatial = []
+        for (point, workplane), index in self.projections.items():
+            point_workplane, params = self.points[point]
+            if point_workplane == workplane:
+                projection_columns[index, :2] = [columns[param] for param in params]
+                template[index, 0, 0] = template[index, 1, 1] = 1.0
+                continue
+            origin, normal = self.workplanes[workplane]
+            params = params + self.points[origin][1] + self.normals[normal]
+            projection_columns[index] = [columns[param] for param in params]
+            spatial.append(index)
+
+        quaternions = [
+            [columns[param] for param in params]
+            for params in self.normals.values()
+            if self.groups[params[0]] == self.solve_group
+        ]
+        return _Model(
+            unknowns=unknowns,
+            initial=initial,
+            entity_columns=entity_columns,
+            projection_columns=projection_columns,
+            projection_template=template,
+            spatial=np.array(spatial, dtype=np.intp),
+            distances=_table(self.distances, 2, np.intp),
+            differences=_table(self.differences, 2, np.intp),
+            cosines=_table(self.cosines, 4, np.float64, np.intp),
+            quaternions=np.array(quaternions, dtype=np.intp).reshape(-1, 4),
+            equations=len(self.distances)
+            + len(self.differences)
+            + len(self.cosines)
+            + len(quaternions),
+            # Perpendicular constraints read the unused last column
+            dimension_values=np.array(self.dimension_values + [0.0]),
+            dimension_columns=self.dimension_columns,
+        )
+
+    def _read_operations(self) -> List[Tuple[int, str, tuple, Dict[int, int]]]:
+        """Record the entities, return the constraints of the solved group."""
+        group = 0
+        constraints = []
+
+        for index, (method, slot, args, references) in enumerate(self.plan.operations):
+            name = method.__name__
+            slots = dict(references)
+
+            if name == "set_group":
+                group = args[0]
+            elif slot is None:
+                constraints.append((index, name, args, slots, group))
+            elif name == "add_point_2d":
+                self.points[slot] = (slots[2], self._parameters(args[:2], group))
+            elif name == "add_point_3d":
+                self.points[slot] = (None, self._parameters(args[:3], group))
+            elif name == "add_normal_3d":
+                self.normals[slot] = self._parameters(args[:4], group)
+            elif name == "add_work_plane":
+                self.workplanes[slot] = (slots[0], slots[1])
+            elif name in ("add_line_2d", "add_line_3d"):
+                self.lines[slot] = (slots[0], slots[1])
+            else:
+                raise NotImplementedError(
+                    f"{name} is not supported by the batch solver"
+                )
+
+        # SolverSystem.solve solves the group set last
+        self.solve_group = group
+        return [
+            (index, name, args, slots)
+            for index, name, args, slots, constraint_group in constraints
+            if constraint_group == group
+        ]
+
+    def _parameters(self, values: Sequence[float], group: int) -> Tuple[int, ...]:
+        start = len(self.values)
+        self.values.extend(float(value) for value in values)
+        self.groups.extend([group] * len(values))
+        self.parent.extend(range(start, len(self.values)))
+        return tuple(range(start, len(self.values)))
+
+    def _read_constraint(
+        self,
+        index: int,
+        name: str,
+        args: tuple,
+        slots: Dict[int, int],
+        value_constraints: Dict[int, str],
+    ) -> None:
+        if name == "coincident":
+            a, b, workplane = self._point(slots, 0), self._point(slots, 1), slots.get(2)
+            for axis in (0, 1):
+                self._equal(a, b, workplane, axis)
+        elif name in ("horizontal", "vertical"):
+            workplane = self._workplane(slots, 1)
+            a, b = self._line(slots, 0)
+            self._equal(a, b, workplane, 1 if name == "horizontal" else 0)
+        elif name == "distance":
+            a, b, workplane = self._point(slots, 0), self._point(slots, 1), slots.get(3)
+            self.distances.append(
+                (
+                    self._project(a, workplane),
+                    self._project(b, workplane),
+                    self._dimension(index, args[2], value_constraints),
+                )
+            )
+        elif name == "dragged":
+            point, workplane = self._point(slots, 0), self._workplane(slots, 1)
+            point_workplane, params = self.points[point]
+            if point_workplane != workplane:
+                raise NotImplementedError(
+                    "Only points in the constraint's workplane can be dragged"
+                )
+            self.pins.extend((param, self.values[param]) for param in params)
+        elif name == "add_constraint" and args[0] in (
+            Constraint.ANGLE,
+            Constraint.PERPENDICULAR,
+        ):
+            workplane = self._workplane(slots, 1)
+            a0, a1 = self._line(slots, 5)
+            b0, b1 = self._line(slots, 6)
+            dimension = -1
+            if args[0] == Constraint.ANGLE:
+                dimension = self._dimension(index, args[2], value_constraints)
+            self.cosines.append(
+                tuple(self._project(point, workplane) for point in (a0, a1, b0, b1))
+                + (-1.0 if args[9] else 1.0, dimension)
+            )
+        else:
+            raise NotImplementedError(
+                f"Constraint {name} is not supported by the batch solver"
+            )
+
+    def _point(self, slots: Dict[int, int], position: int) -> int:
+        slot = slots.get(position)
+        if slot not in self.points:
+            raise NotImplementedError("The batch solver only constrains points")
+        return slot
+
+    def _line(self, slots: Dict[int, int], position: int) -> Tuple[int, int]:
+        slot = slots.get(position)
+        if slot not in self.lines:
+            raise NotImplementedError("The batch solver expected a line segment")
+        return self.lines[slot]
+
+    def _workplane(self, slots: Dict[int, int], position: int) -> int:
+        workplane = slots.get(position)
+        if workplane not in self.workplanes:
+            raise NotImplementedError(
+                "The batch solver only solves constraints in a workplane"
+            )
+        return workplane
+
+    def _project(self, point: int, workplane: Optional[int]) -> int:
+        if workplane not in self.workplanes:
+            raise NotImplementedError(
+                "The batch solver only solves constraints in a workplane"
+            )
+        point_workplane = self.points[point][0]
+        if point_workplane is not None and point_workplane != workplane:
+            raise NotImplementedError(
+                "The batch solver does not project points between workplanes"
+            )
+        return self.projections.setdefault((point, workplane), len(self.projections))
+
+    def _dimension(
+        self, index: int, value: float, value_constraints: Dict[int, str]
+    ) -> int:
+        column = len(self.dimension_values)
+        self.dimension_values.append(float(value))
+        constraint_id = value_constraints.get(index)
+        if constraint_id is not None:
+            self.dimension_columns[constraint_id] = column
+        return column
+
+    def _equal(self, a: int, b: int, workplane: Optional[int], axis: int) -> None:
+        """
+        One workplane coordinate of two points is equal. Two unknowns are
+        merged (SolveSpace solves these by substitution), an unknown equal to a
+        constant is fixed, anything else is an equation.
+        """
+        a_workplane, a_params = self.points[a]
+        b_workplane, b_params = self.points[b]
+        if workplane is None or a_workplane != workplane or b_workplane != workplane:
+            self.differences.append(
+                (self._project(a, workplane), self._project(b, workplane), axis)
+            )
+            return
+
+        a, b = a_params[axis], b_params[axis]
+        a_free = self.groups[a] == self.solve_group
+        b_free = self.groups[b] == self.solve_group
+        if a_free and b_free:
+            a, b = self._find(a), self._find(b)
+            if a != b:
+                self.parent[a] = b
+        elif a_free:
+            self.pins.append((a, self.values[b]))
+        elif b_free:
+            self.pins.append((b, self.values[a]))
+
+    def _find(self, param: int) -> int:
+        parent = self.parent
+        while parent[param] != param:
+            parent[param] = parent[parent[param]]
+            param = parent[param]
+        return param
+
+    def _classes(self) -> Tuple[List[int], np.ndarray, int]:
+        """
+        The class of every parameter, the initial value of every class and the
+        number of unknown classes, which come first.
+        """
+        pinned: Dict[int, float] = {}
+        for param, value in self.pins:
+            pinned.setdefault(self._find(param), value)
+
+        unknown: Dict[int, int] = {}
+        constant: Dict[int, int] = {}
+        initial: List[float] = []
+        constants: List[float] = []
+        columns = []
+        for param, group in enumerate(self.groups):
+            root = self._find(param) if group == self.solve_group else None
+            if root is not None and root not in pinned:
+                if root not in unknown:
+                    unknown[root] = len(initial)
+                    # Merged parameters start from the one they were merged into
+                    initial.append(self.values[root])
+                columns.append(unknown[root])
+            else:
+                key = param if root is None else root
+                if key not in constant:
+                    constant[key] = len(constants)
+                    constants.append(
+                        self.values[param] if root is None else pinned[root]
+                    )
+                columns.append(-1 - constant[key])
+
+        unknowns = len(initial)
+        columns = [
+            column if column >= 0 else unknowns - 1 - column for column in columns
+        ]
+        # Constant zero last, for padding
+        values = np.array(initial + constants + [0.0], dtype=np.float64)
+        return columns, values, unknowns
+
+
+def _table(rows: Sequence[tuple], points: int, *extras: type) -> Tuple[np.ndarray, ...]:
+    """Split rows of (projections..., extras...) into one array per column kind."""
+    tables = [
+        np.array([row[:points] for row in rows], dtype=np.intp).reshape(-1, points)
+    ]
+    for position, dtype in enumerate(extras, points):
+        tables.append(np.array([row[position] for row in rows], dtype=dtype))
+    return tuple(tables)
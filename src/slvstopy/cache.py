@@ -0,0 +1,246 @@
+import hashlib
+import itertools
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from slvstopy.constants import PACKAGE_VERSION
+from slvstopy.records import ConstraintRecord, EntityRecord, GroupRecord
+
+# Bump when the pickled layout of the records changes
+CACHE_FORMAT = 3
+
+CACHE_SUFFIX = ".slvsc"
+
+Model = Tuple[List[EntityRecord], List[ConstraintRecord], List[GroupRecord]]
+
+
+class ModelCache(object):
+    """
+    Parsed models stored in `directory`, keyed by the content hash of the
+    .slvs file and the slvstopy version. Entries are written atomically, so
+    several processes can share one directory, and the least recently used
+    entries are evicted once the directory exceeds `max_bytes`.
+
+    Entries are pickles: only point this at a directory you trust.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self, file_path: str, parse: Callable[[], Model]) -> Model:
+        """
+        Return the cached model of `file_path`, or `parse()` it and store the
+        result.
+        """
+        entry = os.path.join(self.directory, _key(file_path) + CACHE_SUFFIX)
+
+        model = self._read(entry)
+        if model is None:
+            model = parse()
+            self._write(entry, model)
+            self._evict()
+        return model
+
+    def clear(self) -> None:
+        for path, _, _ in self._entries():
+            _remove(path)
+
+    def _read(self, entry: str):
+        try:
+            with open(entry, "rb") as f:
+                model = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated by a crash or written by an incompatible version, which
+            # can fail in many ways (UnpicklingError, ValueError, TypeError, ...)
+            _remove(entry)
+            return None
+
+        try:
+            # Mark as recently used
+            os.utime(entry)
+        except FileNotFoundError:
+            pass
+        return model
+
+    def _write(self, entry: str, model: Model) -> None:
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Readers see either the previous entry or the complete new one
+            os.replace(temporary, entry)
+        except BaseException:
+            _remove(temporary)
+            raise
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Evicted by another process
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+
+def _key(file_path: str) -> str:
+    digest = hashlib.sha256(f"{PACKAGE_VERSION}:{CACHE_FORMAT}:".encode())
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(2 ** 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class SolveResult(object):
+    """
+    The ResultFlag and solved parameters of one solve. `coordinates` is a
+    read-only (entities, parameters) array, NaN padded, with rows listed in
+    `rows`.
+    """
+
+    __slots__ = ("result", "rows", "_coordinates")
+
+    def __init__(
+        self, result: int, rows: Dict[str, Tuple[int, int]], coordinates: np.ndarray,
+    ):
+        # Results are shared through caches, so they keep an array that owns
+        # its data and hand out views, which numpy will not make writeable
+        if coordinates.base is not None:
+            coordinates = coordinates.copy()
+        coordinates.setflags(write=False)
+        self.result = result
+        # entity id -> (row, number of parameters)
+        self.rows: Mapping[str, Tuple[int, int]] = MappingProxyType(rows)
+        self._coordinates = coordinates
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        return self._coordinates.view()
+
+    def __getitem__(self, entity_id: str) -> np.ndarray:
+        row, count = self.rows[entity_id]
+        return self._coordinates[row, :count]
+
+    @property
+    def nbytes(self) -> int:
+        # Approximate, the row mapping dominates for small models
+        return self._coordinates.nbytes + 128 * len(self.rows)
+
+
+class SolveCache(object):
+    """
+    Least recently used SolveResults, keyed by model hash and the overrides
+    the model was solved with, evicted once they exceed `max_bytes`.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, SolveResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_solve(
+        self, key: Hashable, solve: Callable[[], SolveResult]
+    ) -> SolveResult:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # Solve outside the lock, a duplicate solve is cheaper than serialising
+        result = solve()
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = result
+                self.bytes += result.nbytes
+            while self.bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+def model_hash(
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+) -> str:
+    """Hash of the parsed model, stable across processes."""
+    digest = hashlib.sha256()
+    for record in itertools.chain(entity_definition, constraint_definition):
+        digest.update(repr(record).encode())
+    return digest.hexdigest()
+
+
+def solve_key(
+    model: str,
+    overrides: Optional[Dict[str, float]],
+    positions: Optional[Dict[str, Sequence[float]]],
+) -> Hashable:
+    return (
+        model,
+        tuple(sorted((key, float(value)) for key, value in (overrides or {}).items())),
+        tuple(
+            sorted(
+                (key, tuple(float(value) for value in values))
+                for key, values in (positions or {}).items()
+            )
+        ),
+    )
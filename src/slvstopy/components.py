@@ -0,0 +1,317 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from python_solvespace import ResultFlag
+
+from slvstopy.extract import parameter_count
+from slvstopy.plan import ConstructionPlan, compile_plan, solver_groups
+from slvstopy.records import ConstraintRecord, EntityRecord
+
+# ConstraintRecord fields that reference entities, other than the workplane
+CONSTRAINT_REFERENCES = ("pt_a", "pt_b", "entity_a", "entity_b", "entity_c", "entity_d")
+
+
+class Component(object):
+    """
+    A connected part of the model. Shared entities (the constant reference
+    entities) do not connect components and are included in every component,
+    ahead of the component's own entities.
+    """
+
+    __slots__ = (
+        "entity_definition",
+        "constraint_definition",
+        "handles",
+        "size",
+        "_plan",
+    )
+
+    def __init__(
+        self,
+        entity_definition: List[EntityRecord],
+        constraint_definition: List[ConstraintRecord],
+        handles: FrozenSet[str],
+        size: Tuple[int, int],
+    ):
+        self.entity_definition = entity_definition
+        self.constraint_definition = constraint_definition
+        # Entity ids owned by this component
+        self.handles = handles
+        # (entities, constraints) owned by this component, without shared ones
+        self.size = size
+        self._plan: Optional[ConstructionPlan] = None
+
+    def compile(self) -> ConstructionPlan:
+        if self._plan is None:
+            self._plan = compile_plan(
+                self.entity_definition, self.constraint_definition
+            )
+        return self._plan
+
+
+class ComponentSolution(object):
+    __slots__ = ("result", "results", "sizes", "coordinates")
+
+    def __init__(
+        self,
+        results: Sequence[int],
+        sizes: Sequence[Tuple[int, int]],
+        coordinates: Dict[str, Tuple[float, ...]],
+    ):
+        # First failing ResultFlag, or OKAY
+        self.result = next(
+            (result for result in results if result != ResultFlag.OKAY),
+            ResultFlag.OKAY,
+        )
+        # ResultFlag and (entities, constraints) of each component
+        self.results = tuple(results)
+        self.sizes = tuple(sizes)
+        # entity id -> solved parameters, merged across components
+        self.coordinates = coordinates
+
+    @property
+    def count(self) -> int:
+        return len(self.results)
+
+
+def shared_entities(
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+) -> Set[str]:
+    """
+    Entities whose parameters are constant: the reference entities, in solver
+    group 0. Workplanes of other groups are solved with the entities in them.
+    """
+    entity_groups, _ = solver_groups(entity_definition, constraint_definition)
+    return {
+        record.h for record, group in zip(entity_definition, entity_groups) if not group
+    }
+
+
+def find_components(
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+) -> List[Component]:
+    """
+    Split the model into components that share no constraints or entities
+    (other than shared entities). Entities without constraints are collected
+    into one component.
+    """
+    shared = shared_entities(entity_definition, constraint_definition)
+    parent = {
+        record.h: record.h for record in entity_definition if record.h not in shared
+    }
+
+    def find(entity_id: str) -> str:
+        while parent[entity_id] != entity_id:
+            # Path halving
+            parent[entity_id] = parent[parent[entity_id]]
+            entity_id = parent[entity_id]
+        return entity_id
+
+    def union(handles: List[str]) -> None:
+        roots = [find(entity_id) for entity_id in handles if entity_id in parent]
+        for root in roots[1:]:
+            parent[root] = roots[0]
+
+    for record in entity_definition:
+        if record.h in parent:
+            union([record.h] + list(_references(record)))
+
+    constrained_handles: List[Optional[str]] = []
+    for constraint in constraint_definition:
+        # A constraint in a solved workplane also depends on the workplane
+        handles = [
+            entity_id
+            for entity_id in map(
+                constraint.__getattribute__, CONSTRAINT_REFERENCES + ("workplane",)
+            )
+            if entity_id in parent
+        ]
+        union(handles)
+        # None if it only constrains shared entities, every component needs it
+        constrained_handles.append(handles[0] if handles else None)
+
+    constraint_roots = [
+        find(entity_id) if entity_id is not None else None
+        for entity_id in constrained_handles
+    ]
+    constrained = set(constraint_roots)
+
+    # Roots in file order, with unconstrained entities under None
+    members: Dict[Optional[str], Set[str]] = {}
+    for entity_id in parent:
+        root = find(entity_id)
+        members.setdefault(root if root in constrained else None, set()).add(entity_id)
+    if not members:
+        members[None] = set()
+
+    components = []
+    for member_root, owned in members.items():
+        constraints = [
+            constraint
+            for constraint, constraint_root in zip(
+                constraint_definition, constraint_roots
+            )
+            if constraint_root is None or constraint_root == member_root
+        ]
+        components.append(
+            Component(
+                [
+                    record
+                    for record in entity_definition
+                    if record.h in shared or record.h in owned
+                ],
+                constraints,
+                frozenset(owned),
+                (
+                    len(owned),
+                    sum(
+                        1
+                        for constraint_root in constraint_roots
+                        if constraint_root == member_root
+                    )
+                    if member_root is not None
+                    else 0,
+                ),
+            )
+        )
+    return components
+
+
+def query_component(
+    components: Sequence[Component], targets: Iterable[str]
+) -> Component:
+    """
+    The smallest sub-model that solves every entity in `targets`: the
+    component owning them, or the components merged if they span several.
+    Shared entities are found in the first component.
+    """
+    selected: List[Component] = []
+    for entity_id in targets:
+        owner = next(
+            (component for component in components if entity_id in component.handles),
+            None,
+        )
+        if owner is None:
+            if not components or not any(
+                record.h == entity_id for record in components[0].entity_definition
+            ):
+                raise KeyError(f"Entity {entity_id} is not in the model")
+            owner = components[0]
+        if all(owner is not component for component in selected):
+            selected.append(owner)
+
+    if not selected:
+        raise ValueError("Expected at least one target entity")
+    if len(selected) == 1:
+        return selected[0]
+
+    # Shared entities and constraints only on them are in every component
+    entities = list(selected[0].entity_definition)
+    constraints = list(selected[0].constraint_definition)
+    common = set(map(id, constraints))
+    for component in selected[1:]:
+        entities += [
+            record
+            for record in component.entity_definition
+            if record.h in component.handles
+        ]
+        constraints += [
+            constraint
+            for constraint in component.constraint_definition
+            if id(constraint) not in common
+        ]
+
+    return Component(
+        entities,
+        constraints,
+        frozenset().union(*(component.handles for component in selected)),
+        (
+            sum(component.size[0] for component in selected),
+            sum(component.size[1] for component in selected),
+        ),
+    )
+
+
+def solve_components(
+    components: Sequence[Component],
+    overrides: Optional[Dict[str, float]] = None,
+    workers: Optional[int] = None,
+) -> ComponentSolution:
+    """
+    Solve each component in its own system, in a pool of `workers` processes
+    if given, and merge the solved parameters. `overrides` are routed to the
+    components that own the constraints.
+    """
+    overrides = overrides or {}
+    plans = [component.compile() for component in components]
+
+    unknown = set(overrides).difference(*(plan.constraint_values for plan in plans))
+    if unknown:
+        raise KeyError(f"Constraint {min(unknown)} does not have a value to override")
+
+    jobs = [
+        (
+            plan,
+            {
+                key: value
+                for key, value in overrides.items()
+                if key in plan.constraint_values
+            },
+        )
+        for plan in plans
+    ]
+    if workers is None:
+        solutions: Iterator = map(_solve_component, jobs)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            solutions = iter(list(executor.map(_solve_component, jobs)))
+
+    results = []
+    coordinates: Dict[str, Tuple[float, ...]] = {}
+    for result, solved in solutions:
+        results.append(result)
+        for entity_id, values in solved.items():
+            # Shared entities come from the first component
+            coordinates.setdefault(entity_id, values)
+
+    return ComponentSolution(
+        results, [component.size for component in components], coordinates
+    )
+
+
+def _solve_component(
+    job: Tuple[ConstructionPlan, Dict[str, float]]
+) -> Tuple[int, Dict[str, Tuple[float, ...]]]:
+    plan, overrides = job
+    system, entities = plan.replay(overrides)
+    result = system.solve()
+    return (
+        result,
+        {
+            entity_id: tuple(system.params(entity.params))
+            for entity_id, entity in entities.items()
+            if parameter_count(entity)
+        },
+    )
+
+
+def _references(record: EntityRecord) -> Iterator[str]:
+    yield from record.point
+    if record.normal:
+        yield record.normal
+    if record.distance:
+        yield record.distance
+    if record.workplane:
+        yield record.workplane
@@ -3,6 +3,12 @@ from enum import IntEnum
 
 VERSION_STRING = "\261\262\263 SolveSpaceREVa"
 
+# Group.h.v of the group holding the reference planes and origin
+REFERENCE_GROUP = "00000001"
+
+# Keep in sync with setup.py
+PACKAGE_VERSION = "0.0.5"
+
 
 class EntityType(IntEnum):
     POINT_IN_3D = 2000
@@ -0,0 +1,96 @@
+import itertools
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from python_solvespace import Entity, SolverSystem
+
+
+def parameter_count(entity: Entity) -> int:
+    """Number of solver parameters of an entity, 0 for composite entities."""
+    if entity.is_point_2d():
+        return 2
+    if entity.is_point_3d():
+        return 3
+    if entity.is_normal_3d():
+        return 4
+    if entity.is_distance():
+        return 1
+    return 0
+
+
+class PointExtractor(object):
+    """
+    Row layout of the solved parameters of a set of entities. Parameter
+    handles are the same in every system replayed from one plan, so an
+    extractor built once can be reused for each of those systems.
+    """
+
+    __slots__ = ("handles", "rows", "counts", "width", "_params", "_index")
+
+    def __init__(
+        self, entities: Mapping[str, Entity], handles: Optional[Sequence[str]] = None
+    ):
+        if handles is None:
+            handles = [
+                entity_id
+                for entity_id, entity in entities.items()
+                if parameter_count(entity)
+            ]
+
+        self.handles = tuple(handles)
+        self.rows: Mapping[str, int] = MappingProxyType(
+            {entity_id: row for row, entity_id in enumerate(self.handles)}
+        )
+        self.counts = tuple(parameter_count(entities[h]) for h in self.handles)
+        self.width = max(self.counts, default=0)
+
+        self._params = [
+            entities[entity_id].params
+            for entity_id, count in zip(self.handles, self.counts)
+            if count
+        ]
+        # Flat position in the output of every extracted parameter
+        self._index = np.fromiter(
+            (
+                row * self.width + column
+                for row, count in enumerate(self.counts)
+                for column in range(count)
+            ),
+            dtype=np.intp,
+        )
+
+    def extract(
+        self, system: SolverSystem, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Return a (entities, width) float64 array of solved parameters, NaN
+        padded, written into `out` if given.
+        """
+        shape = (len(self.handles), self.width)
+        if out is None:
+            out = np.full(shape, np.nan)
+        elif out.shape != shape or not out.flags.c_contiguous:
+            raise ValueError(f"Expected a contiguous output array of shape {shape}")
+
+        values = np.fromiter(
+            itertools.chain.from_iterable(map(system.params, self._params)),
+            dtype=np.float64,
+            count=len(self._index),
+        )
+        out.reshape(-1)[self._index] = values
+        return out
+
+
+def extract_points(
+    system: SolverSystem,
+    entities: Mapping[str, Entity],
+    handles: Optional[Sequence[str]] = None,
+) -> Tuple[np.ndarray, Mapping[str, int]]:
+    """
+    Solved parameters of `handles` (every point, normal and distance if None)
+    as a contiguous float64 array, with the row of each entity id. Use a
+    PointExtractor directly to reuse the layout across systems.
+    """
+    extractor = PointExtractor(entities, handles)
+    return extractor.extract(system), extractor.rows
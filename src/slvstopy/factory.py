@@ -0,0 +1,380 @@
+import threading
+from concurrent.futures import Executor
+from python_solvespace import SolverSystem, Entity
+from typing import FrozenSet, Iterable, List, Optional, Sequence, TextIO, Dict, Tuple
+
+from slvstopy.batch import BatchSolver
+from slvstopy.cache import (
+    Model,
+    ModelCache,
+    SolveCache,
+    SolveResult,
+    model_hash,
+    solve_key,
+)
+from slvstopy.components import (
+    Component,
+    ComponentSolution,
+    find_components,
+    query_component,
+    solve_components,
+)
+from slvstopy.extract import PointExtractor
+from slvstopy.parser import Record, iter_records, iter_records_mmap
+from slvstopy.groups import GroupSolver, set_entity_groups
+from slvstopy.params import ParamTable, seed_entities
+from slvstopy.plan import ConstructionPlan, compile_plan
+from slvstopy.instrument import Instrumentation, LoadReport, phase
+from slvstopy.presolve import PresolveReport, presolve as presolve_model
+from slvstopy.pool import SystemPool
+from slvstopy.records import (
+    ConstraintRecord,
+    EntityRecord,
+    GroupRecord,
+    ParamRecord,
+    RequestRecord,
+)
+from slvstopy.reuse import ReusableSystem
+from slvstopy.sweep import SweepResult, parallel_sweep, sweep
+
+
+class Slvstopy:
+    """
+    A SolverSystem can only solve once. This helper class exists solely to
+    generate new systems, replaying a plan compiled once from the parsed model.
+    """
+
+    def __init__(
+        self,
+        file_path: str = "",
+        file_handle: Optional[TextIO] = None,
+        memory_map: bool = False,
+        cache: Optional[ModelCache] = None,
+        presolve: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.instrumentation = instrumentation
+
+        if file_path and cache is not None:
+            elements = cache.load(
+                file_path, lambda: self._parse_file(file_path, memory_map)
+            )
+        elif file_path:
+            elements = self._parse_file(file_path, memory_map)
+        elif file_handle is not None:
+            elements = self._parse_elements(iter_records(file_handle))
+        else:
+            raise ValueError("Expected a file_path or a file_handle")
+
+        (
+            self.entity_definition,
+            self.constraint_definition,
+            self.group_definition,
+        ) = elements
+
+        # Set when the model is presolved
+        self.presolve_report: Optional[PresolveReport] = None
+        if presolve:
+            with phase(instrumentation, "presolve"):
+                (
+                    self.entity_definition,
+                    self.constraint_definition,
+                    self.presolve_report,
+                ) = presolve_model(self.entity_definition, self.constraint_definition)
+
+        if instrumentation is not None:
+            instrumentation.report.count(
+                self.entity_definition, self.constraint_definition
+            )
+
+        self._plans: Dict[bool, ConstructionPlan] = {}
+        self._model_hash: Optional[str] = None
+        self._extractor: Optional[PointExtractor] = None
+        self._solve_rows: Dict[str, Tuple[int, int]] = {}
+        self._components: Optional[List[Component]] = None
+        self._queries: Dict[FrozenSet[str], Component] = {}
+        # Guards the lazily built plans, components and solve layout, so one
+        # instance can serve several threads
+        self._lock = threading.RLock()
+
+    def generate_system(
+        self,
+        overrides: Optional[Dict[str, float]] = None,
+        positions: Optional[Dict[str, Sequence[float]]] = None,
+    ) -> Tuple[SolverSystem, Dict[str, Entity]]:
+        """
+        Generate a new system from the parsed model. `overrides` maps constraint
+        ids to new dimension values and `positions` maps entity ids to new
+        initial parameter values, without re-parsing the file.
+        """
+        plan = self.compile()
+        with phase(self.instrumentation, "build"):
+            return plan.replay(overrides, positions)
+
+    def generate_systems(
+        self,
+        count: int,
+        overrides: Optional[Dict[str, float]] = None,
+        positions: Optional[Dict[str, Sequence[float]]] = None,
+        executor: Optional[Executor] = None,
+    ) -> List[Tuple[SolverSystem, Dict[str, Entity]]]:
+        """
+        Generate `count` independent systems, built concurrently by `executor`
+        (ie. a ThreadPoolExecutor) if given. The plan is compiled once, before
+        any system is built.
+        """
+        plan = self.compile()
+
+        def build(_: int) -> Tuple[SolverSystem, Dict[str, Entity]]:
+            with phase(self.instrumentation, "build"):
+                return plan.replay(overrides, positions)
+
+        if executor is None:
+            return [build(index) for index in range(count)]
+        return list(executor.map(build, range(count)))
+
+    def solve(
+        self,
+        overrides: Optional[Dict[str, float]] = None,
+        positions: Optional[Dict[str, Sequence[float]]] = None,
+        cache: Optional[SolveCache] = None,
+    ) -> SolveResult:
+        """
+        Generate and solve a system, returning the ResultFlag and the solved
+        parameters of every entity. Repeated overrides are served from `cache`.
+        """
+        if cache is None:
+            return self._solve(overrides, positions)
+        key = solve_key(self.model_hash(), overrides, positions)
+        return cache.get_or_solve(key, lambda: self._solve(overrides, positions))
+
+    def model_hash(self) -> str:
+        if self._model_hash is None:
+            self._model_hash = model_hash(
+                self.entity_definition, self.constraint_definition
+            )
+        return self._model_hash
+
+    def sweep(
+        self,
+        constraint_id: str,
+        values: Sequence[float],
+        track: Sequence[str],
+        workers: Optional[int] = None,
+        warm_start: bool = False,
+        extrapolate: bool = False,
+    ) -> SweepResult:
+        """
+        Solve once per value of the dimensional constraint `constraint_id` and
+        collect the solved parameters of the `track` entity ids. Steps are
+        solved in a pool of `workers` processes if given, and start from the
+        previous step's solution with `warm_start` or `extrapolate`.
+        """
+        options = dict(warm_start=warm_start, extrapolate=extrapolate)
+        if workers is not None:
+            return parallel_sweep(
+                self.compile(), constraint_id, values, track, workers=workers, **options
+            )
+        return sweep(self.compile(), constraint_id, values, track, **options)
+
+    def group_solver(self) -> GroupSolver:
+        """
+        A GroupSolver that solves each group of the file in order and only
+        re-solves the groups after a changed dimension.
+        """
+        return GroupSolver(self.compile(grouped=True))
+
+    def batch_solver(self) -> BatchSolver:
+        """
+        A BatchSolver that solves many dimension sets of this model at once
+        with NumPy, for planar models it supports.
+        """
+        return BatchSolver(self.compile())
+
+    def system_pool(
+        self, high_watermark: int = 8, low_watermark: int = 2, start: bool = True
+    ) -> SystemPool:
+        """
+        A SystemPool that builds systems for this model on a background thread,
+        ahead of calls to SystemPool.acquire. Close it when done.
+        """
+        return SystemPool(self.compile(), high_watermark, low_watermark, start)
+
+    def reusable_system(self) -> ReusableSystem:
+        """
+        A ReusableSystem that keeps one built system and restores its initial
+        parameters between solves, where the backend allows it.
+        """
+        return ReusableSystem(self.compile())
+
+    def components(self) -> List[Component]:
+        """
+        The connected components of the model, each of which can be solved as
+        its own system.
+        """
+        with self._lock:
+            if self._components is None:
+                self._components = find_components(
+                    self.entity_definition, self.constraint_definition
+                )
+            return self._components
+
+    def solve_components(
+        self,
+        overrides: Optional[Dict[str, float]] = None,
+        workers: Optional[int] = None,
+    ) -> ComponentSolution:
+        """
+        Solve each connected component separately, in a pool of `workers`
+        processes if given, and merge the solved parameters by entity id.
+        """
+        return solve_components(self.components(), overrides, workers)
+
+    def solve_for(
+        self, targets: Sequence[str], overrides: Optional[Dict[str, float]] = None,
+    ) -> SolveResult:
+        """
+        Solve only the part of the model the `targets` entity ids depend on
+        (their connected components) and return the solved parameters of the
+        targets. Overrides of constraints outside that part are ignored.
+        """
+        key = frozenset(targets)
+        with self._lock:
+            component = self._queries.get(key)
+            if component is None:
+                component = self._queries[key] = query_component(
+                    self.components(), targets
+                )
+                # Compile while holding the lock, Component.compile is not guarded
+                component.compile()
+
+        local = {constraint.h for constraint in component.constraint_definition}
+        overrides = overrides or {}
+        for constraint_id in overrides:
+            if constraint_id not in local and not any(
+                constraint.h == constraint_id
+                for constraint in self.constraint_definition
+            ):
+                raise KeyError(f"Constraint {constraint_id} is not in the model")
+
+        system, entities = component.compile().replay(
+            {
+                constraint_id: value
+                for constraint_id, value in overrides.items()
+                if constraint_id in local
+            }
+        )
+        result = system.solve()
+
+        extractor = PointExtractor(entities, targets)
+        return SolveResult(
+            result,
+            {
+                entity_id: (row, count)
+                for row, (entity_id, count) in enumerate(
+                    zip(extractor.handles, extractor.counts)
+                )
+            },
+            extractor.extract(system),
+        )
+
+    def compile(self, grouped: bool = False) -> ConstructionPlan:
+        """
+        Compile the parsed model into a ConstructionPlan. The plan is built on
+        first use and reused by every later call to generate_system. With
+        `grouped`, each group of the file is its own solver group.
+        """
+        plan = self._plans.get(grouped)
+        if plan is None:
+            with self._lock:
+                plan = self._plans.get(grouped)
+                if plan is None:
+                    plan = self._plans[grouped] = compile_plan(
+                        self.entity_definition,
+                        self.constraint_definition,
+                        self.group_definition,
+                        grouped,
+                        self.instrumentation,
+                    )
+        return plan
+
+    @property
+    def load_report(self) -> Optional[LoadReport]:
+        """Phase timings and record counts, None without instrumentation."""
+        if self.instrumentation is None:
+            return None
+        return self.instrumentation.report
+
+    def _solve(
+        self,
+        overrides: Optional[Dict[str, float]],
+        positions: Optional[Dict[str, Sequence[float]]],
+    ) -> SolveResult:
+        plan = self.compile()
+        with phase(self.instrumentation, "build"):
+            system, entities = plan.replay(overrides, positions)
+        with phase(self.instrumentation, "solve"):
+            result = system.solve()
+
+        extractor = self._extractor
+        if extractor is None:
+            extractor = self._solve_layout(entities)
+
+        with phase(self.instrumentation, "extract"):
+            coordinates = extractor.extract(system)
+        return SolveResult(result, self._solve_rows, coordinates)
+
+    def _solve_layout(self, entities: Dict[str, Entity]) -> PointExtractor:
+        with self._lock:
+            if self._extractor is None:
+                extractor = PointExtractor(entities)
+                rows = {
+                    entity_id: (row, count)
+                    for row, (entity_id, count) in enumerate(
+                        zip(extractor.handles, extractor.counts)
+                    )
+                }
+                if self.presolve_report is not None:
+                    # Merged points read the row of the point they were merged into
+                    for entity_id, kept in self.presolve_report.merged_points.items():
+                        rows[entity_id] = rows[kept]
+
+                # Rows first, threads that see the extractor read them unlocked
+                self._solve_rows = rows
+                self._extractor = extractor
+            return self._extractor
+
+    def _parse_file(self, file_path: str, memory_map: bool) -> Model:
+        if memory_map:
+            return self._parse_elements(iter_records_mmap(file_path))
+        with open(file_path, encoding="utf8", errors="ignore") as f:
+            return self._parse_elements(iter_records(f))
+
+    def _parse_elements(self, records: Iterable[Tuple[str, Record]]) -> Model:
+        if self.instrumentation is not None:
+            records = self.instrumentation.timed("read", records)
+
+        groups: List[GroupRecord] = []
+        params: List[ParamRecord] = []
+        requests: List[RequestRecord] = []
+        entities: List[EntityRecord] = []
+        constraints: List[ConstraintRecord] = []
+
+        for _, definition in records:
+            if isinstance(definition, EntityRecord):
+                entities.append(definition)
+            elif isinstance(definition, ConstraintRecord):
+                constraints.append(definition)
+            elif isinstance(definition, ParamRecord):
+                params.append(definition)
+            elif isinstance(definition, RequestRecord):
+                requests.append(definition)
+            elif isinstance(definition, GroupRecord):
+                groups.append(definition)
+
+        with phase(self.instrumentation, "seed"):
+            # Entities without act* values start from the saved params instead
+            seed_entities(entities, ParamTable.from_records(params))
+            set_entity_groups(entities, requests)
+
+        return entities, constraints, groups
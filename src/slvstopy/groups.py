@@ -0,0 +1,109 @@
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from python_solvespace import Entity, ResultFlag, SolverSystem
+
+from slvstopy.params import GROUP_DERIVED
+from slvstopy.plan import ConstructionPlan
+from slvstopy.records import EntityRecord, RequestRecord
+
+
+def set_entity_groups(
+    entity_definition: Iterable[EntityRecord],
+    request_definition: Iterable[RequestRecord],
+) -> None:
+    """
+    Set the group of each entity from its request (the upper 16 bits of the
+    entity handle), or from the handle itself for entities a group generates.
+    """
+    request_groups = {
+        int(request.h, 16): request.group for request in request_definition
+    }
+
+    for record in entity_definition:
+        handle = int(record.h, 16)
+        if handle & GROUP_DERIVED:
+            record.group = f"{(handle >> 16) & 0x7FFF:08x}"
+        else:
+            record.group = request_groups.get(handle >> 16)
+
+
+class GroupSolver(object):
+    """
+    Solves a grouped plan one group at a time, in group order, with the
+    parameters of earlier groups held at their solution. A SolverSystem can
+    only solve once, so each group is solved in its own replay of the plan.
+
+    After a successful solve, only the groups from the earliest changed
+    dimension onward are solved again.
+    """
+
+    def __init__(self, plan: ConstructionPlan):
+        self.plan = plan
+        # Solver groups solved by the last call to solve
+        self.solved_groups: Tuple[int, ...] = ()
+        self._overrides: Dict[str, float] = {}
+        self._solution: Dict[str, Sequence[float]] = {}
+
+    def solve(
+        self, overrides: Optional[Dict[str, float]] = None
+    ) -> Tuple[int, SolverSystem, Dict[str, Entity]]:
+        """
+        Returns the first failing ResultFlag (or OKAY) and the system of the
+        last group solved, which holds the solution of every group.
+        """
+        overrides = {key: float(value) for key, value in (overrides or {}).items()}
+        plan = self.plan
+        groups = plan.solve_groups
+
+        first_group = groups[0] if groups else 0
+        if self._solution:
+            changed = [
+                key
+                for key in set(overrides) | set(self._overrides)
+                if overrides.get(key) != self._overrides.get(key)
+            ]
+            # Unknown ids solve everything, replay reports them
+            first_group = min(
+                (plan.constraint_groups.get(key, 0) for key in changed),
+                default=groups[-1] + 1 if groups else 0,
+            )
+
+        solution = {
+            entity_id: params
+            for entity_id, params in self._solution.items()
+            if plan.entity_groups[entity_id] < first_group
+        }
+        self._solution = {}
+        self.solved_groups = ()
+
+        result: int = ResultFlag.OKAY
+        system, entities = plan.replay(overrides, solution)
+        for group in groups:
+            if group < first_group:
+                continue
+            if self.solved_groups:
+                system, entities = plan.replay(overrides, solution)
+
+            system.set_group(group)
+            result = system.solve()
+            self.solved_groups += (group,)
+            if result != ResultFlag.OKAY:
+                # Start from scratch next time
+                return result, system, entities
+
+            solution.update(
+                (entity_id, system.params(entities[entity_id].params))
+                for entity_id in plan.entity_params
+                if plan.entity_groups[entity_id] == group
+            )
+
+        self._overrides = overrides
+        self._solution = {
+            entity_id: system.params(entities[entity_id].params)
+            for entity_id in plan.entity_params
+        }
+        return result, system, entities
+
+    def reset(self) -> None:
+        self._overrides = {}
+        self._solution = {}
@@ -0,0 +1,149 @@
+import contextlib
+import threading
+import time
+from collections import Counter
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+from slvstopy.constants import ConstraintType, EntityType
+from slvstopy.records import ConstraintRecord, EntityRecord
+
+# Phases, in load order:
+#   read         reading the file and parsing it into records
+#   seed         seeding initial values from params, and entity groups
+#   presolve     Slvstopy(presolve=True)
+#   entities     constructing entities while compiling the plan
+#   constraints  constructing constraints while compiling the plan
+#   build        replaying the plan into a SolverSystem
+#   solve        SolverSystem.solve
+#   extract      copying solved parameters out of the system
+PHASES = (
+    "read",
+    "seed",
+    "presolve",
+    "entities",
+    "constraints",
+    "build",
+    "solve",
+    "extract",
+)
+
+# Called with the phase name and the seconds it took
+PhaseHook = Callable[[str, float], Any]
+
+_DISABLED = contextlib.nullcontext()
+
+
+class LoadReport(object):
+    """Wall time and number of runs of each phase, and the size of the model."""
+
+    __slots__ = ("phases", "calls", "entity_types", "constraint_types")
+
+    def __init__(self):
+        # phase -> total seconds
+        self.phases: Dict[str, float] = {}
+        # phase -> number of times it ran
+        self.calls: Dict[str, int] = {}
+        # EntityType/ConstraintType name -> number of records
+        self.entity_types: Dict[str, int] = {}
+        self.constraint_types: Dict[str, int] = {}
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def count(
+        self,
+        entity_definition: Iterable[EntityRecord],
+        constraint_definition: Iterable[ConstraintRecord],
+    ) -> None:
+        self.entity_types = _type_counts(EntityType, entity_definition)
+        self.constraint_types = _type_counts(ConstraintType, constraint_definition)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "phases": dict(self.phases),
+            "calls": dict(self.calls),
+            "entity_types": dict(self.entity_types),
+            "constraint_types": dict(self.constraint_types),
+        }
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            f"{phase}={seconds * 1000:.2f}ms" for phase, seconds in self.phases.items()
+        )
+        return f"LoadReport({phases})"
+
+
+class Instrumentation(object):
+    """
+    Times phases into `report` and passes every timing to `hooks`. Pass one to
+    Slvstopy to enable instrumentation, without it phases are not timed.
+    """
+
+    def __init__(self, hooks: Sequence[PhaseHook] = ()):
+        self.report = LoadReport()
+        self.hooks = list(hooks)
+        # Phases can end on several threads at once
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, time.perf_counter() - started)
+
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield from `iterable`, timing the time spent producing items as `name`."""
+        iterator = iter(iterable)
+        elapsed = 0.0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - started
+                    return
+                elapsed += time.perf_counter() - started
+                yield item
+        finally:
+            self._record(name, elapsed)
+
+    def _record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.report.add(name, seconds)
+        for hook in self.hooks:
+            hook(name, seconds)
+
+
+def phase(instrumentation: Optional[Instrumentation], name: str) -> ContextManager:
+    """`instrumentation.phase(name)`, or a shared no-op context if disabled."""
+    if instrumentation is None:
+        return _DISABLED
+    return instrumentation.phase(name)
+
+
+def _type_counts(enum, records: Iterable) -> Dict[str, int]:
+    counts = Counter(record.type for record in records)
+    names = {}
+    for value, count in counts.items():
+        try:
+            names[enum(value).name] = count
+        except ValueError:
+            names[str(value)] = count
+    return names
@@ -0,0 +1,120 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from slvstopy.constants import EntityType
+from slvstopy.records import EntityRecord, ParamRecord
+
+# Entities created by a group (ie. copies of points from an earlier group) set
+# this bit. Their params are not derived from the entity handle.
+GROUP_DERIVED = 0x80000000
+
+# First param index (within the request) of points, normals and distances.
+# The i-th point of a request uses params 16 + 3i + (0, 1, 2).
+POINT_PARAM = 16
+NORMAL_PARAM = 32
+DISTANCE_PARAM = 64
+
+# Entity type -> the act* field seeded from its params
+SEEDED_FIELDS: Dict[int, str] = {
+    EntityType.POINT_IN_3D: "act_point",
+    EntityType.POINT_IN_2D: "act_point",
+    EntityType.NORMAL_IN_3D: "act_normal",
+    EntityType.DISTANCE: "act_distance",
+}
+
+
+class ParamTable(object):
+    """
+    The Param.h.v/Param.val table of a file, stored as two sorted arrays
+    (4 bytes per handle, 8 per value) and searched by bisection.
+    """
+
+    __slots__ = ("handles", "values")
+
+    def __init__(self, handles: Sequence[int] = (), values: Sequence[float] = ()):
+        order = sorted(range(len(handles)), key=handles.__getitem__)
+        self.handles = array("I", (handles[i] for i in order))
+        self.values = array("d", (values[i] for i in order))
+
+    @classmethod
+    def from_records(cls, records: Iterable[ParamRecord]) -> "ParamTable":
+        handles = array("I")
+        values = array("d")
+        for record in records:
+            handles.append(record.h)
+            values.append(record.val)
+        return cls(handles, values)
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def get(self, handle: int) -> Optional[float]:
+        index = bisect_left(self.handles, handle)
+        if index < len(self.handles) and self.handles[index] == handle:
+            return self.values[index]
+        return None
+
+    def lookup(self, handles: Sequence[int]) -> Optional[Tuple[float, ...]]:
+        """Values of all `handles`, or None if any of them is missing."""
+        if not handles:
+            return None
+        values = tuple(self.get(handle) for handle in handles)
+        if None in values:
+            return None
+        return values  # type: ignore
+
+
+def entity_param_handles(entity_id: str, entity_type: int) -> Tuple[int, ...]:
+    """
+    Handles of the params SolveSpace saves for an entity, in actPoint
+    (x, y, z), actNormal (w, vx, vy, vz) or actDistance order.
+    """
+    handle = int(entity_id, 16)
+    if handle & GROUP_DERIVED:
+        return ()
+
+    request = handle & 0xFFFF0000
+    index = handle & 0xFFFF
+
+    if entity_type == EntityType.POINT_IN_3D:
+        # Point requests own entity 0, other requests number points from 1
+        first, count = POINT_PARAM + 3 * max(index - 1, 0), 3
+    elif entity_type == EntityType.POINT_IN_2D:
+        first, count = POINT_PARAM + 3 * max(index - 1, 0), 2
+    elif entity_type == EntityType.NORMAL_IN_3D:
+        first, count = NORMAL_PARAM, 4
+    elif entity_type == EntityType.DISTANCE:
+        first, count = DISTANCE_PARAM, 1
+    else:
+        return ()
+
+    return tuple(request | (first + offset) for offset in range(count))
+
+
+def seed_entities(entity_definition: Iterable[EntityRecord], table: ParamTable) -> int:
+    """
+    Fill in act_point/act_normal/act_distance of entities that do not define
+    them from the param table. Returns the number of entities seeded.
+    """
+    seeded = 0
+
+    for record in entity_definition:
+        field = SEEDED_FIELDS.get(record.type)
+        if field is None or getattr(record, field) is not None:
+            continue
+
+        values = table.lookup(entity_param_handles(record.h, record.type))
+        if values is None:
+            continue
+
+        if field == "act_point":
+            # 2D points only save (u, v)
+            setattr(record, field, (values + (0.0,))[:3])
+        elif field == "act_distance":
+            setattr(record, field, values[0])
+        else:
+            setattr(record, field, values)
+        seeded += 1
+
+    return seeded
@@ -0,0 +1,122 @@
+import mmap
+import os
+from typing import Callable, Dict, Iterable, Iterator, TextIO, Tuple, Union
+
+from slvstopy.records import (
+    ConstraintRecord,
+    EntityRecord,
+    Fields,
+    GroupRecord,
+    ParamRecord,
+    RequestRecord,
+)
+
+
+GROUP_RECORD = "Group"
+PARAM_RECORD = "Param"
+REQUEST_RECORD = "Request"
+ENTITY_RECORD = "Entity"
+CONSTRAINT_RECORD = "Constraint"
+
+Record = Union[GroupRecord, ParamRecord, RequestRecord, EntityRecord, ConstraintRecord]
+
+RECORD_TERMINATORS: Dict[str, Tuple[str, Callable[[Fields], Record]]] = {
+    "AddGroup": (GROUP_RECORD, GroupRecord.from_fields),
+    "AddParam": (PARAM_RECORD, ParamRecord.from_fields),
+    "AddRequest": (REQUEST_RECORD, RequestRecord.from_fields),
+    "AddEntity": (ENTITY_RECORD, EntityRecord.from_fields),
+    "AddConstraint": (CONSTRAINT_RECORD, ConstraintRecord.from_fields),
+}
+
+MESH_PREFIXES = (
+    b"Triangle ",
+    b"Surface ",
+    b"SCtrl ",
+    b"TrimBy ",
+    b"Curve ",
+    b"CCtrl ",
+    b"CurvePt ",
+    b"AddSurface",
+    b"AddCurve",
+)
+MESH_PREFIX_LENGTH = max(len(prefix) for prefix in MESH_PREFIXES)
+
+
+def iter_records(handle: TextIO) -> Iterator[Tuple[str, Record]]:
+    """
+    Stream a SolveSpace file, yielding (record type, record) pairs as each
+    AddGroup/AddParam/AddRequest/AddEntity/AddConstraint terminator is reached.
+    Only the record currently being read is held in memory.
+    """
+    return _parse_lines(handle)
+
+
+def iter_records_mmap(file_path: str) -> Iterator[Tuple[str, Record]]:
+    """
+    Same as iter_records, but memory maps the file and skips mesh sections at
+    the byte level instead of decoding every line.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from _parse_lines(_iter_lines_skipping_mesh(buffer))
+
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[Tuple[str, Record]]:
+    sv: Dict[str, Fields] = {}
+
+    for line in lines:
+        key, separator, val = line.partition("=")
+        if separator:
+            record_type, _, field = key.partition(".")
+            fields = sv.get(record_type)
+            if fields is None:
+                fields = sv[record_type] = {}
+            fields[field] = val.rstrip("\r\n")
+            continue
+
+        terminator = RECORD_TERMINATORS.get(line.rstrip("\r\n"))
+        if terminator is not None:
+            record_type, create_record = terminator
+            yield record_type, create_record(sv.get(record_type, {}))
+
+        # Every other terminator (AddSurface, AddCurve, ...) closes a
+        # record that is not used. Mesh lines never contain "=" and are skipped.
+        if line.startswith("Add"):
+            sv = {}
+
+
+def _iter_lines_skipping_mesh(buffer: mmap.mmap) -> Iterator[str]:
+    position = 0
+    size = len(buffer)
+
+    while position < size:
+        head_end = position + MESH_PREFIX_LENGTH
+        if buffer[position:head_end].startswith(MESH_PREFIXES):
+            position = _find_next_record(buffer, position, size)
+            continue
+
+        end = buffer.find(b"\n", position)
+        if end == -1:
+            end = size
+
+        yield buffer[position:end].decode("utf8", "ignore")
+        position = end + 1
+
+
+def _find_next_record(buffer: mmap.mmap, position: int, size: int) -> int:
+    # Mesh lines never contain "=" while every record starts with a key=value
+    # line, so the next "=" marks the end of the mesh block.
+    separator = buffer.find(b"=", position)
+    if separator == -1:
+        return size
+
+    start = buffer.rfind(b"\n", position, separator) + 1
+    if start > position:
+        return start
+
+    # Malformed mesh line containing "=". Skip just this line.
+    end = buffer.find(b"\n", position)
+    return end + 1 if end != -1 else size
@@ -0,0 +1,372 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from python_solvespace import SolverSystem, Entity
+
+from slvstopy.constants import REFERENCE_GROUP, ConstraintType
+from slvstopy.instrument import Instrumentation, phase
+from slvstopy.records import ConstraintRecord, EntityRecord, GroupRecord
+from slvstopy.repositories import ConstraintRepository, EntityRepository
+from slvstopy.services import CONSTRAINT_SPECS, ConstraintService, EntityService
+
+# SolverSystem methods that return a new entity handle
+ENTITY_METHODS = {
+    "add_point_2d",
+    "add_point_3d",
+    "add_normal_2d",
+    "add_normal_3d",
+    "add_distance",
+    "add_line_2d",
+    "add_line_3d",
+    "add_cubic",
+    "add_arc",
+    "add_circle",
+    "add_work_plane",
+}
+
+# Argument positions of the initial parameter values of entity methods
+PARAM_ARGUMENTS = {
+    "add_point_2d": (0, 1),
+    "add_point_3d": (0, 1, 2),
+    "add_normal_3d": (0, 1, 2, 3),
+    "add_distance": (0,),
+}
+
+# (unbound SolverSystem method, result slot, arguments, (argument position, slot))
+Operation = Tuple[
+    Callable[..., Any], Optional[int], Tuple[Any, ...], Tuple[Tuple[int, int], ...]
+]
+
+
+def construct_system(
+    system: Any,
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+    group_definition: Sequence[GroupRecord] = (),
+    grouped: bool = False,
+) -> Dict[str, Entity]:
+    entity_repository = EntityRepository(system=system)
+    constraint_service = ConstraintService(
+        constraint_repository=ConstraintRepository(system=system),
+        entity_repository=entity_repository,
+    )
+    entity_groups, constraint_groups = solver_groups(
+        entity_definition, constraint_definition, group_definition, grouped
+    )
+
+    _construct_entities(entity_repository, entity_definition, entity_groups)
+    for constraint, group in zip(constraint_definition, constraint_groups):
+        _set_group(entity_repository, group)
+        constraint_service.construct_constraint(constraint)
+
+    return entity_repository.entities
+
+
+def solver_groups(
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+    group_definition: Sequence[GroupRecord] = (),
+    grouped: bool = False,
+) -> Tuple[List[int], List[int]]:
+    """
+    Solver group of each entity and constraint. By default the reference
+    group is solver group 0 and every other group is solved together as group
+    1. With `grouped`, each file group gets its own solver group, numbered in
+    Group.order.
+    """
+    entity_group_ids = [
+        record.group for record in entity_definition if record.group is not None
+    ]
+    if len(entity_group_ids) < len(entity_definition):
+        # No request information (ie. records built by hand). Assumption: first
+        # nine entities are reference entities
+        entity_groups = [
+            0 if index < 9 else 1 for index in range(len(entity_definition))
+        ]
+        return entity_groups, [1] * len(constraint_definition)
+
+    if not grouped:
+        entity_groups = [
+            0 if group == REFERENCE_GROUP else 1 for group in entity_group_ids
+        ]
+        return entity_groups, [1] * len(constraint_definition)
+
+    constraint_group_ids = [
+        record.group for record in constraint_definition if record.group is not None
+    ]
+    ranks = _group_ranks(group_definition, entity_group_ids + constraint_group_ids)
+    last = max(ranks.values(), default=0)
+    return (
+        [ranks[group] for group in entity_group_ids],
+        [
+            ranks[record.group] if record.group is not None else last
+            for record in constraint_definition
+        ],
+    )
+
+
+def _group_ranks(
+    group_definition: Sequence[GroupRecord], used: Sequence[str]
+) -> Dict[str, int]:
+    order = [
+        group.h
+        for group in sorted(group_definition, key=lambda group: (group.order, group.h))
+    ]
+    # Groups that are used without a Group block go last
+    order += sorted(set(used) - set(order))
+    return {group: rank for rank, group in enumerate(order)}
+
+
+def _set_group(entity_repository: EntityRepository, group: int) -> None:
+    if group != entity_repository.get_group_number():
+        entity_repository.set_group_number(group)
+
+
+def _construct_entities(
+    entity_repository: EntityRepository,
+    entity_definition: Sequence[EntityRecord],
+    entity_groups: Sequence[int],
+) -> None:
+    entity_service = EntityService(entity_repository=entity_repository)
+
+    by_group: Dict[int, List[EntityRecord]] = {}
+    for record, group in zip(entity_definition, entity_groups):
+        by_group.setdefault(group, []).append(record)
+
+    for group in sorted(by_group):
+        _set_group(entity_repository, group)
+        entity_service.construct_entities(by_group[group])
+
+
+class ConstructionPlan(object):
+    """
+    A flat list of SolverSystem calls with entity arguments resolved to slot
+    indices. Replaying it builds the same system as running the services on
+    the parsed records, without dispatching on record types again.
+    """
+
+    __slots__ = (
+        "operations",
+        "slot_count",
+        "entity_slots",
+        "constraint_values",
+        "entity_params",
+        "entity_groups",
+        "constraint_groups",
+        "solve_groups",
+    )
+
+    def __init__(
+        self,
+        operations: List[Operation],
+        slot_count: int,
+        entity_slots: Dict[str, int],
+        constraint_values: Dict[str, Tuple[int, int]],
+        entity_params: Dict[str, Tuple[int, Tuple[int, ...]]],
+        entity_groups: Optional[Dict[str, int]] = None,
+        constraint_groups: Optional[Dict[str, int]] = None,
+    ):
+        self.operations = operations
+        self.slot_count = slot_count
+        self.entity_slots = entity_slots
+        # constraint id -> (operation index, argument position of valA)
+        self.constraint_values = constraint_values
+        # entity id -> (operation index, argument positions of its parameters)
+        self.entity_params = entity_params
+        # entity/constraint id -> solver group
+        self.entity_groups = entity_groups or {}
+        self.constraint_groups = constraint_groups or {}
+        # Solver groups with constraints, in solve order
+        self.solve_groups = sorted(set(self.constraint_groups.values()))
+
+    def replay(
+        self,
+        overrides: Optional[Dict[str, float]] = None,
+        positions: Optional[Mapping[str, Sequence[float]]] = None,
+    ) -> Tuple[SolverSystem, Dict[str, Entity]]:
+        """
+        Build a new system. `overrides` replaces the value of dimensional
+        constraints and `positions` replaces the initial parameter values of
+        entities (in SolverSystem.params order), both keyed by handle.
+        """
+        operations = self.operations
+        if overrides or positions:
+            operations = self.patch(overrides or {}, positions or {})
+
+        system, slots = self.build(operations)
+        entities = {
+            entity_id: slots[index] for entity_id, index in self.entity_slots.items()
+        }
+        return system, entities
+
+    def build(self, operations: Sequence[Operation]) -> Tuple[SolverSystem, List[Any]]:
+        """
+        Execute `operations` (the plan's own, or a patched copy) against a new
+        system. Returns the system and the created entities indexed by slot.
+        """
+        system = SolverSystem()
+        slots: List[Any] = [None] * self.slot_count
+
+        for method, slot, args, references in operations:
+            if references:
+                resolved = list(args)
+                for position, index in references:
+                    resolved[position] = slots[index]
+                args = tuple(resolved)
+
+            result = method(system, *args)
+            if slot is not None:
+                slots[slot] = result
+
+        return system, slots
+
+    def patch(
+        self, overrides: Dict[str, float], positions: Mapping[str, Sequence[float]]
+    ) -> List[Operation]:
+        """A copy of the operations with `overrides` and `positions` applied."""
+        patches: Dict[int, Dict[int, float]] = {}
+
+        for constraint_id, value in overrides.items():
+            try:
+                index, position = self.constraint_values[constraint_id]
+            except KeyError:
+                raise KeyError(
+                    f"Constraint {constraint_id} does not have a value to override"
+                ) from None
+            patches.setdefault(index, {})[position] = float(value)
+
+        for entity_id, params in positions.items():
+            try:
+                index, param_positions = self.entity_params[entity_id]
+            except KeyError:
+                raise KeyError(f"Entity {entity_id} does not have parameters") from None
+            if len(params) != len(param_positions):
+                raise ValueError(
+                    f"Entity {entity_id} expects {len(param_positions)} parameters"
+                )
+            patch = patches.setdefault(index, {})
+            for position, value in zip(param_positions, params):
+                patch[position] = float(value)
+
+        operations = list(self.operations)
+        for index, patch in patches.items():
+            method, slot, args, references = operations[index]
+            patched = list(args)
+            for position, value in patch.items():
+                patched[position] = value
+            operations[index] = (method, slot, tuple(patched), references)
+
+        return operations
+
+
+def compile_plan(
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+    group_definition: Sequence[GroupRecord] = (),
+    grouped: bool = False,
+    instrumentation: Optional[Instrumentation] = None,
+) -> ConstructionPlan:
+    recorder = _RecordingSystem()
+    entity_repository = EntityRepository(system=recorder)
+    constraint_service = ConstraintService(
+        constraint_repository=ConstraintRepository(system=recorder),
+        entity_repository=entity_repository,
+    )
+
+    entity_groups, constraint_groups = solver_groups(
+        entity_definition, constraint_definition, group_definition, grouped
+    )
+
+    with phase(instrumentation, "entities"):
+        _construct_entities(entity_repository, entity_definition, entity_groups)
+    entity_slots = {
+        entity_id: slot.index for entity_id, slot in entity_repository.entities.items()
+    }
+
+    entity_params = {}
+    slot_operations = {
+        slot: index for index, (_, slot, _, _) in enumerate(recorder.operations)
+    }
+    for entity_id, slot in entity_slots.items():
+        index = slot_operations[slot]
+        param_positions = PARAM_ARGUMENTS.get(recorder.operations[index][0].__name__)
+        if param_positions:
+            entity_params[entity_id] = (index, param_positions)
+
+    constraint_values = {}
+    with phase(instrumentation, "constraints"):
+        for constraint, group in zip(constraint_definition, constraint_groups):
+            _set_group(entity_repository, group)
+            constraint_service.construct_constraint(constraint)
+            spec = CONSTRAINT_SPECS[constraint.type]
+            if constraint.h is None or not spec.value:
+                continue
+
+            index = len(recorder.operations) - 1
+            position = spec.value_position
+            if position is None or position >= len(recorder.operations[index][2]):
+                raise ValueError(
+                    f"No valA argument recorded for constraint {constraint.h} "
+                    f"({ConstraintType(constraint.type).name})"
+                )
+            constraint_values[constraint.h] = (index, position)
+
+    return ConstructionPlan(
+        operations=recorder.operations,
+        slot_count=recorder.slot_count,
+        entity_slots=entity_slots,
+        constraint_values=constraint_values,
+        entity_params=entity_params,
+        entity_groups={
+            record.h: group for record, group in zip(entity_definition, entity_groups)
+        },
+        constraint_groups={
+            record.h: group
+            for record, group in zip(constraint_definition, constraint_groups)
+            if record.h is not None
+        },
+    )
+
+
+class _Slot(object):
+    """Placeholder for an entity that does not exist until the plan is replayed."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _Slot) and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash(self.index)
+
+
+class _RecordingSystem(object):
+    """Stands in for a SolverSystem and records every call made to it."""
+
+    def __init__(self):
+        self.operations: List[Operation] = []
+        self.slot_count = 0
+
+    def __getattr__(self, name: str) -> Callable[..., Optional[_Slot]]:
+        method = getattr(SolverSystem, name)
+
+        def record(*args: Any) -> Optional[_Slot]:
+            references = tuple(
+                (position, arg.index)
+                for position, arg in enumerate(args)
+                if isinstance(arg, _Slot)
+            )
+
+            slot = None
+            if name in ENTITY_METHODS:
+                slot = _Slot(self.slot_count)
+                self.slot_count += 1
+
+            self.operations.append(
+                (method, slot.index if slot is not None else None, args, references)
+            )
+            return slot
+
+        return record
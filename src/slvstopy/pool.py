@@ -0,0 +1,170 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
+
+from python_solvespace import Entity, SolverSystem
+
+from slvstopy.plan import ConstructionPlan
+
+System = Tuple[SolverSystem, Dict[str, Entity]]
+OverridesKey = Tuple[Tuple[str, float], ...]
+
+
+class SystemPool(object):
+    """
+    Systems built ahead of demand. A background thread keeps between
+    `low_watermark` and `high_watermark` unsolved systems ready for the plan's
+    own dimensions and for every set of overrides passed to `watch`. Other
+    overrides are built on demand (a cold build).
+
+    Once a watched set drops below `low_watermark` it is refilled up to
+    `high_watermark`.
+
+    If building a system on the background thread fails, the thread stops and
+    `error` holds the exception, which every later `acquire` raises.
+    """
+
+    def __init__(
+        self,
+        plan: ConstructionPlan,
+        high_watermark: int = 8,
+        low_watermark: int = 2,
+        start: bool = True,
+    ):
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("Expected 0 <= low_watermark <= high_watermark")
+
+        self.plan = plan
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        # Systems handed out from the pool, built on demand and built ahead
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+        # Exception that stopped the background thread
+        self.error: Optional[BaseException] = None
+
+        self._ready: Dict[OverridesKey, Deque[System]] = {(): deque()}
+        self._overrides: Dict[OverridesKey, Dict[str, float]] = {(): {}}
+        # Sets being refilled up to the high watermark
+        self._filling: Set[OverridesKey] = {()}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._refill, name="slvstopy-system-pool", daemon=True
+        )
+        if start:
+            self._thread.start()
+
+    def __enter__(self) -> "SystemPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def ready(self) -> int:
+        with self._condition:
+            return sum(len(systems) for systems in self._ready.values())
+
+    def watch(self, overrides: Dict[str, float]) -> None:
+        """Keep systems with these dimension overrides ready as well."""
+        key = _key(overrides)
+        # Raise unknown constraints here rather than on the refill thread
+        self.plan.patch(dict(key), {})
+        with self._condition:
+            if key not in self._ready:
+                self._ready[key] = deque()
+                self._overrides[key] = dict(key)
+                self._filling.add(key)
+                self._condition.notify()
+
+    def acquire(self, overrides: Optional[Dict[str, float]] = None) -> System:
+        """
+        A new, unsolved system with `overrides` applied, from the pool if one
+        is ready.
+        """
+        key = _key(overrides)
+        with self._condition:
+            error = self.error
+            if error is not None:
+                raise RuntimeError(
+                    "The system pool failed to build a system"
+                ) from error
+            systems = self._ready.get(key)
+            if systems:
+                self.hits += 1
+                system = systems.popleft()
+                if len(systems) < self.low_watermark and key not in self._filling:
+                    self._filling.add(key)
+                    self._condition.notify()
+                return system
+
+            self.misses += 1
+            if systems is not None and key not in self._filling:
+                self._filling.add(key)
+                self._condition.notify()
+
+        return self.plan.replay(overrides)
+
+    def fill(self) -> None:
+        """Fill every watched set up to the high watermark on this thread."""
+        while True:
+            with self._condition:
+                key = self._wanted()
+                if key is None:
+                    return
+            self._build(key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "built": self.built,
+                "ready": sum(len(systems) for systems in self._ready.values()),
+            }
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _refill(self) -> None:
+        while True:
+            with self._condition:
+                key = self._wanted()
+                while key is None and not self._closed:
+                    self._condition.wait()
+                    key = self._wanted()
+                if self._closed or key is None:
+                    return
+            try:
+                self._build(key)
+            except Exception as error:
+                with self._condition:
+                    self.error = error
+                return
+
+    def _wanted(self) -> Optional[OverridesKey]:
+        """A set that is being refilled, None if every set is full."""
+        for key in list(self._filling):
+            if len(self._ready[key]) < self.high_watermark:
+                return key
+            self._filling.discard(key)
+        return None
+
+    def _build(self, key: OverridesKey) -> None:
+        # Build outside the lock, acquire keeps serving meanwhile
+        system = self.plan.replay(self._overrides[key])
+        with self._condition:
+            self._ready[key].append(system)
+            self.built += 1
+
+
+def _key(overrides: Optional[Dict[str, float]]) -> OverridesKey:
+    return tuple(
+        sorted((key, float(value)) for key, value in (overrides or {}).items())
+    )
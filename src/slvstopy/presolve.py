@@ -0,0 +1,177 @@
+import copy
+from typing import Dict, List, Sequence, Tuple
+
+from slvstopy.components import CONSTRAINT_REFERENCES, shared_entities
+from slvstopy.constants import ConstraintType, EntityType
+from slvstopy.records import ConstraintRecord, EntityRecord
+
+POINT_TYPES = (EntityType.POINT_IN_2D, EntityType.POINT_IN_3D)
+
+
+class PresolveReport(object):
+    __slots__ = ("removed_entities", "merged_points", "removed_constraints")
+
+    def __init__(
+        self,
+        removed_entities: Sequence[str],
+        merged_points: Dict[str, str],
+        removed_constraints: Sequence[str],
+    ):
+        # Entity ids that no constraint reaches, in file order
+        self.removed_entities = tuple(removed_entities)
+        # Merged point id -> id of the point it was merged into
+        self.merged_points = merged_points
+        # Ids of the coincident constraints made redundant by merging
+        self.removed_constraints = tuple(removed_constraints)
+
+    def __repr__(self) -> str:
+        return (
+            f"PresolveReport({len(self.removed_entities)} entities removed, "
+            f"{len(self.merged_points)} points merged, "
+            f"{len(self.removed_constraints)} constraints removed)"
+        )
+
+
+def presolve(
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+) -> Tuple[List[EntityRecord], List[ConstraintRecord], PresolveReport]:
+    """
+    Shrink a model before it is constructed:
+
+    * points joined by POINTS_COINCIDENT are merged into the first of them,
+      when both are the same type of point, in the same workplane and group,
+      and the constraint is in 3D or in the workplane of both (2D) points
+    * entities that no constraint reaches (directly or through a line,
+      circle, workplane, ...) are removed, other than shared entities and
+      points that others were merged into
+
+    Records that change are copied, the input records are left untouched.
+    """
+    shared = shared_entities(entity_definition, constraint_definition)
+    aliases = _merge_coincident(entity_definition, constraint_definition, shared)
+
+    constraints = []
+    removed_constraints: List[str] = []
+    for constraint in constraint_definition:
+        if constraint.type == ConstraintType.POINTS_COINCIDENT and _alias(
+            aliases, constraint.pt_a
+        ) == _alias(aliases, constraint.pt_b):
+            if constraint.h is not None:
+                removed_constraints.append(constraint.h)
+            continue
+        constraints.append(_rename_constraint(constraint, aliases))
+
+    references = {
+        record.h: [*record.point, record.normal, record.distance, record.workplane]
+        for record in entity_definition
+    }
+    reached = set(shared)
+    # Points something was merged into stand for the merged points, even when
+    # the dropped coincident constraint was the only one reaching them
+    pending = list(aliases.values()) + [
+        getattr(constraint, field)
+        for constraint in constraints
+        for field in CONSTRAINT_REFERENCES + ("workplane",)
+    ]
+    while pending:
+        entity_id = _alias(aliases, pending.pop())
+        if entity_id is None or entity_id in reached:
+            continue
+        reached.add(entity_id)
+        pending.extend(references.get(entity_id, ()))
+
+    entities = []
+    removed_entities = []
+    for record in entity_definition:
+        if record.h in aliases:
+            continue
+        if record.h not in reached:
+            removed_entities.append(record.h)
+            continue
+        entities.append(_rename_entity(record, aliases))
+
+    return (
+        entities,
+        constraints,
+        PresolveReport(
+            removed_entities,
+            {entity_id: _alias(aliases, entity_id) for entity_id in aliases},
+            removed_constraints,
+        ),
+    )
+
+
+def _merge_coincident(
+    entity_definition: Sequence[EntityRecord],
+    constraint_definition: Sequence[ConstraintRecord],
+    shared: set,
+) -> Dict[str, str]:
+    """Merged point id -> the point it is merged into (possibly merged again)."""
+    points = {
+        record.h: (index, record)
+        for index, record in enumerate(entity_definition)
+        if record.type in POINT_TYPES and record.h not in shared
+    }
+    aliases: Dict[str, str] = {}
+
+    for constraint in constraint_definition:
+        if constraint.type != ConstraintType.POINTS_COINCIDENT:
+            continue
+        a = points.get(_alias(aliases, constraint.pt_a))
+        b = points.get(_alias(aliases, constraint.pt_b))
+        if a is None or b is None or a[1] is b[1]:
+            continue
+
+        (_, kept), (_, merged) = sorted((a, b), key=lambda point: point[0])
+        if (
+            kept.type == merged.type
+            and kept.workplane == merged.workplane
+            and kept.group == merged.group
+            and _coincide_fully(constraint, kept)
+        ):
+            aliases[merged.h] = kept.h
+
+    return aliases
+
+
+def _coincide_fully(constraint: ConstraintRecord, point: EntityRecord) -> bool:
+    """
+    Whether the constraint makes the points equal, rather than only their
+    projections: 3D points coincident in a workplane stay free along its normal.
+    """
+    if constraint.workplane is None:
+        return True
+    return (
+        point.type == EntityType.POINT_IN_2D and point.workplane == constraint.workplane
+    )
+
+
+def _alias(aliases: Dict[str, str], entity_id):
+    while entity_id in aliases:
+        entity_id = aliases[entity_id]
+    return entity_id
+
+
+def _rename_entity(record: EntityRecord, aliases: Dict[str, str]) -> EntityRecord:
+    if not any(point in aliases for point in record.point):
+        return record
+    record = copy.copy(record)
+    record.point = tuple(_alias(aliases, point) for point in record.point)
+    return record
+
+
+def _rename_constraint(
+    constraint: ConstraintRecord, aliases: Dict[str, str]
+) -> ConstraintRecord:
+    fields = [
+        field
+        for field in CONSTRAINT_REFERENCES
+        if getattr(constraint, field) in aliases
+    ]
+    if not fields:
+        return constraint
+    constraint = copy.copy(constraint)
+    for field in fields:
+        setattr(constraint, field, _alias(aliases, getattr(constraint, field)))
+    return constraint
@@ -0,0 +1,297 @@
+from typing import Dict, Optional, Tuple
+
+
+Fields = Dict[str, str]
+
+POINT_FIELDS = ("point[0].v", "point[1].v", "point[2].v", "point[3].v")
+
+
+def _handle(fields: Fields, key: str) -> Optional[str]:
+    return fields.get(f"{key}.v") or None
+
+
+def _float(fields: Fields, key: str) -> float:
+    return float(fields.get(key, "0"))
+
+
+def _flag(fields: Fields, key: str) -> bool:
+    return bool(int(fields.get(key, "0")))
+
+
+class EntityRecord(object):
+    __slots__ = (
+        "h",
+        "type",
+        "construction",
+        "workplane",
+        "point",
+        "normal",
+        "distance",
+        "act_point",
+        "act_normal",
+        "act_distance",
+        "group",
+    )
+
+    def __init__(
+        self,
+        h: str,
+        type: int,
+        construction: bool = False,
+        workplane: Optional[str] = None,
+        point: Tuple[str, ...] = (),
+        normal: Optional[str] = None,
+        distance: Optional[str] = None,
+        act_point: Optional[Tuple[float, float, float]] = None,
+        act_normal: Optional[Tuple[float, float, float, float]] = None,
+        act_distance: Optional[float] = None,
+        group: Optional[str] = None,
+    ):
+        self.h = h
+        self.type = type
+        self.construction = construction
+        self.workplane = workplane
+        self.point = point
+        self.normal = normal
+        self.distance = distance
+        # (x, y, z), None if the file does not define actPoint
+        self.act_point = act_point
+        # (w, vx, vy, vz), None if the file does not define actNormal
+        self.act_normal = act_normal
+        # None if the file does not define actDistance
+        self.act_distance = act_distance
+        # Entity blocks do not save a group, it is set from the owning request
+        self.group = group
+
+    @classmethod
+    def from_fields(cls, fields: Fields) -> "EntityRecord":
+        """
+        Build a record from the dotted keys of an entity block with the
+        "Entity." prefix removed (ie. {"h.v": "00040000", "type": "2001"}).
+        SolveSpace omits zero values, so missing coordinates default to zero.
+        """
+        has_point = any(key.startswith("actPoint.") for key in fields)
+        has_normal = any(key.startswith("actNormal.") for key in fields)
+
+        return cls(
+            h=fields["h.v"],
+            type=int(fields["type"]),
+            construction=_flag(fields, "construction"),
+            workplane=_handle(fields, "workplane"),
+            point=tuple(fields[key] for key in POINT_FIELDS if key in fields),
+            normal=_handle(fields, "normal"),
+            distance=_handle(fields, "distance"),
+            act_point=(
+                (
+                    _float(fields, "actPoint.x"),
+                    _float(fields, "actPoint.y"),
+                    _float(fields, "actPoint.z"),
+                )
+                if has_point
+                else None
+            ),
+            act_normal=(
+                (
+                    _float(fields, "actNormal.w"),
+                    _float(fields, "actNormal.vx"),
+                    _float(fields, "actNormal.vy"),
+                    _float(fields, "actNormal.vz"),
+                )
+                if has_normal
+                else None
+            ),
+            act_distance=(
+                _float(fields, "actDistance") if "actDistance" in fields else None
+            ),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EntityRecord):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+
+class ConstraintRecord(object):
+    __slots__ = (
+        "h",
+        "type",
+        "workplane",
+        "val_a",
+        "pt_a",
+        "pt_b",
+        "entity_a",
+        "entity_b",
+        "entity_c",
+        "entity_d",
+        "other",
+        "other2",
+        "reference",
+        "group",
+    )
+
+    def __init__(
+        self,
+        h: Optional[str],
+        type: int,
+        workplane: Optional[str] = None,
+        val_a: float = 0.0,
+        pt_a: Optional[str] = None,
+        pt_b: Optional[str] = None,
+        entity_a: Optional[str] = None,
+        entity_b: Optional[str] = None,
+        entity_c: Optional[str] = None,
+        entity_d: Optional[str] = None,
+        other: bool = False,
+        other2: bool = False,
+        reference: bool = False,
+        group: Optional[str] = None,
+    ):
+        self.h = h
+        self.type = type
+        self.workplane = workplane
+        self.val_a = val_a
+        self.pt_a = pt_a
+        self.pt_b = pt_b
+        self.entity_a = entity_a
+        self.entity_b = entity_b
+        self.entity_c = entity_c
+        self.entity_d = entity_d
+        self.other = other
+        self.other2 = other2
+        self.reference = reference
+        self.group = group
+
+    @classmethod
+    def from_fields(cls, fields: Fields) -> "ConstraintRecord":
+        """
+        Build a record from the dotted keys of a constraint block with the
+        "Constraint." prefix removed.
+        """
+        return cls(
+            h=_handle(fields, "h"),
+            type=int(fields["type"]),
+            workplane=_handle(fields, "workplane"),
+            val_a=_float(fields, "valA"),
+            pt_a=_handle(fields, "ptA"),
+            pt_b=_handle(fields, "ptB"),
+            entity_a=_handle(fields, "entityA"),
+            entity_b=_handle(fields, "entityB"),
+            entity_c=_handle(fields, "entityC"),
+            entity_d=_handle(fields, "entityD"),
+            other=_flag(fields, "other"),
+            other2=_flag(fields, "other2"),
+            reference=_flag(fields, "reference"),
+            group=_handle(fields, "group"),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ConstraintRecord):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+
+class GroupRecord(object):
+    __slots__ = ("h", "type", "order", "name")
+
+    def __init__(self, h: str, type: int, order: int = 0, name: str = ""):
+        self.h = h
+        self.type = type
+        self.order = order
+        self.name = name
+
+    @classmethod
+    def from_fields(cls, fields: Fields) -> "GroupRecord":
+        """
+        Build a record from the keys of a group block with the "Group." prefix
+        removed.
+        """
+        return cls(
+            h=fields["h.v"],
+            type=int(fields["type"]),
+            order=int(fields.get("order", "0")),
+            name=fields.get("name", ""),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GroupRecord):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+
+class RequestRecord(object):
+    __slots__ = ("h", "type", "group", "workplane")
+
+    def __init__(
+        self,
+        h: str,
+        type: int,
+        group: Optional[str] = None,
+        workplane: Optional[str] = None,
+    ):
+        self.h = h
+        self.type = type
+        self.group = group
+        self.workplane = workplane
+
+    @classmethod
+    def from_fields(cls, fields: Fields) -> "RequestRecord":
+        """
+        Build a record from the keys of a request block with the "Request."
+        prefix removed.
+        """
+        return cls(
+            h=fields["h.v"],
+            type=int(fields["type"]),
+            group=_handle(fields, "group"),
+            workplane=_handle(fields, "workplane"),
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RequestRecord):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+
+class ParamRecord(object):
+    __slots__ = ("h", "val")
+
+    def __init__(self, h: int, val: float = 0.0):
+        self.h = h
+        self.val = val
+
+    @classmethod
+    def from_fields(cls, fields: Fields) -> "ParamRecord":
+        """
+        Build a record from the keys of a param block with the "Param." prefix
+        removed. SolveSpace writes the handle as "Param.h.v." (trailing dot).
+        """
+        return cls(h=int(fields["h.v."], 16), val=_float(fields, "val"))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ParamRecord):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+
+def _values(record) -> tuple:
+    return tuple(getattr(record, name) for name in record.__slots__)
+
+
+def _repr(record) -> str:
+    values = ", ".join(f"{name}={getattr(record, name)!r}" for name in record.__slots__)
+    return f"{type(record).__name__}({values})"
@@ -8,8 +8,10 @@ class EntityNotFoundException(Exception):
 
 
 class EntityRepository(object):
-    def __init__(self, system: SolverSystem = SolverSystem()):
-        self.system: SolverSystem = system
+    def __init__(self, system: Any = None):
+        # A new system per repository, never one shared through a default. Any
+        # object with the SolverSystem methods will do (ie. a plan recorder)
+        self.system: Any = system if system is not None else SolverSystem()
         self.entities: Dict[str, Any] = {}
         self._group_number = 0
 
@@ -200,8 +202,8 @@ class EntityRepository(object):
 
 
 class ConstraintRepository(object):
-    def __init__(self, system: SolverSystem = SolverSystem()):
-        self.system: SolverSystem = system
+    def __init__(self, system: Any = None):
+        self.system: Any = system if system is not None else SolverSystem()
 
     def add_points_coincident(
         self, point_a: Entity, point_b: Entity, wp: Entity = Entity.FREE_IN_3D
@@ -0,0 +1,87 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from python_solvespace import Entity, SolverSystem
+
+from slvstopy.plan import ConstructionPlan
+
+
+class ReusableSystem(object):
+    """
+    Keeps one built system per model and solves it again after restoring the
+    initial parameters, instead of replaying the plan for every solve.
+
+    Reuse depends on the backend keeping the system after a solve. Whenever a
+    reused system comes back empty (python_solvespace 3.0 frees the system
+    once it has solved), or the dimensions change, the plan is replayed
+    instead, and a backend that refused once is not asked again.
+
+    The returned system is reset by the next call to solve, read any results
+    from it first.
+    """
+
+    def __init__(self, plan: ConstructionPlan):
+        self.plan = plan
+        # None until a reused solve shows whether the backend keeps systems
+        self.reusable: Optional[bool] = None
+        self.reused = 0
+        self.rebuilt = 0
+        self._system: Optional[SolverSystem] = None
+        self._entities: Dict[str, Entity] = {}
+        self._overrides: Dict[str, float] = {}
+        self._constraints: Any = None
+        # (entity params, initial values) of every entity with parameters
+        self._initial: List[Tuple[Any, Tuple[float, ...]]] = []
+
+    def solve(
+        self, overrides: Optional[Dict[str, float]] = None
+    ) -> Tuple[int, SolverSystem, Dict[str, Entity]]:
+        overrides = {key: float(value) for key, value in (overrides or {}).items()}
+
+        if (
+            self._system is not None
+            and self.reusable is not False
+            and overrides == self._overrides
+        ):
+            system = self._system
+            if self._restore(system):
+                result = system.solve()
+                if system.constraints() == self._constraints:
+                    self.reusable = True
+                    self.reused += 1
+                    return result, system, self._entities
+            self.reusable = False
+
+        system, entities = self._build(overrides)
+        self.rebuilt += 1
+        return system.solve(), system, entities
+
+    def _restore(self, system: SolverSystem) -> bool:
+        try:
+            for params, values in self._initial:
+                system.set_params(params, values)
+        except (RuntimeError, ValueError, TypeError):
+            return False
+        return True
+
+    def _build(
+        self, overrides: Dict[str, float]
+    ) -> Tuple[SolverSystem, Dict[str, Entity]]:
+        plan = self.plan
+        operations = plan.patch(overrides, {}) if overrides else plan.operations
+        system, slots = plan.build(operations)
+        entities = {
+            entity_id: slots[index] for entity_id, index in plan.entity_slots.items()
+        }
+
+        self._system = system
+        self._entities = entities
+        self._overrides = overrides
+        self._constraints = system.constraints()
+        self._initial = [
+            (
+                entities[entity_id].params,
+                tuple(operations[index][2][position] for position in positions),
+            )
+            for entity_id, (index, positions) in plan.entity_params.items()
+        ]
+        return system, entities
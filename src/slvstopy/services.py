@@ -1,16 +1,26 @@
-from typing import Dict, Any
+from functools import partial
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
 from python_solvespace import Entity
 
 from slvstopy.constants import EntityType, ConstraintType
-from slvstopy.repositories import EntityRepository, ConstraintRepository
-from slvstopy.utils import get_in_dict
+from slvstopy.records import ConstraintRecord, EntityRecord
+from slvstopy.repositories import (
+    ConstraintRepository,
+    EntityNotFoundException,
+    EntityRepository,
+)
+
+ORIGIN = (0.0, 0.0, 0.0)
+ZERO_NORMAL = (0.0, 0.0, 0.0, 0.0)
 
 
 class EntityService(object):
     def __init__(
-        self, entity_repository=EntityRepository(),
+        self, entity_repository: Optional[EntityRepository] = None,
     ):
+        if entity_repository is None:
+            entity_repository = EntityRepository()
         self.entity_repository = entity_repository
 
     def get_group_number(self) -> int:
@@ -19,391 +29,291 @@ class EntityService(object):
     def set_group_number(self, group_number: int):
         self.entity_repository.set_group_number(group_number)
 
-    def construct_entities(self, entity_definition_list):
-        for entity_definition in entity_definition_list:
-            self.construct_entity(entity_definition, entity_definition_list)
+    def construct_entities(self, entity_definition_list: List[EntityRecord]):
+        index = self._index_by_id(entity_definition_list)
+        for entity_definition in self._construction_order(
+            entity_definition_list, index
+        ):
+            self._create_entity(entity_definition)
+
+    def construct_entity(
+        self,
+        entity_definition: EntityRecord,
+        entity_definition_list: List[EntityRecord],
+    ):
+        index = self._index_by_id(entity_definition_list)
+        for dependency in self._construction_order([entity_definition], index):
+            entity = self._create_entity(dependency)
+        return entity
+
+    def _index_by_id(
+        self, entity_definition_list: List[EntityRecord]
+    ) -> Dict[str, EntityRecord]:
+        return {
+            entity_definition.h: entity_definition
+            for entity_definition in entity_definition_list
+        }
+
+    def _construction_order(
+        self,
+        entity_definition_list: Iterable[EntityRecord],
+        index: Dict[str, EntityRecord],
+    ) -> List[EntityRecord]:
+        """
+        Order definitions so that every entity comes after the entities it is
+        built from (depth first post-order, without recursion). Dependencies
+        missing from the index must already exist in the repository.
+        """
+        order = []
+        visited: Set[str] = set()
+
+        for root in entity_definition_list:
+            if root.h in visited:
+                continue
+            visited.add(root.h)
+
+            stack = [(root, iter(_dependencies(root)))]
+            while stack:
+                entity_definition, dependencies = stack[-1]
+                for entity_id in dependencies:
+                    if entity_id in visited:
+                        continue
+                    visited.add(entity_id)
 
-    def construct_entity(self, entity_definition, entity_definition_list):
-        entity_type = int(entity_definition["type"])
-        entity_id = entity_definition["h"]["v"]
+                    dependency = index.get(entity_id)
+                    if dependency is not None:
+                        stack.append((dependency, iter(_dependencies(dependency))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(entity_definition)
+
+        return order
+
+    def _create_entity(self, entity_definition: EntityRecord):
+        entity_type = entity_definition.type
+        entity_id = entity_definition.h
+        get = partial(_get, self.entity_repository)
 
         if (
             entity_type == EntityType.POINT_IN_3D
             or entity_type == EntityType.POINT_N_COPY
         ):
-            act_point = self._validate_actpoint(entity_definition)
-            return self.entity_repository.get_or_create_point_in_3d(
-                entity_id, act_point["x"], act_point["y"], act_point["z"],
-            )
+            x, y, z = entity_definition.act_point or ORIGIN
+            return self.entity_repository.get_or_create_point_in_3d(entity_id, x, y, z)
         elif entity_type == EntityType.POINT_IN_2D:
-            wp = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["workplane"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-
-            act_point = self._validate_actpoint(entity_definition)
+            x, y, _ = entity_definition.act_point or ORIGIN
             return self.entity_repository.get_or_create_point_in_2d(
-                entity_id, act_point["x"], act_point["y"], wp,
+                entity_id, x, y, get(entity_definition.workplane)
             )
         elif (
             entity_type == EntityType.NORMAL_IN_3D
             or entity_type == EntityType.NORMAL_N_COPY
         ):
-            act_normal = self._validate_actnormal(entity_definition)
+            w, vx, vy, vz = entity_definition.act_normal or ZERO_NORMAL
             return self.entity_repository.get_or_create_normal_in_3d(
-                entity_id,
-                act_normal["vx"],
-                act_normal["vy"],
-                act_normal["vz"],
-                act_normal["w"],
-            )
-        elif entity_type == EntityType.NORMAL_IN_2D:
-            workplane = (
-                self.construct_entity(
-                    self._get_entity_definition_by_id(
-                        entity_definition["workplane"]["v"], entity_definition_list
-                    ),
-                    entity_definition_list,
-                )
-                if "workplane" in entity_definition
-                else None
+                entity_id, vx, vy, vz, w
             )
+
+        workplane = (
+            get(entity_definition.workplane) if entity_definition.workplane else None
+        )
+
+        if entity_type == EntityType.NORMAL_IN_2D:
             return self.entity_repository.get_or_create_normal_in_2d(
-                entity_id, workplane
+                entity_id, get(entity_definition.workplane)
             )
         elif entity_type == EntityType.DISTANCE:
-            act_distance = float(entity_definition["actDistance"])
-            workplane = (
-                self.construct_entity(
-                    self._get_entity_definition_by_id(
-                        entity_definition["workplane"]["v"], entity_definition_list
-                    ),
-                    entity_definition_list,
-                )
-                if "workplane" in entity_definition
-                else None
-            )
             return self.entity_repository.get_or_create_distance(
-                entity_id, act_distance, workplane
+                entity_id,
+                entity_definition.act_distance or 0.0,
+                workplane if workplane is not None else Entity.FREE_IN_3D,
             )
         elif entity_type == EntityType.WORKPLANE:
-            point = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["point[0]"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-            normal = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["normal"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-            entity = self.entity_repository.get_or_create_workplane(
-                entity_id, point, normal
+            return self.entity_repository.get_or_create_workplane(
+                entity_id,
+                get(entity_definition.point[0]),
+                get(entity_definition.normal),
             )
-
-            return entity
         elif entity_type == EntityType.LINE_SEGMENT:
-            first_point = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["point[0]"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-            second_point = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["point[1]"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-            workplane = (
-                self.construct_entity(
-                    self._get_entity_definition_by_id(
-                        entity_definition["workplane"]["v"], entity_definition_list
-                    ),
-                    entity_definition_list,
-                )
-                if "workplane" in entity_definition
-                else None
-            )
             return self.entity_repository.get_or_create_line_segment(
-                entity_id, first_point, second_point, workplane
+                entity_id,
+                get(entity_definition.point[0]),
+                get(entity_definition.point[1]),
+                workplane,
             )
         elif entity_type == EntityType.CIRCLE:
             # WARNING: only 2D circles are supported by python-solvespace
-            point = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["point[0]"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-            normal = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["normal"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-            distance = self.construct_entity(
-                self._get_entity_definition_by_id(
-                    entity_definition["distance"]["v"], entity_definition_list
-                ),
-                entity_definition_list,
-            )
-            workplane = (
-                self.construct_entity(
-                    self._get_entity_definition_by_id(
-                        entity_definition["workplane"]["v"], entity_definition_list
-                    ),
-                    entity_definition_list,
-                )
-                if "workplane" in entity_definition
-                else None
-            )
             return self.entity_repository.get_or_create_circle(
-                entity_id, normal, point, distance, workplane
+                entity_id,
+                get(entity_definition.normal),
+                get(entity_definition.point[0]),
+                get(entity_definition.distance),
+                get(entity_definition.workplane),
             )
         else:
             raise NotImplementedError(
                 f"Entity type {EntityType(entity_type).name} is not supported"
             )
 
-    def _get_entity_definition_by_id(self, entity_id, entity_definition_list):
-        return next(
-            entity for entity in entity_definition_list if entity["h"]["v"] == entity_id
-        )
 
-    def _validate_actpoint(self, entity_definition: Dict[str, Any]) -> Dict[str, float]:
-        act_point = get_in_dict(entity_definition, "actPoint")
-        act_point = act_point if act_point is not None else {}
+def _get(entity_repository: EntityRepository, entity_id: Optional[str]) -> Entity:
+    """Look up a record's handle field, which is None when the field is unset."""
+    if entity_id is None:
+        raise EntityNotFoundException
+    return entity_repository.get(entity_id)
+
+
+def _dependencies(entity_definition: EntityRecord) -> List[str]:
+    entity_type = entity_definition.type
+
+    dependencies: List[Optional[str]]
+    if entity_type == EntityType.WORKPLANE:
+        dependencies = [entity_definition.point[0], entity_definition.normal]
+    elif entity_type == EntityType.LINE_SEGMENT:
+        dependencies = list(entity_definition.point[:2])
+    elif entity_type == EntityType.CIRCLE:
+        dependencies = [
+            entity_definition.point[0],
+            entity_definition.normal,
+            entity_definition.distance,
+        ]
+    elif entity_type in (
+        EntityType.POINT_IN_2D,
+        EntityType.NORMAL_IN_2D,
+        EntityType.DISTANCE,
+    ):
+        dependencies = []
+    else:
+        return []
+
+    dependencies.append(entity_definition.workplane)
+    return [dependency for dependency in dependencies if dependency]
 
-        x = act_point.get("x", "0")
-        y = act_point.get("y", "0")
-        z = act_point.get("z", "0")
 
-        return {"x": float(x), "y": float(y), "z": float(z)}
+class ConstraintSpec(NamedTuple):
+    # ConstraintRepository method, None if the constraint is not supported
+    method: Optional[str]
+    # ConstraintRecord handle fields, in argument order
+    handles: Tuple[str, ...] = ()
+    # Pass valA after the handles
+    value: bool = False
+    # Argument position of valA in the SolverSystem call the method makes
+    value_position: Optional[int] = None
+    # Use the constraint workplane without falling back to Entity.FREE_IN_3D
+    workplane_required: bool = False
+    # Pass `other` as the last argument
+    inverse: bool = False
 
-    def _validate_actnormal(
-        self, entity_definition: Dict[str, Any]
-    ) -> Dict[str, float]:
-        act_normal = get_in_dict(entity_definition, "actNormal")
-        act_normal = act_normal if act_normal is not None else {}
 
-        vx = act_normal.get("vx", "0")
-        vy = act_normal.get("vy", "0")
-        vz = act_normal.get("vz", "0")
-        w = act_normal.get("w", "0")
+UNSUPPORTED = ConstraintSpec(method=None)
 
-        return {"vx": float(vx), "vy": float(vy), "vz": float(vz), "w": float(w)}
+CONSTRAINT_SPECS: Dict[int, ConstraintSpec] = {
+    ConstraintType.POINTS_COINCIDENT: ConstraintSpec(
+        "add_points_coincident", ("pt_a", "pt_b")
+    ),
+    ConstraintType.PT_PT_DISTANCE: ConstraintSpec(
+        "add_pt_pt_distance", ("pt_a", "pt_b"), value=True, value_position=2
+    ),
+    ConstraintType.PT_PLANE_DISTANCE: ConstraintSpec(
+        "add_pt_plane_distance", ("pt_a", "entity_a"), value=True, value_position=2
+    ),
+    ConstraintType.PT_LINE_DISTANCE: ConstraintSpec(
+        "add_pt_line_distance", ("pt_a", "entity_a"), value=True, value_position=2
+    ),
+    ConstraintType.PT_FACE_DISTANCE: UNSUPPORTED,
+    ConstraintType.PROJ_PT_DISTANCE: UNSUPPORTED,
+    ConstraintType.PT_IN_PLANE: UNSUPPORTED,
+    ConstraintType.PT_ON_LINE: ConstraintSpec("add_pt_on_line", ("pt_a", "entity_a")),
+    ConstraintType.PT_ON_FACE: UNSUPPORTED,
+    ConstraintType.EQUAL_LENGTH_LINES: ConstraintSpec(
+        "add_equal_length_lines", ("entity_a", "entity_b")
+    ),
+    ConstraintType.LENGTH_RATIO: UNSUPPORTED,
+    ConstraintType.EQ_LEN_PT_LINE_D: UNSUPPORTED,
+    ConstraintType.EQ_PT_LN_DISTANCES: UNSUPPORTED,
+    ConstraintType.EQUAL_ANGLE: UNSUPPORTED,
+    ConstraintType.EQUAL_LINE_ARC_LEN: UNSUPPORTED,
+    ConstraintType.LENGTH_DIFFERENCE: UNSUPPORTED,
+    ConstraintType.SYMMETRIC: UNSUPPORTED,
+    ConstraintType.SYMMETRIC_HORIZ: UNSUPPORTED,
+    ConstraintType.SYMMETRIC_VERT: UNSUPPORTED,
+    ConstraintType.SYMMETRIC_LINE: UNSUPPORTED,
+    ConstraintType.AT_MIDPOINT: ConstraintSpec("add_at_midpoint", ("pt_a", "entity_a")),
+    ConstraintType.HORIZONTAL: ConstraintSpec(
+        "add_horizontal", ("entity_a",), workplane_required=True
+    ),
+    ConstraintType.VERTICAL: ConstraintSpec(
+        "add_vertical", ("entity_a",), workplane_required=True
+    ),
+    ConstraintType.DIAMETER: ConstraintSpec(
+        "add_diameter", ("entity_a",), value=True, value_position=1
+    ),
+    ConstraintType.PT_ON_CIRCLE: UNSUPPORTED,
+    ConstraintType.SAME_ORIENTATION: UNSUPPORTED,
+    ConstraintType.ANGLE: ConstraintSpec(
+        "add_angle",
+        ("entity_a", "entity_b"),
+        value=True,
+        value_position=2,
+        inverse=True,
+    ),
+    ConstraintType.PARALLEL: ConstraintSpec("add_parallel", ("entity_a", "entity_b")),
+    ConstraintType.PERPENDICULAR: ConstraintSpec(
+        "add_perpendicular", ("entity_a", "entity_b"), inverse=True
+    ),
+    ConstraintType.ARC_LINE_TANGENT: UNSUPPORTED,
+    ConstraintType.CUBIC_LINE_TANGENT: UNSUPPORTED,
+    ConstraintType.CURVE_CURVE_TANGENT: UNSUPPORTED,
+    ConstraintType.EQUAL_RADIUS: ConstraintSpec(
+        "add_equal_radius", ("entity_a", "entity_b")
+    ),
+    ConstraintType.WHERE_DRAGGED: ConstraintSpec("add_where_dragged", ("pt_a",)),
+    ConstraintType.COMMENT: UNSUPPORTED,
+}
 
 
 class ConstraintService(object):
     def __init__(
         self,
-        constraint_repository=ConstraintRepository(),
-        entity_repository=EntityRepository(),
+        constraint_repository: Optional[ConstraintRepository] = None,
+        entity_repository: Optional[EntityRepository] = None,
     ):
+        # Repositories created here share one new system
+        if entity_repository is None:
+            entity_repository = EntityRepository(
+                system=constraint_repository.system if constraint_repository else None
+            )
+        if constraint_repository is None:
+            constraint_repository = ConstraintRepository(
+                system=entity_repository.system
+            )
         self.constraint_repository = constraint_repository
         self.entity_repository = entity_repository
 
-    def construct_constraints(self, constraint_definition_list):
+    def construct_constraints(self, constraint_definition_list: List[ConstraintRecord]):
         for constraint_definition in constraint_definition_list:
             self.construct_constraint(constraint_definition)
 
-    def construct_constraint(self, constraint_definition):
-        constraint_type = ConstraintType(int(constraint_definition["type"]))
-
-        # TODO: Most of the constraint definitions are the same. Get rid of the
-        # repetitive boilerplate.
-        if constraint_type == ConstraintType.POINTS_COINCIDENT:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            point_b = self.entity_repository.get(constraint_definition["ptB"]["v"])
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_points_coincident(
-                point_a, point_b, workplane
-            )
-        elif constraint_type == ConstraintType.PT_PT_DISTANCE:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            point_b = self.entity_repository.get(constraint_definition["ptB"]["v"])
-            value = (
-                float(constraint_definition["valA"])
-                if constraint_definition.get("valA")
-                else 0.0
-            )
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_pt_pt_distance(
-                point_a, point_b, value, workplane
-            )
-        elif constraint_type == ConstraintType.PT_PLANE_DISTANCE:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            plane = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            value = (
-                float(constraint_definition["valA"])
-                if constraint_definition.get("valA")
-                else 0.0
-            )
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_pt_plane_distance(
-                point_a, plane, value, workplane
-            )
-
-        elif constraint_type == ConstraintType.PT_LINE_DISTANCE:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            line = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            value = (
-                float(constraint_definition["valA"])
-                if constraint_definition.get("valA")
-                else 0.0
-            )
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_pt_line_distance(
-                point_a, line, value, workplane
-            )
-        elif constraint_type == ConstraintType.PT_LINE_DISTANCE:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            plane = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            value = (
-                float(constraint_definition["valA"])
-                if constraint_definition.get("valA")
-                else 0.0
-            )
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_pt_line_distance(
-                point_a, plane, value, workplane
-            )
-        elif constraint_type == ConstraintType.PT_ON_LINE:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            line = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_pt_on_line(point_a, line, workplane)
-        elif constraint_type == ConstraintType.EQUAL_LENGTH_LINES:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            entity_b = self.entity_repository.get(constraint_definition["entityB"]["v"])
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_equal_length_lines(
-                entity_a, entity_b, workplane
-            )
-        elif constraint_type == ConstraintType.AT_MIDPOINT:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            line = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_at_midpoint(point_a, line, workplane)
-        elif constraint_type == ConstraintType.HORIZONTAL:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            workplane = self.entity_repository.get(
-                constraint_definition["workplane"]["v"]
-            )
-            self.constraint_repository.add_horizontal(entity_a, workplane)
-        elif constraint_type == ConstraintType.VERTICAL:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            workplane = self.entity_repository.get(
-                constraint_definition["workplane"]["v"]
-            )
-            self.constraint_repository.add_vertical(entity_a, workplane)
-        elif constraint_type == ConstraintType.DIAMETER:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            value = (
-                float(constraint_definition["valA"])
-                if constraint_definition.get("valA")
-                else 0.0
-            )
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_diameter(entity_a, value, workplane)
-        elif constraint_type == ConstraintType.ANGLE:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            entity_b = self.entity_repository.get(constraint_definition["entityB"]["v"])
-            value = (
-                float(constraint_definition["valA"])
-                if constraint_definition.get("valA")
-                else 0.0
-            )
-            inverse = bool(int(constraint_definition["other"]))
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_angle(
-                entity_a, entity_b, value, workplane, inverse
-            )
-        elif constraint_type == ConstraintType.PARALLEL:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            entity_b = self.entity_repository.get(constraint_definition["entityB"]["v"])
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_parallel(entity_a, entity_b, workplane)
-        elif constraint_type == ConstraintType.PERPENDICULAR:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            entity_b = self.entity_repository.get(constraint_definition["entityB"]["v"])
-            inverse = bool(int(constraint_definition["other"]))
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_perpendicular(
-                entity_a, entity_b, workplane, inverse
-            )
-        elif constraint_type == ConstraintType.EQUAL_RADIUS:
-            entity_a = self.entity_repository.get(constraint_definition["entityA"]["v"])
-            entity_b = self.entity_repository.get(constraint_definition["entityB"]["v"])
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_equal_radius(entity_a, entity_b, workplane)
-        elif constraint_type == ConstraintType.WHERE_DRAGGED:
-            point_a = self.entity_repository.get(constraint_definition["ptA"]["v"])
-            workplane = (
-                self.entity_repository.get(constraint_definition["workplane"]["v"])
-                if constraint_definition.get("workplane", {}).get("v")
-                else Entity.FREE_IN_3D
-            )
-            self.constraint_repository.add_where_dragged(point_a, workplane)
-        else:
-            constraint_name = ConstraintType(constraint_type).name
+    def construct_constraint(self, constraint_definition: ConstraintRecord):
+        spec = CONSTRAINT_SPECS.get(constraint_definition.type)
+        if spec is None or spec.method is None:
+            constraint_name = ConstraintType(constraint_definition.type).name
             raise NotImplementedError(
                 f"Constraint type {constraint_name} is not supported"
             )
+
+        get = partial(_get, self.entity_repository)
+        args: List[Any] = [
+            get(getattr(constraint_definition, field)) for field in spec.handles
+        ]
+        if spec.value:
+            args.append(constraint_definition.val_a)
+        if spec.workplane_required or constraint_definition.workplane:
+            args.append(get(constraint_definition.workplane))
+        else:
+            args.append(Entity.FREE_IN_3D)
+        if spec.inverse:
+            args.append(constraint_definition.other)
+
+        getattr(self.constraint_repository, spec.method)(*args)
@@ -0,0 +1,305 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from python_solvespace import ResultFlag
+
+from slvstopy.extract import PointExtractor
+from slvstopy.plan import ConstructionPlan, Operation
+
+
+class SweepResult(object):
+    __slots__ = ("values", "handles", "coordinates", "results", "durations")
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        handles: Sequence[str],
+        coordinates: np.ndarray,
+        results: np.ndarray,
+        durations: np.ndarray,
+    ):
+        # (steps,) swept constraint values
+        self.values = values
+        # tracked entity ids, in the order of the second axis of coordinates
+        self.handles = tuple(handles)
+        # (steps, points, dims) solved parameters, NaN padded for entities with
+        # fewer than `dims` parameters
+        self.coordinates = coordinates
+        # (steps,) ResultFlag of each solve
+        self.results = results
+        # (steps,) seconds spent building and solving each step
+        self.durations = durations
+
+
+class _SweepJob(object):
+    """Everything needed to solve a run of sweep values, resolved once."""
+
+    __slots__ = ("plan", "target", "handles", "slots", "seeds", "extrapolate")
+
+    def __init__(
+        self,
+        plan: ConstructionPlan,
+        target: Tuple[int, int],
+        handles: Sequence[str],
+        warm_start: bool,
+        extrapolate: bool,
+    ):
+        self.plan = plan
+        # (operation index, argument position) of the swept value
+        self.target = target
+        self.handles = handles
+        self.slots = [plan.entity_slots[entity_id] for entity_id in handles]
+        # (operation index, parameter positions, slot) of every entity whose
+        # initial parameters are seeded from the previous step
+        self.seeds = (
+            [
+                (index, positions, plan.entity_slots[entity_id])
+                for entity_id, (index, positions) in plan.entity_params.items()
+            ]
+            if warm_start or extrapolate
+            else []
+        )
+        self.extrapolate = extrapolate
+
+
+def sweep(
+    plan: ConstructionPlan,
+    constraint_id: str,
+    values: Sequence[float],
+    track: Sequence[str],
+    warm_start: bool = False,
+    extrapolate: bool = False,
+) -> SweepResult:
+    """
+    Solve the model once per value of the dimensional constraint
+    `constraint_id` and collect the solved parameters of the `track` entities.
+
+    With `warm_start`, each step starts from the solution of the previous step
+    instead of the positions saved in the file. `extrapolate` (which implies
+    `warm_start`) linearly extrapolates from the previous two solutions.
+    """
+    swept, job, dims = _prepare(
+        plan, constraint_id, values, track, warm_start, extrapolate
+    )
+
+    coordinates = np.full((len(swept), len(job.slots), dims), np.nan)
+    results = np.empty(len(swept), dtype=np.int32)
+    durations = np.empty(len(swept), dtype=np.float64)
+    _sweep_into(job, swept, coordinates, results, durations)
+
+    return SweepResult(swept, track, coordinates, results, durations)
+
+
+def parallel_sweep(
+    plan: ConstructionPlan,
+    constraint_id: str,
+    values: Sequence[float],
+    track: Sequence[str],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    warm_start: bool = False,
+    extrapolate: bool = False,
+) -> SweepResult:
+    """
+    Same as sweep, with the steps split into chunks and solved by a pool of
+    `workers` processes. The plan is sent to each worker once and results are
+    written straight into shared memory. Warm starts do not carry across
+    chunks.
+    """
+    swept, job, dims = _prepare(
+        plan, constraint_id, values, track, warm_start, extrapolate
+    )
+
+    steps = len(swept)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker evens out steps that take longer to converge
+        chunk_size = max(1, -(-steps // (workers * 4)))
+
+    layout = _layout(steps, len(job.slots), dims)
+    memories = [
+        _allocate(int(np.prod(shape)) * dtype.itemsize) for shape, dtype in layout
+    ]
+    views: List[np.ndarray] = []
+    try:
+        views.extend(_views(layout, memories))
+        # coordinates
+        views[0].fill(np.nan)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker,
+            initargs=(job, layout, [memory.name for memory in memories]),
+        ) as executor:
+            futures = []
+            for start in range(0, steps, chunk_size):
+                stop = min(start + chunk_size, steps)
+                futures.append(executor.submit(_sweep_chunk, start, swept[start:stop]))
+
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+
+        # Copy out so the result does not outlive the shared memory
+        coordinates, results, durations = (view.copy() for view in views)
+    finally:
+        # Views must be released before the memory can be closed
+        views.clear()
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+
+    return SweepResult(swept, track, coordinates, results, durations)
+
+
+def _prepare(
+    plan: ConstructionPlan,
+    constraint_id: str,
+    values: Sequence[float],
+    track: Sequence[str],
+    warm_start: bool,
+    extrapolate: bool,
+) -> Tuple[np.ndarray, _SweepJob, int]:
+    swept = np.ascontiguousarray(values, dtype=np.float64)
+    if swept.ndim != 1:
+        raise ValueError("Sweep values must be one dimensional")
+
+    try:
+        target = plan.constraint_values[constraint_id]
+    except KeyError:
+        raise KeyError(
+            f"Constraint {constraint_id} does not have a value to sweep"
+        ) from None
+
+    for entity_id in track:
+        if entity_id not in plan.entity_slots:
+            raise KeyError(f"Entity {entity_id} is not in the model")
+
+    dims = max(
+        (len(plan.entity_params.get(entity_id, (0, ()))[1]) for entity_id in track),
+        default=0,
+    )
+    return swept, _SweepJob(plan, target, track, warm_start, extrapolate), dims
+
+
+def _sweep_into(
+    job: _SweepJob,
+    values: np.ndarray,
+    coordinates: np.ndarray,
+    results: np.ndarray,
+    durations: np.ndarray,
+) -> None:
+    plan = job.plan
+    index, position = job.target
+
+    # One working copy of the operations, patched in place on every step
+    operations = list(plan.operations)
+    method, slot, args, references = operations[index]
+    patched = list(args)
+
+    extractor: Optional[PointExtractor] = None
+
+    # (value, solved parameters of each seed) of the last two converged steps
+    previous: Optional[Tuple[float, List[Sequence[float]]]] = None
+    before: Optional[Tuple[float, List[Sequence[float]]]] = None
+
+    for step, value in enumerate(values.tolist()):
+        started = time.perf_counter()
+
+        patched[position] = value
+        operations[index] = (method, slot, tuple(patched), references)
+        if previous is not None:
+            _seed(operations, job, value, previous, before)
+
+        system, entities = plan.build(operations)
+        flag = system.solve()
+        durations[step] = time.perf_counter() - started
+        results[step] = flag
+
+        if extractor is None:
+            extractor = PointExtractor(
+                {h: entities[s] for h, s in zip(job.handles, job.slots)}, job.handles,
+            )
+        extractor.extract(system, out=coordinates[step])
+
+        if job.seeds:
+            if flag == ResultFlag.OKAY:
+                before = previous if job.extrapolate else None
+                previous = (
+                    value,
+                    [system.params(entities[seed[2]].params) for seed in job.seeds],
+                )
+            else:
+                # Keep seeding from the last converged step, without a trend
+                before = None
+
+
+def _seed(
+    operations: List[Operation],
+    job: _SweepJob,
+    value: float,
+    previous: Tuple[float, List[Sequence[float]]],
+    before: Optional[Tuple[float, List[Sequence[float]]]],
+) -> None:
+    previous_value, guesses = previous
+
+    if before is not None and before[0] != previous_value:
+        ratio = (value - previous_value) / (previous_value - before[0])
+        guesses = [
+            tuple(a + (a - b) * ratio for a, b in zip(last, first))
+            for last, first in zip(guesses, before[1])
+        ]
+
+    for (index, positions, _), guess in zip(job.seeds, guesses):
+        method, slot, args, references = operations[index]
+        seeded = list(args)
+        for position, parameter in zip(positions, guess):
+            seeded[position] = parameter
+        operations[index] = (method, slot, tuple(seeded), references)
+
+
+def _layout(steps: int, points: int, dims: int) -> List[Tuple[tuple, np.dtype]]:
+    # coordinates, results, durations
+    return [
+        ((steps, points, dims), np.dtype(np.float64)),
+        ((steps,), np.dtype(np.int32)),
+        ((steps,), np.dtype(np.float64)),
+    ]
+
+
+def _views(layout, memories) -> List[np.ndarray]:
+    return [
+        np.ndarray(shape, dtype, memory.buf)
+        for (shape, dtype), memory in zip(layout, memories)
+    ]
+
+
+def _allocate(size: int) -> Any:
+    # Imported here, shared_memory needs Python 3.8 and only parallel sweeps use it
+    from multiprocessing import shared_memory
+
+    # SharedMemory refuses zero sized blocks (ie. an empty sweep)
+    return shared_memory.SharedMemory(create=True, size=max(1, size))
+
+
+# Per worker process state, set once by _initialize_worker
+_worker: Optional[tuple] = None
+
+
+def _initialize_worker(job, layout, names):
+    global _worker
+    from multiprocessing import shared_memory
+
+    memories = [shared_memory.SharedMemory(name=name) for name in names]
+    # Keep the mappings alive for as long as the views
+    _worker = (job, _views(layout, memories), memories)
+
+
+def _sweep_chunk(start: int, values: np.ndarray) -> None:
+    assert _worker is not None, "Worker was not initialized"
+    job, views, _ = _worker
+    stop = start + len(values)
+    _sweep_into(job, values, *(view[start:stop] for view in views))
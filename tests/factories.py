@@ -1,33 +1,111 @@
+from slvstopy.constants import ConstraintType, EntityType
+from slvstopy.records import ConstraintRecord, EntityRecord
+
+WORKPLANE = "00010000"
+ORIGIN = "00010001"
+
+
+def point_record_factory(h, x, y):
+    """A 2D point in WORKPLANE, in group 2."""
+    return EntityRecord(
+        h=h,
+        type=EntityType.POINT_IN_2D,
+        workplane=WORKPLANE,
+        act_point=(x, y, 0.0),
+        group="00000002",
+    )
+
+
+def distance_record_factory(h, pt_a, pt_b, value):
+    return ConstraintRecord(
+        h=h,
+        type=ConstraintType.PT_PT_DISTANCE,
+        workplane=WORKPLANE,
+        val_a=value,
+        pt_a=pt_a,
+        pt_b=pt_b,
+        group="00000002",
+    )
+
+
+def handles(records):
+    return [record.h for record in records]
+
+
 def workplane_definition_factory():
     return [
-        {  # workplane
-            "h": {"v": "99999990"},
-            "type": "10000",
-            "point[0]": {"v": "99999991"},
-            "normal": {"v": "99999992"},
-        },
-        {"h": {"v": "99999991"}, "type": "2000"},  # origin
-        {  # normal
-            "h": {"v": "99999992"},
-            "type": "3000",
-            "point[0]": {"v": "99999991"},
-            "actNormal": {"w": "1.0"},
-        },
+        EntityRecord.from_fields(  # workplane
+            {
+                "h.v": "99999990",
+                "type": "10000",
+                "point[0].v": "99999991",
+                "normal.v": "99999992",
+            }
+        ),
+        EntityRecord.from_fields({"h.v": "99999991", "type": "2000"}),  # origin
+        EntityRecord.from_fields(  # normal
+            {
+                "h.v": "99999992",
+                "type": "3000",
+                "point[0].v": "99999991",
+                "actNormal.w": "1.0",
+            }
+        ),
     ]
 
 
 def point_in_3d_definition_factory(hv="99999990", x="0.0", y="0.0", z="0.0"):
-    return [{"h": {"v": hv}, "type": "2000", "actPoint": {"x": x, "y": y, "z": z}}]
+    return [
+        EntityRecord.from_fields(
+            {
+                "h.v": hv,
+                "type": "2000",
+                "actPoint.x": x,
+                "actPoint.y": y,
+                "actPoint.z": z,
+            }
+        )
+    ]
 
 
 def point_in_2d_definition_factory(
     hv="99999990", x="0.0", y="0.0", workplane="99999990"
 ):
     return [
-        {
-            "h": {"v": hv},
-            "type": "2001",
-            "actPoint": {"x": x, "y": y},
-            "workplane": {"v": workplane},
-        }
+        EntityRecord.from_fields(
+            {
+                "h.v": hv,
+                "type": "2001",
+                "actPoint.x": x,
+                "actPoint.y": y,
+                "workplane.v": workplane,
+            }
+        )
     ]
+
+
+def line_chain_definition_factory(count, workplane="99999990"):
+    """Lines listed before their end points, each sharing the workplane."""
+    entities = []
+    for index in range(count):
+        line = f"{index + 1:04x}0000"
+        start = f"{index + 1:04x}0001"
+        end = f"{index + 1:04x}0002"
+        entities.append(
+            EntityRecord.from_fields(
+                {
+                    "h.v": line,
+                    "type": "11000",
+                    "point[0].v": start,
+                    "point[1].v": end,
+                    "workplane.v": workplane,
+                }
+            )
+        )
+        entities += point_in_2d_definition_factory(
+            hv=start, x=str(index), workplane=workplane
+        )
+        entities += point_in_2d_definition_factory(
+            hv=end, x=str(index + 1), y="1.0", workplane=workplane
+        )
+    return entities + workplane_definition_factory()
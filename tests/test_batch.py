@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from python_solvespace import ResultFlag, SolverSystem
+from slvstopy import Slvstopy
+from slvstopy.batch import BatchSolver
+from slvstopy.plan import ConstructionPlan
+
+FILE_PATH = "tests/files/crank_rocker.slvs"
+
+
+@pytest.mark.parametrize(
+    "file_path", ["tests/files/crank_rocker.slvs", "tests/files/involute.slvs"]
+)
+def test_batch_matches_solver_system(file_path):
+    system_factory = Slvstopy(file_path=file_path)
+    result = system_factory.batch_solver().solve()
+    system, entities = system_factory.generate_system()
+
+    assert system.solve() == result.results[0]
+    for row, entity_id in enumerate(result.handles):
+        params = system.params(entities[entity_id].params)
+        np.testing.assert_allclose(
+            result.coordinates[0, row, : len(params)], params, atol=1e-6
+        )
+
+
+class TestBatchSolver:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path=FILE_PATH)
+        self.solver = self.system_factory.batch_solver()
+
+    def test_batch_matches_sweep(self):
+        values = np.linspace(0.0, 350.0, 36)
+        track = ["00060000", "00070000"]
+
+        expected = self.system_factory.sweep("0000000d", values, track=track)
+        result = self.solver.solve({"0000000d": values}, track=track)
+
+        assert result.handles == ("00060000", "00070000")
+        assert result.coordinates.shape == (36, 2, 2)
+        np.testing.assert_array_equal(result.results, expected.results)
+        np.testing.assert_allclose(result.coordinates, expected.coordinates, atol=1e-6)
+
+    def test_batch_reports_collinear_steps_inconsistent(self):
+        # The crank and coupler are collinear at 0 and 180 degrees
+        result = self.solver.solve({"0000000d": [0.0, 90.0, 180.0]})
+
+        assert result.results.tolist() == [
+            ResultFlag.INCONSISTENT,
+            ResultFlag.OKAY,
+            ResultFlag.INCONSISTENT,
+        ]
+
+    def test_batch_broadcasts_overrides(self):
+        values = [45.0, 60.0, 75.0]
+        result = self.solver.solve(
+            {"0000000d": values, "00000005": 40.0}, track=["00070000"]
+        )
+
+        assert result.coordinates.shape == (3, 1, 2)
+        for step, value in enumerate(values):
+            system, entities = self.system_factory.generate_system(
+                overrides={"0000000d": value, "00000005": 40.0}
+            )
+            assert system.solve() == result.results[step] == ResultFlag.OKAY
+            np.testing.assert_allclose(
+                result.coordinates[step, 0],
+                system.params(entities["00070000"].params),
+                atol=1e-6,
+            )
+
+    def test_batch_chunks(self):
+        values = np.linspace(30.0, 90.0, 7)
+
+        expected = self.solver.solve({"0000000d": values})
+        result = self.solver.solve({"0000000d": values}, chunk_size=3)
+
+        np.testing.assert_array_equal(result.results, expected.results)
+        np.testing.assert_array_equal(result.iterations, expected.iterations)
+        np.testing.assert_allclose(result.coordinates, expected.coordinates)
+
+    def test_batch_pads_missing_parameters(self):
+        result = self.solver.solve(track=["00060000", "00010020"])
+
+        assert result.coordinates.shape == (1, 2, 4)
+        assert np.isnan(result.coordinates[0, 0, 2:]).all()
+        assert not np.isnan(result.coordinates[0, 1]).any()
+
+    def test_batch_unknown_constraint_raises(self):
+        with pytest.raises(KeyError):
+            self.solver.solve({"00000008": [1.0]})
+
+    def test_batch_unknown_entity_raises(self):
+        with pytest.raises(KeyError):
+            self.solver.solve(track=["00090000"])
+
+    def test_batch_rejects_2d_overrides(self):
+        with pytest.raises(ValueError):
+            self.solver.solve({"0000000d": [[30.0, 60.0]]})
+
+    def test_batch_unsupported_constraint_raises(self):
+        plan = self.system_factory.compile()
+        operations = list(plan.operations)
+        operations.append((SolverSystem.diameter, None, (10.0,), ()))
+        unsupported = ConstructionPlan(
+            operations,
+            plan.slot_count,
+            plan.entity_slots,
+            plan.constraint_values,
+            plan.entity_params,
+        )
+
+        with pytest.raises(NotImplementedError):
+            BatchSolver(unsupported)
@@ -0,0 +1,209 @@
+import os
+import shutil
+import pytest
+
+from python_solvespace import ResultFlag
+from slvstopy import ModelCache, Slvstopy, SolveCache
+from slvstopy import cache as cache_module
+
+SAMPLE_FILE = "tests/files/crank_rocker.slvs"
+
+
+class TestModelCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.directory = str(tmp_path / "cache")
+        self.cache = ModelCache(self.directory)
+        self.calls = 0
+
+    def parse(self):
+        self.calls += 1
+        factory = Slvstopy(file_path=SAMPLE_FILE)
+        return factory.entity_definition, factory.constraint_definition
+
+    def entries(self):
+        return [
+            name
+            for name in os.listdir(self.directory)
+            if name.endswith(cache_module.CACHE_SUFFIX)
+        ]
+
+    def test_load_parses_once(self):
+        first = self.cache.load(SAMPLE_FILE, self.parse)
+        second = self.cache.load(SAMPLE_FILE, self.parse)
+
+        assert self.calls == 1
+        assert first == second
+        assert len(self.entries()) == 1
+
+    def test_shared_directory(self):
+        self.cache.load(SAMPLE_FILE, self.parse)
+        ModelCache(self.directory).load(SAMPLE_FILE, self.parse)
+
+        assert self.calls == 1
+
+    def test_content_change_misses(self, tmp_path):
+        copy = str(tmp_path / "copy.slvs")
+        shutil.copyfile(SAMPLE_FILE, copy)
+        self.cache.load(copy, self.parse)
+
+        with open(copy, "a") as f:
+            f.write("\n")
+        self.cache.load(copy, self.parse)
+
+        assert self.calls == 2
+        assert len(self.entries()) == 2
+
+    def test_version_change_misses(self, monkeypatch):
+        self.cache.load(SAMPLE_FILE, self.parse)
+        monkeypatch.setattr(cache_module, "PACKAGE_VERSION", "999")
+        self.cache.load(SAMPLE_FILE, self.parse)
+
+        assert self.calls == 2
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"\x80\x05truncated",  # UnpicklingError
+            b"\x80\x09",  # ValueError, unsupported protocol
+            b"(I1\nN\x85R.",  # TypeError, calls an int
+            b"Kx",  # EOFError
+        ],
+    )
+    def test_corrupt_entry_is_replaced(self, content):
+        self.cache.load(SAMPLE_FILE, self.parse)
+        entry = os.path.join(self.directory, self.entries()[0])
+        with open(entry, "wb") as f:
+            f.write(content)
+
+        model = self.cache.load(SAMPLE_FILE, self.parse)
+
+        assert self.calls == 2
+        # Rewritten, the next load is a hit
+        self.cache.load(SAMPLE_FILE, self.parse)
+        assert self.calls == 2
+        assert model == self.parse()
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        paths = []
+        for index in range(3):
+            path = str(tmp_path / f"{index}.slvs")
+            shutil.copyfile(SAMPLE_FILE, path)
+            with open(path, "a") as f:
+                f.write("\n" * index)
+            paths.append(path)
+
+        self.cache.load(paths[0], self.parse)
+        size = os.path.getsize(os.path.join(self.directory, self.entries()[0]))
+        self.cache.max_bytes = size * 2
+
+        self.cache.load(paths[1], self.parse)
+        for name in self.entries():
+            os.utime(os.path.join(self.directory, name), (0, 0))
+        self.cache.load(paths[0], self.parse)  # hit, marks as recently used
+        self.cache.load(paths[2], self.parse)
+
+        assert len(self.entries()) == 2
+        self.calls = 0
+        self.cache.load(paths[0], self.parse)
+        assert self.calls == 0
+        self.cache.load(paths[1], self.parse)
+        assert self.calls == 1
+
+    def test_clear(self):
+        self.cache.load(SAMPLE_FILE, self.parse)
+        self.cache.clear()
+
+        assert self.entries() == []
+
+    def test_slvstopy_uses_cache(self):
+        expected = Slvstopy(file_path=SAMPLE_FILE)
+
+        for _ in range(2):
+            system_factory = Slvstopy(file_path=SAMPLE_FILE, cache=self.cache)
+            assert system_factory.entity_definition == expected.entity_definition
+            assert (
+                system_factory.constraint_definition == expected.constraint_definition
+            )
+        assert len(self.entries()) == 1
+
+
+class TestSolveCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path=SAMPLE_FILE)
+        self.cache = SolveCache()
+
+    def test_solve_matches_generate_system(self):
+        result = self.system_factory.solve(overrides={"0000000d": 60.0})
+        system, entities = self.system_factory.generate_system(
+            overrides={"0000000d": 60.0}
+        )
+
+        assert result.result == system.solve() == ResultFlag.OKAY
+        for entity_id in result.rows:
+            assert tuple(result[entity_id]) == pytest.approx(
+                system.params(entities[entity_id].params)
+            )
+
+    def test_repeats_are_served_from_cache(self):
+        first = self.system_factory.solve(overrides={"0000000d": 60}, cache=self.cache)
+        second = self.system_factory.solve(
+            overrides={"0000000d": 60.0}, cache=self.cache
+        )
+        other = self.system_factory.solve(overrides={"0000000d": 45}, cache=self.cache)
+
+        assert first is second
+        assert other is not first
+        assert (self.cache.hits, self.cache.misses) == (1, 2)
+        assert len(self.cache) == 2
+
+    def test_key_includes_model(self):
+        self.system_factory.solve(cache=self.cache)
+        Slvstopy(file_path="tests/files/involute.slvs").solve(cache=self.cache)
+
+        assert self.cache.misses == 2
+
+    def test_model_hash_is_stable(self):
+        assert (
+            self.system_factory.model_hash()
+            == Slvstopy(file_path=SAMPLE_FILE).model_hash()
+        )
+
+    def test_results_are_read_only(self):
+        result = self.system_factory.solve(cache=self.cache)
+
+        with pytest.raises(ValueError):
+            result.coordinates[0, 0] = 1.0
+        with pytest.raises(ValueError):
+            result["00070000"][0] = 1.0
+        with pytest.raises(TypeError):
+            result.rows["00070000"] = (0, 2)
+
+    def test_results_cannot_be_made_writeable(self):
+        result = self.system_factory.solve(cache=self.cache)
+
+        with pytest.raises(ValueError):
+            result.coordinates.setflags(write=True)
+        with pytest.raises(ValueError):
+            result["00070000"].setflags(write=True)
+
+        assert self.system_factory.solve(cache=self.cache)["00070000"] == (
+            pytest.approx(result["00070000"])
+        )
+
+    def test_evicts_least_recently_used(self):
+        first = self.system_factory.solve(overrides={"0000000d": 30}, cache=self.cache)
+        self.cache.max_bytes = first.nbytes * 2
+
+        self.system_factory.solve(overrides={"0000000d": 45}, cache=self.cache)
+        self.system_factory.solve(overrides={"0000000d": 30}, cache=self.cache)
+        self.system_factory.solve(overrides={"0000000d": 60}, cache=self.cache)
+
+        assert len(self.cache) == 2
+        assert self.cache.evictions == 1
+        assert self.cache.bytes == first.nbytes * 2
+        assert (
+            self.system_factory.solve(overrides={"0000000d": 30}, cache=self.cache)
+            is first
+        )
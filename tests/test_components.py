@@ -0,0 +1,312 @@
+import math
+import pytest
+
+from python_solvespace import ResultFlag
+from slvstopy import Slvstopy
+from slvstopy.components import (
+    find_components,
+    query_component,
+    shared_entities,
+    solve_components,
+)
+from slvstopy.constants import ConstraintType, EntityType
+from slvstopy.plan import compile_plan
+from slvstopy.records import ConstraintRecord, EntityRecord
+
+from factories import (
+    ORIGIN,
+    WORKPLANE,
+    distance_record_factory as distance,
+    handles,
+    point_record_factory as point,
+)
+
+
+def two_linkage_model():
+    """
+    Two pairs of points a set distance apart, the first pinned to the origin,
+    and one unconstrained point.
+    """
+    entities = [
+        EntityRecord(
+            h=WORKPLANE,
+            type=EntityType.WORKPLANE,
+            point=(ORIGIN,),
+            normal="00010020",
+            group="00000001",
+        ),
+        EntityRecord(h=ORIGIN, type=EntityType.POINT_IN_3D, group="00000001"),
+        EntityRecord(
+            h="00010020",
+            type=EntityType.NORMAL_IN_3D,
+            point=(ORIGIN,),
+            act_normal=(1.0, 0.0, 0.0, 0.0),
+            group="00000001",
+        ),
+        point("00020000", 1.0, 0.0),
+        point("00030000", 1.0, 1.0),
+        point("00040000", 5.0, 0.0),
+        point("00050000", 5.0, 1.0),
+        point("00060000", 9.0, 9.0),
+    ]
+    constraints = [
+        ConstraintRecord(
+            h="00000001",
+            type=ConstraintType.POINTS_COINCIDENT,
+            workplane=WORKPLANE,
+            pt_a=ORIGIN,
+            pt_b="00020000",
+            group="00000002",
+        ),
+        distance("00000002", "00040000", "00050000", 3.0),
+        distance("00000003", "00020000", "00030000", 2.0),
+    ]
+    return entities, constraints
+
+
+def free_workplane_model():
+    """
+    Two points held where dragged in a workplane of group 2, whose origin is
+    coincident with the reference origin and whose normal is the reference
+    normal.
+    """
+    entities, _ = two_linkage_model()
+    entities = entities[:3] + [
+        EntityRecord(
+            h="00020000",
+            type=EntityType.WORKPLANE,
+            point=("00020001",),
+            normal="00010020",
+            group="00000002",
+        ),
+        EntityRecord(
+            h="00020001",
+            type=EntityType.POINT_IN_3D,
+            act_point=(0.0, 0.0, 5.0),
+            group="00000002",
+        ),
+    ]
+    for h, x, y in [("00030000", 1.0, 0.0), ("00040000", 5.0, 0.0)]:
+        record = point(h, x, y)
+        record.workplane = "00020000"
+        entities.append(record)
+
+    constraints = [
+        ConstraintRecord(
+            h="00000001",
+            type=ConstraintType.POINTS_COINCIDENT,
+            pt_a=ORIGIN,
+            pt_b="00020001",
+            group="00000002",
+        ),
+        ConstraintRecord(
+            h="00000002",
+            type=ConstraintType.WHERE_DRAGGED,
+            workplane="00020000",
+            pt_a="00030000",
+            group="00000002",
+        ),
+        ConstraintRecord(
+            h="00000003",
+            type=ConstraintType.WHERE_DRAGGED,
+            workplane="00020000",
+            pt_a="00040000",
+            group="00000002",
+        ),
+    ]
+    return entities, constraints
+
+
+class TestFindComponents:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.entities, self.constraints = two_linkage_model()
+        self.components = find_components(self.entities, self.constraints)
+
+    def test_shared_entities(self):
+        assert shared_entities(self.entities, self.constraints) == {
+            WORKPLANE,
+            ORIGIN,
+            "00010020",
+        }
+
+    def test_components(self):
+        assert [component.size for component in self.components] == [
+            (2, 2),
+            (2, 1),
+            (1, 0),
+        ]
+        assert handles(self.components[0].entity_definition) == [
+            WORKPLANE,
+            ORIGIN,
+            "00010020",
+            "00020000",
+            "00030000",
+        ]
+        assert handles(self.components[0].constraint_definition) == [
+            "00000001",
+            "00000003",
+        ]
+        assert handles(self.components[1].constraint_definition) == ["00000002"]
+        assert self.components[2].constraint_definition == []
+
+    def test_shared_only_constraints_are_in_every_component(self):
+        self.constraints.append(
+            ConstraintRecord(
+                h="00000004",
+                type=ConstraintType.WHERE_DRAGGED,
+                workplane=WORKPLANE,
+                pt_a=ORIGIN,
+            )
+        )
+
+        components = find_components(self.entities, self.constraints)
+
+        assert [component.size for component in components] == [
+            (2, 2),
+            (2, 1),
+            (1, 0),
+        ]
+        for component in components:
+            assert component.constraint_definition[-1].h == "00000004"
+
+
+class TestFreeWorkplane:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.entities, self.constraints = free_workplane_model()
+
+    def test_free_workplane_is_not_shared(self):
+        assert shared_entities(self.entities, self.constraints) == {
+            WORKPLANE,
+            ORIGIN,
+            "00010020",
+        }
+
+    def test_free_workplane_connects_components(self):
+        components = find_components(self.entities, self.constraints)
+
+        assert [component.size for component in components] == [(4, 3)]
+
+    def test_solution_matches_single_system(self):
+        solution = solve_components(find_components(self.entities, self.constraints))
+        system, entities = compile_plan(self.entities, self.constraints).replay()
+
+        assert solution.result == system.solve() == ResultFlag.OKAY
+        assert solution.coordinates["00020001"] == pytest.approx((0.0, 0.0, 0.0))
+        for entity_id, entity in entities.items():
+            if entity_id in solution.coordinates:
+                assert solution.coordinates[entity_id] == pytest.approx(
+                    tuple(system.params(entity.params))
+                )
+
+
+class TestQueryComponent:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.components = find_components(*two_linkage_model())
+
+    def test_owner(self):
+        assert query_component(self.components, ["00050000"]) is self.components[1]
+
+    def test_shared_target(self):
+        assert query_component(self.components, [ORIGIN]) is self.components[0]
+
+    def test_merges_components(self):
+        component = query_component(self.components, ["00030000", "00050000"])
+
+        assert component.size == (4, 3)
+        assert handles(component.entity_definition) == [
+            WORKPLANE,
+            ORIGIN,
+            "00010020",
+            "00020000",
+            "00030000",
+            "00040000",
+            "00050000",
+        ]
+        assert handles(component.constraint_definition) == [
+            "00000001",
+            "00000003",
+            "00000002",
+        ]
+
+    def test_unknown_target(self):
+        with pytest.raises(KeyError):
+            query_component(self.components, ["00ff0000"])
+
+
+class TestSolveComponents:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.components = find_components(*two_linkage_model())
+
+    def length(self, coordinates, a, b):
+        (ax, ay), (bx, by) = coordinates[a], coordinates[b]
+        return math.hypot(bx - ax, by - ay)
+
+    def test_solve(self):
+        solution = solve_components(self.components)
+
+        assert solution.result == ResultFlag.OKAY
+        assert solution.count == 3
+        assert solution.sizes == ((2, 2), (2, 1), (1, 0))
+        assert solution.coordinates["00020000"] == pytest.approx((0.0, 0.0))
+        assert self.length(
+            solution.coordinates, "00020000", "00030000"
+        ) == pytest.approx(2.0)
+        assert self.length(
+            solution.coordinates, "00040000", "00050000"
+        ) == pytest.approx(3.0)
+        assert solution.coordinates["00060000"] == pytest.approx((9.0, 9.0))
+        assert ORIGIN in solution.coordinates
+
+    def test_overrides(self):
+        solution = solve_components(self.components, {"00000002": 4.0})
+
+        assert self.length(
+            solution.coordinates, "00040000", "00050000"
+        ) == pytest.approx(4.0)
+
+    def test_unknown_override(self):
+        with pytest.raises(KeyError):
+            solve_components(self.components, {"000000ff": 4.0})
+
+    def test_workers(self):
+        serial = solve_components(self.components)
+        parallel = solve_components(self.components, workers=2)
+
+        assert parallel.results == serial.results
+        for entity_id, values in serial.coordinates.items():
+            assert parallel.coordinates[entity_id] == pytest.approx(values)
+
+
+class TestSlvstopyComponents:
+    def test_matches_single_system(self):
+        system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+        solution = system_factory.solve_components({"0000000d": 60.0})
+        expected = system_factory.solve({"0000000d": 60.0})
+
+        assert len(system_factory.components()) == 1
+        assert solution.result == expected.result
+        for entity_id in expected.rows:
+            assert solution.coordinates[entity_id] == pytest.approx(
+                tuple(expected[entity_id])
+            )
+
+    def test_solve_for(self):
+        system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+        solution = system_factory.solve_for(["00070000"], {"0000000d": 60.0})
+        expected = system_factory.solve({"0000000d": 60.0})
+
+        assert solution.result == expected.result
+        assert list(solution.rows) == ["00070000"]
+        assert solution["00070000"] == pytest.approx(expected["00070000"])
+
+    def test_solve_for_unknown_override(self):
+        system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+        with pytest.raises(KeyError):
+            system_factory.solve_for(["00070000"], {"000000ff": 60.0})
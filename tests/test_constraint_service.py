@@ -4,7 +4,9 @@ import math
 from pymatrix import dot, cross, matrix as pymatrix
 from python_solvespace import SolverSystem, ResultFlag, quaternion_n
 from slvstopy.repositories import ConstraintRepository, EntityRepository
-from slvstopy.services import ConstraintService
+from slvstopy.records import ConstraintRecord
+from slvstopy.constants import ConstraintType
+from slvstopy.services import CONSTRAINT_SPECS, ConstraintService
 
 from utils import matrix, compute_distance
 
@@ -33,12 +35,14 @@ class TestConstraintService:
             "00000002", 1.0, 1.0, workplane
         )
 
-        constraint_definition = {
-            "type": "20",
-            "ptA": {"v": "00000001"},
-            "ptB": {"v": "00000002"},
-            "workplane": {"v": "00000000"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "20",
+                "ptA.v": "00000001",
+                "ptB.v": "00000002",
+                "workplane.v": "00000000",
+            }
+        )
 
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
@@ -50,11 +54,9 @@ class TestConstraintService:
         point_a = self.entity_repository.create_point_in_3d("00000001", 0.0, 0.0, 0.0)
         point_b = self.entity_repository.create_point_in_3d("00000002", 1.0, 1.0, 1.0)
 
-        constraint_definition = {
-            "type": "20",
-            "ptA": {"v": "00000001"},
-            "ptB": {"v": "00000002"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "20", "ptA.v": "00000001", "ptB.v": "00000002"}
+        )
 
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
@@ -75,13 +77,15 @@ class TestConstraintService:
             "00000002", 1.0, 1.0, workplane
         )
 
-        constraint_definition = {
-            "type": "30",
-            "ptA": {"v": "00000001"},
-            "ptB": {"v": "00000002"},
-            "valA": "1",
-            "workplane": {"v": "00000000"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "30",
+                "ptA.v": "00000001",
+                "ptB.v": "00000002",
+                "valA": "1",
+                "workplane.v": "00000000",
+            }
+        )
 
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
@@ -99,12 +103,9 @@ class TestConstraintService:
         point_a = self.entity_repository.create_point_in_3d("00000001", 0.0, 0.0, 0.0)
         point_b = self.entity_repository.create_point_in_3d("00000002", 1.0, 1.0, 1.0)
 
-        constraint_definition = {
-            "type": "30",
-            "ptA": {"v": "00000001"},
-            "ptB": {"v": "00000002"},
-            "valA": "1",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "30", "ptA.v": "00000001", "ptB.v": "00000002", "valA": "1"}
+        )
 
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
@@ -126,12 +127,9 @@ class TestConstraintService:
         self.entity_repository.create_workplane("00000002", origin, normal)
         point = self.entity_repository.create_point_in_3d("00000003", 1.0, 1.0, 1.0)
 
-        constraint_definition = {
-            "type": "31",
-            "ptA": {"v": "00000003"},
-            "entityA": {"v": "00000002"},
-            "valA": "1",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "31", "ptA.v": "00000003", "entityA.v": "00000002", "valA": "1"}
+        )
 
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
@@ -166,13 +164,15 @@ class TestConstraintService:
         )
         point = self.entity_repository.create_point_in_2d("99999996", -1, 1, workplane)
 
-        constraint_definition = {
-            "type": "32",
-            "ptA": {"v": "99999996"},
-            "entityA": {"v": "99999995"},
-            "valA": "1",
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "32",
+                "ptA.v": "99999996",
+                "entityA.v": "99999995",
+                "valA": "1",
+                "workplane.v": "99999992",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
 
@@ -195,12 +195,9 @@ class TestConstraintService:
         self.entity_repository.create_workplane("99999992", origin, normal)
         point = self.entity_repository.create_point_in_3d("99999993", 1.0, 1.0, 1.0)
 
-        constraint_definition = {
-            "type": "32",
-            "ptA": {"v": "99999993"},
-            "entityA": {"v": "99999992"},
-            "valA": "1",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "32", "ptA.v": "99999993", "entityA.v": "99999992", "valA": "1"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
 
@@ -236,12 +233,14 @@ class TestConstraintService:
             "99999996", -1.0, -2.0, workplane
         )
 
-        constraint_definition = {
-            "type": "42",
-            "ptA": {"v": "99999996"},
-            "entityA": {"v": "99999995"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "42",
+                "ptA.v": "99999996",
+                "entityA.v": "99999995",
+                "workplane.v": "99999992",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         result = self.system.solve()
@@ -265,11 +264,9 @@ class TestConstraintService:
         self.entity_repository.create_line_segment("99999992", point_a, point_b)
         point = self.entity_repository.create_point_in_3d("99999993", -1.0, -2.0, -3.0)
 
-        constraint_definition = {
-            "type": "42",
-            "ptA": {"v": "99999993"},
-            "entityA": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "42", "ptA.v": "99999993", "entityA.v": "99999992"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -310,12 +307,14 @@ class TestConstraintService:
             "99999997", center, point_b, workplane
         )
 
-        constraint_definition = {
-            "type": "50",
-            "entityA": {"v": "99999996"},
-            "entityB": {"v": "99999997"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "50",
+                "entityA.v": "99999996",
+                "entityB.v": "99999997",
+                "workplane.v": "99999992",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(origin)
         result = self.system.solve()
@@ -338,11 +337,9 @@ class TestConstraintService:
         self.entity_repository.create_line_segment("99999993", origin, point_a)
         self.entity_repository.create_line_segment("99999994", origin, point_b)
 
-        constraint_definition = {
-            "type": "50",
-            "entityA": {"v": "99999993"},
-            "entityB": {"v": "99999994"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "50", "entityA.v": "99999993", "entityB.v": "99999994"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(origin)
         result = self.system.solve()
@@ -377,12 +374,14 @@ class TestConstraintService:
             "99999996", 5.0, 5.0, workplane
         )
 
-        constraint_definition = {
-            "type": "70",
-            "ptA": {"v": "99999996"},
-            "entityA": {"v": "99999995"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "70",
+                "ptA.v": "99999996",
+                "entityA.v": "99999995",
+                "workplane.v": "99999992",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
 
@@ -404,11 +403,9 @@ class TestConstraintService:
         self.entity_repository.create_line_segment("99999992", point_a, point_b)
         point = self.entity_repository.create_point_in_3d("99999993", 5.0, 5.0, 5.0)
 
-        constraint_definition = {
-            "type": "70",
-            "ptA": {"v": "99999993"},
-            "entityA": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "70", "ptA.v": "99999993", "entityA.v": "99999992"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
 
@@ -438,11 +435,9 @@ class TestConstraintService:
             "99999995", point_a, point_b, workplane
         )
 
-        constraint_definition = {
-            "type": "80",
-            "entityA": {"v": "99999995"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "80", "entityA.v": "99999995", "workplane.v": "99999992"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a, workplane)
         result = self.system.solve()
@@ -469,11 +464,9 @@ class TestConstraintService:
             "99999995", point_a, point_b, workplane
         )
 
-        constraint_definition = {
-            "type": "81",
-            "entityA": {"v": "99999995"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "81", "entityA.v": "99999995", "workplane.v": "99999992"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a, workplane)
         result = self.system.solve()
@@ -498,12 +491,14 @@ class TestConstraintService:
             "99999995", normal, centre, radius, workplane
         )
 
-        constraint_definition = {
-            "type": "90",
-            "entityA": {"v": "99999995"},
-            "valA": "50",
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "90",
+                "entityA.v": "99999995",
+                "valA": "50",
+                "workplane.v": "99999992",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
 
@@ -534,14 +529,16 @@ class TestConstraintService:
             "99999997", point_a, point_c, workplane
         )
 
-        constraint_definition = {
-            "type": "120",
-            "entityA": {"v": "99999996"},
-            "entityB": {"v": "99999997"},
-            "valA": "45",
-            "workplane": {"v": "99999992"},
-            "other": "0",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "120",
+                "entityA.v": "99999996",
+                "entityB.v": "99999997",
+                "valA": "45",
+                "workplane.v": "99999992",
+                "other": "0",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a, workplane)
         self.constraint_repository.add_horizontal(line_b, workplane)
@@ -576,14 +573,16 @@ class TestConstraintService:
             "99999997", point_a, point_c, workplane
         )
 
-        constraint_definition = {
-            "type": "120",
-            "entityA": {"v": "99999996"},
-            "entityB": {"v": "99999997"},
-            "valA": "45",
-            "workplane": {"v": "99999992"},
-            "other": "1",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "120",
+                "entityA.v": "99999996",
+                "entityB.v": "99999997",
+                "valA": "45",
+                "workplane.v": "99999992",
+                "other": "1",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a, workplane)
         self.constraint_repository.add_horizontal(line_b, workplane)
@@ -604,13 +603,15 @@ class TestConstraintService:
         self.entity_repository.create_line_segment("99999994", point_a, point_b)
         self.entity_repository.create_line_segment("99999995", point_c, point_d)
 
-        constraint_definition = {
-            "type": "120",
-            "entityA": {"v": "99999994"},
-            "entityB": {"v": "99999995"},
-            "valA": "90",
-            "other": "0",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "120",
+                "entityA.v": "99999994",
+                "entityB.v": "99999995",
+                "valA": "90",
+                "other": "0",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -638,13 +639,15 @@ class TestConstraintService:
         self.entity_repository.create_line_segment("99999994", point_a, point_b)
         self.entity_repository.create_line_segment("99999995", point_c, point_d)
 
-        constraint_definition = {
-            "type": "120",
-            "entityA": {"v": "99999994"},
-            "entityB": {"v": "99999995"},
-            "valA": "90",
-            "other": "1",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "120",
+                "entityA.v": "99999994",
+                "entityB.v": "99999995",
+                "valA": "90",
+                "other": "1",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -689,12 +692,14 @@ class TestConstraintService:
             "99999998", point_c, point_d, workplane
         )
 
-        constraint_definition = {
-            "type": "121",
-            "entityA": {"v": "99999997"},
-            "entityB": {"v": "99999998"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "121",
+                "entityA.v": "99999997",
+                "entityB.v": "99999998",
+                "workplane.v": "99999992",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -737,13 +742,15 @@ class TestConstraintService:
             "99999998", point_c, point_d, workplane
         )
 
-        constraint_definition = {
-            "type": "122",
-            "entityA": {"v": "99999997"},
-            "entityB": {"v": "99999998"},
-            "workplane": {"v": "99999992"},
-            "other": "0",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "122",
+                "entityA.v": "99999997",
+                "entityB.v": "99999998",
+                "workplane.v": "99999992",
+                "other": "0",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -788,13 +795,15 @@ class TestConstraintService:
             "99999998", point_c, point_d, workplane
         )
 
-        constraint_definition = {
-            "type": "122",
-            "entityA": {"v": "99999997"},
-            "entityB": {"v": "99999998"},
-            "workplane": {"v": "99999992"},
-            "other": "1",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "122",
+                "entityA.v": "99999997",
+                "entityB.v": "99999998",
+                "workplane.v": "99999992",
+                "other": "1",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -822,12 +831,14 @@ class TestConstraintService:
         self.entity_repository.create_line_segment("99999994", point_a, point_b)
         self.entity_repository.create_line_segment("99999995", point_c, point_d)
 
-        constraint_definition = {
-            "type": "122",
-            "entityA": {"v": "99999994"},
-            "entityB": {"v": "99999995"},
-            "other": "0",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "122",
+                "entityA.v": "99999994",
+                "entityB.v": "99999995",
+                "other": "0",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -855,12 +866,14 @@ class TestConstraintService:
         self.entity_repository.create_line_segment("99999994", point_a, point_b)
         self.entity_repository.create_line_segment("99999995", point_c, point_d)
 
-        constraint_definition = {
-            "type": "122",
-            "entityA": {"v": "99999994"},
-            "entityB": {"v": "99999995"},
-            "other": "1",
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "122",
+                "entityA.v": "99999994",
+                "entityB.v": "99999995",
+                "other": "1",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.constraint_repository.add_where_dragged(point_b)
@@ -898,12 +911,14 @@ class TestConstraintService:
             "99999997", normal, centre, radius_b, workplane
         )
 
-        constraint_definition = {
-            "type": "130",
-            "entityA": {"v": "99999995"},
-            "entityB": {"v": "99999997"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {
+                "type": "130",
+                "entityA.v": "99999995",
+                "entityB.v": "99999997",
+                "workplane.v": "99999992",
+            }
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         result = self.system.solve()
 
@@ -926,11 +941,9 @@ class TestConstraintService:
             "99999994", 1.0, 1.0, workplane
         )
 
-        constraint_definition = {
-            "type": "200",
-            "ptA": {"v": "99999994"},
-            "workplane": {"v": "99999992"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "200", "ptA.v": "99999994", "workplane.v": "99999992"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a, workplane)
         self.system.set_params(point_b.params, (1.0, 0.0))
@@ -946,10 +959,9 @@ class TestConstraintService:
         point_a = self.entity_repository.create_point_in_3d("99999990", 0.0, 0.0, 0.0)
         point_b = self.entity_repository.create_point_in_3d("99999991", 1.0, 1.0, 1.0)
 
-        constraint_definition = {
-            "type": "200",
-            "ptA": {"v": "99999991"},
-        }
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "200", "ptA.v": "99999991"}
+        )
         self.constraint_service.construct_constraint(constraint_definition)
         self.constraint_repository.add_where_dragged(point_a)
         self.system.set_params(point_b.params, (2.0, 2.0, 2.0))
@@ -961,3 +973,47 @@ class TestConstraintService:
         assert point_b[0] == pytest.approx(2)
         assert point_b[1] == pytest.approx(2)
         assert point_b[2] == pytest.approx(2)
+
+    def test_unsupported_constraint_raises(self):
+        constraint_definition = ConstraintRecord.from_fields(
+            {"type": "100", "ptA.v": "99999991", "entityA.v": "99999992"}
+        )
+
+        with pytest.raises(NotImplementedError, match="PT_ON_CIRCLE"):
+            self.constraint_service.construct_constraint(constraint_definition)
+
+
+class TestConstraintSpecs:
+    def test_every_constraint_type_has_a_spec(self):
+        assert set(CONSTRAINT_SPECS) == set(ConstraintType)
+
+    @pytest.mark.parametrize(
+        "constraint_type",
+        [
+            constraint_type
+            for constraint_type, spec in CONSTRAINT_SPECS.items()
+            if spec.method is not None
+        ],
+    )
+    def test_spec_method_exists_on_repository(self, constraint_type):
+        spec = CONSTRAINT_SPECS[constraint_type]
+
+        assert callable(getattr(ConstraintRepository, spec.method))
+
+
+class TestConstraintServiceDefaults:
+    def test_default_repositories_share_a_new_system(self):
+        service = ConstraintService()
+
+        assert service.entity_repository.system is service.constraint_repository.system
+        assert (
+            service.entity_repository.system
+            is not ConstraintService().entity_repository.system
+        )
+
+    def test_default_entity_repository_uses_constraint_system(self):
+        constraint_repository = ConstraintRepository()
+
+        service = ConstraintService(constraint_repository=constraint_repository)
+
+        assert service.entity_repository.system is constraint_repository.system
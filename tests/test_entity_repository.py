@@ -157,3 +157,8 @@ class TestEntityRepository:
         )
         assert entity.is_arc()
         assert self.repository.get(self.entity_id) == entity
+
+
+class TestEntityRepositoryDefaults:
+    def test_each_repository_has_its_own_system(self):
+        assert EntityRepository().system is not EntityRepository().system
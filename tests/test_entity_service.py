@@ -2,13 +2,15 @@ import pytest
 from unittest.mock import Mock
 
 from python_solvespace import SolverSystem
-from slvstopy.repositories import EntityRepository
+from slvstopy.repositories import EntityNotFoundException, EntityRepository
+from slvstopy.records import EntityRecord
 from slvstopy.services import EntityService
 
 from factories import (
     workplane_definition_factory,
     point_in_3d_definition_factory,
     point_in_2d_definition_factory,
+    line_chain_definition_factory,
 )
 
 
@@ -21,11 +23,15 @@ class TestEntityRepository:
         self.entity_id = "00000001"
 
     def test_create_point_in_3d__success(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "2000",
-            "actPoint": {"x": "1.0", "y": "1.0", "z": "1.0"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "2000",
+                "actPoint.x": "1.0",
+                "actPoint.y": "1.0",
+                "actPoint.z": "1.0",
+            }
+        )
         entity_list = [entity_definition]
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -34,11 +40,9 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (1.0, 1.0, 1.0)
 
     def test_create_point_in_3d__partial_point_defaults_to_zero(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "2000",
-            "actPoint": {"x": "1.0"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {"h.v": self.entity_id, "type": "2000", "actPoint.x": "1.0"}
+        )
         entity_list = [entity_definition]
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -47,10 +51,9 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (1.0, 0.0, 0.0)
 
     def test_create_point_in_3d__undefined_point_defaults_to_zero(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "2000",
-        }
+        entity_definition = EntityRecord.from_fields(
+            {"h.v": self.entity_id, "type": "2000"}
+        )
         entity_list = [entity_definition]
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -59,12 +62,15 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (0.0, 0.0, 0.0)
 
     def test_create_point_in_2d__success(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "2001",
-            "workplane": {"v": "99999990"},
-            "actPoint": {"x": "1.0", "y": "1.0"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "2001",
+                "workplane.v": "99999990",
+                "actPoint.x": "1.0",
+                "actPoint.y": "1.0",
+            }
+        )
         entity_list = [entity_definition] + workplane_definition_factory()
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -73,11 +79,9 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (1.0, 1.0)
 
     def test_create_point_in_2d__undefined_point_defaults_to_zero(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "2001",
-            "workplane": {"v": "99999990"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {"h.v": self.entity_id, "type": "2001", "workplane.v": "99999990"}
+        )
         entity_list = [entity_definition] + workplane_definition_factory()
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -86,12 +90,17 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (0.0, 0.0)
 
     def test_create_normal_in_3d__success(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "3000",
-            "point[0]": {"v": "99999990"},
-            "actNormal": {"w": "0.5", "vx": "0.5", "vy": "0.5", "vz": "0.5"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "3000",
+                "point[0].v": "99999990",
+                "actNormal.w": "0.5",
+                "actNormal.vx": "0.5",
+                "actNormal.vy": "0.5",
+                "actNormal.vz": "0.5",
+            }
+        )
         entity_list = [entity_definition] + point_in_3d_definition_factory()
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -100,12 +109,14 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (0.5, 0.5, 0.5, 0.5)
 
     def test_create_normal_in_3d__partial_normal_defaults_to_zero(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "3000",
-            "point[0]": {"v": "99999990"},
-            "actNormal": {"vx": "1.0"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "3000",
+                "point[0].v": "99999990",
+                "actNormal.vx": "1.0",
+            }
+        )
         entity_list = [entity_definition] + point_in_3d_definition_factory()
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -114,11 +125,9 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (1.0, 0.0, 0.0, 0.0)
 
     def test_create_normal_in_3d__undefined_normal_defaults_to_zero(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "3000",
-            "point[0]": {"v": "99999990"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {"h.v": self.entity_id, "type": "3000", "point[0].v": "99999990"}
+        )
         entity_list = [entity_definition] + point_in_3d_definition_factory()
 
         entity = self.service.construct_entity(entity_definition, entity_list)
@@ -127,19 +136,23 @@ class TestEntityRepository:
         assert self.system.params(entity.params) == (0.0, 0.0, 0.0, 0.0)
 
     def test_create_workplane__success(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "10000",
-            "point[0]": {"v": "99999991"},
-            "normal": {"v": "99999992"},
-        }
-        point_definition = {"h": {"v": "99999991"}, "type": "2000"}
-        normal_definition = {
-            "h": {"v": "99999992"},
-            "type": "3000",
-            "point[0]": {"v": "99999991"},
-            "actNormal": {"w": "1.0"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "10000",
+                "point[0].v": "99999991",
+                "normal.v": "99999992",
+            }
+        )
+        point_definition = EntityRecord.from_fields({"h.v": "99999991", "type": "2000"})
+        normal_definition = EntityRecord.from_fields(
+            {
+                "h.v": "99999992",
+                "type": "3000",
+                "point[0].v": "99999991",
+                "actNormal.w": "1.0",
+            }
+        )
 
         entity_list = [entity_definition, point_definition, normal_definition]
 
@@ -153,12 +166,14 @@ class TestEntityRepository:
         )
 
     def test_create_line_segment__in_3d__success(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "11000",
-            "point[0]": {"v": "99999991"},
-            "point[1]": {"v": "99999992"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "11000",
+                "point[0].v": "99999991",
+                "point[1].v": "99999992",
+            }
+        )
         points_definition = point_in_3d_definition_factory(
             hv="99999991"
         ) + point_in_3d_definition_factory(hv="99999992", x="1.0", y="1.0", z="1.0")
@@ -175,13 +190,15 @@ class TestEntityRepository:
         )
 
     def test_create_line_segment__in_2d__success(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "11000",
-            "point[0]": {"v": "99999999"},
-            "point[1]": {"v": "99999998"},
-            "workplane": {"v": "99999990"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "11000",
+                "point[0].v": "99999999",
+                "point[1].v": "99999998",
+                "workplane.v": "99999990",
+            }
+        )
         workplane_definition = workplane_definition_factory()
         points_definition = point_in_2d_definition_factory(
             hv="99999999", workplane="99999990"
@@ -202,27 +219,34 @@ class TestEntityRepository:
         )
 
     def test_create_circle__in_2d__success(self):
-        entity_definition = {
-            "h": {"v": self.entity_id},
-            "type": "13000",
-            "point[0]": {"v": "99999997"},
-            "normal": {"v": "99999992"},
-            "distance": {"v": "99999998"},
-            "workplane": {"v": "99999990"},
-        }
+        entity_definition = EntityRecord.from_fields(
+            {
+                "h.v": self.entity_id,
+                "type": "13000",
+                "point[0].v": "99999997",
+                "normal.v": "99999992",
+                "distance.v": "99999998",
+                "workplane.v": "99999990",
+            }
+        )
         workplane_definition = workplane_definition_factory()
-        point_definition = {
-            "h": {"v": "99999997"},
-            "type": "2001",
-            "workplane": {"v": "99999990"},
-            "actPoint": {"x": "1.0", "y": "1.0"},
-        }
-        distance_definition = {
-            "h": {"v": "99999998"},
-            "type": "4000",
-            "workplane": {"v": "99999990"},
-            "actDistance": "10.0",
-        }
+        point_definition = EntityRecord.from_fields(
+            {
+                "h.v": "99999997",
+                "type": "2001",
+                "workplane.v": "99999990",
+                "actPoint.x": "1.0",
+                "actPoint.y": "1.0",
+            }
+        )
+        distance_definition = EntityRecord.from_fields(
+            {
+                "h.v": "99999998",
+                "type": "4000",
+                "workplane.v": "99999990",
+                "actDistance": "10.0",
+            }
+        )
         entity_list = [
             entity_definition,
             distance_definition,
@@ -239,3 +263,77 @@ class TestEntityRepository:
         self.repository.get_or_create_circle.assert_called_with(
             self.entity_id, normal, point, distance, workplane
         )
+
+    def test_construct_entities__dependencies_listed_after_dependents(self):
+        entity_list = line_chain_definition_factory(3)
+
+        self.service.construct_entities(entity_list)
+
+        for entity_definition in entity_list:
+            assert self.repository.get(entity_definition.h)
+        assert self.repository.get_or_create_workplane.call_count == 1
+        assert self.repository.get_or_create_line_segment.call_count == 3
+
+    def test_construct_entities__dependency_from_earlier_call(self):
+        self.service.construct_entities(workplane_definition_factory())
+
+        self.service.construct_entities(point_in_2d_definition_factory(hv="00000002"))
+
+        assert self.system.params(self.repository.get("00000002").params) == (0.0, 0.0,)
+        assert self.repository.get_or_create_workplane.call_count == 1
+
+    def test_construct_entities__missing_dependency_raises(self):
+        with pytest.raises(EntityNotFoundException):
+            self.service.construct_entities(
+                point_in_2d_definition_factory(hv="00000002", workplane="00000003")
+            )
+
+
+class _CountingList(list):
+    """Counts the items read by iterating the list, as a linear scan would."""
+
+    def __init__(self, items):
+        super().__init__(items)
+        self.reads = 0
+
+    def __iter__(self):
+        for item in super().__iter__():
+            self.reads += 1
+            yield item
+
+
+class _CountingIndex(dict):
+    """Counts dependency lookups in the service's handle -> definition index."""
+
+    lookups = 0
+
+    def get(self, key, default=None):
+        _CountingIndex.lookups += 1
+        return super().get(key, default)
+
+    def __getitem__(self, key):
+        _CountingIndex.lookups += 1
+        return super().__getitem__(key)
+
+
+class TestEntityServiceScaling:
+    def test_construct_entities_scales_linearly(self, monkeypatch):
+        # 12k entities. Listing or scanning the definitions once per dependency
+        # would read tens of millions of them.
+        entity_list = _CountingList(line_chain_definition_factory(4000))
+        index_by_id = EntityService._index_by_id
+        monkeypatch.setattr(
+            EntityService,
+            "_index_by_id",
+            lambda self, definitions: _CountingIndex(index_by_id(self, definitions)),
+        )
+        monkeypatch.setattr(_CountingIndex, "lookups", 0)
+        repository = EntityRepository(system=SolverSystem())
+
+        EntityService(entity_repository=repository).construct_entities(entity_list)
+
+        # Once to index the definitions, once to order them
+        assert entity_list.reads == 2 * len(entity_list)
+        # At most one lookup per dependency: 2 points and a workplane per line
+        assert 0 < _CountingIndex.lookups <= 3 * len(entity_list)
+        assert all(repository.get(record.h) for record in entity_list)
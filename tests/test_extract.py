@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from python_solvespace import SolverSystem
+from slvstopy import PointExtractor, Slvstopy, extract_points
+
+
+class TestExtractPoints:
+    @pytest.fixture(
+        autouse=True,
+        params=["tests/files/crank_rocker.slvs", "tests/files/involute.slvs"],
+    )
+    def setup(self, request):
+        self.system_factory = Slvstopy(file_path=request.param)
+        self.system, self.entities = self.system_factory.generate_system()
+        self.system.solve()
+
+    def test_matches_params(self):
+        coordinates, rows = extract_points(self.system, self.entities)
+
+        assert coordinates.dtype == np.float64
+        assert coordinates.flags.c_contiguous
+        for entity_id, entity in self.entities.items():
+            params = self.system.params(entity.params)
+            if not params:
+                assert entity_id not in rows
+                continue
+            count = len(params)
+            row = coordinates[rows[entity_id]]
+            assert tuple(row[:count]) == params
+            assert np.isnan(row[count:]).all()
+
+    def test_covers_entity_kinds(self):
+        _, rows = extract_points(self.system, self.entities)
+        kinds = {
+            (
+                entity.is_point_2d(),
+                entity.is_point_3d(),
+                entity.is_normal_3d(),
+                entity.is_distance(),
+            )
+            for entity_id, entity in self.entities.items()
+            if entity_id in rows
+        }
+
+        assert (True, False, False, False) in kinds
+        assert (False, True, False, False) in kinds
+        assert (False, False, True, False) in kinds
+
+    def test_selected_handles(self):
+        handles = list(self.entities)[-3:]
+        coordinates, rows = extract_points(self.system, self.entities, handles)
+
+        assert list(rows) == handles
+        assert coordinates.shape[0] == 3
+
+    def test_extractor_is_reusable_across_replays(self):
+        extractor = PointExtractor(self.entities)
+        system, entities = self.system_factory.generate_system()
+        system.solve()
+
+        np.testing.assert_array_equal(
+            extractor.extract(system), extract_points(system, entities)[0]
+        )
+
+    def test_extract_into_out(self):
+        extractor = PointExtractor(self.entities)
+        out = np.empty((len(extractor.handles), extractor.width))
+
+        assert extractor.extract(self.system, out=out) is out
+        with pytest.raises(ValueError):
+            extractor.extract(self.system, out=np.empty((1, 1)))
+
+
+class TestDistanceExtraction:
+    def test_distance(self):
+        system = SolverSystem()
+        workplane = system.create_2d_base()
+        entities = {"d": system.add_distance(3.0, workplane)}
+
+        coordinates, rows = extract_points(system, entities)
+
+        assert coordinates.shape == (1, 1)
+        assert coordinates[rows["d"], 0] == 3.0
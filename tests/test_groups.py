@@ -0,0 +1,229 @@
+import math
+import pytest
+
+from python_solvespace import ResultFlag, SolverSystem
+from slvstopy import Slvstopy
+from slvstopy.constants import ConstraintType, EntityType
+from slvstopy.groups import GroupSolver, set_entity_groups
+from slvstopy.plan import compile_plan, construct_system, solver_groups
+from slvstopy.records import (
+    ConstraintRecord,
+    EntityRecord,
+    GroupRecord,
+    RequestRecord,
+)
+
+WORKPLANE = "00010000"
+
+
+def three_group_model():
+    """
+    References, then group 2 with a point 10 from the origin and group 3 with
+    a point 5 from the group 2 point. Group blocks are listed out of order.
+    """
+    groups = [
+        GroupRecord(h="00000003", type=5001, order=2),
+        GroupRecord(h="00000001", type=5000),
+        GroupRecord(h="00000002", type=5001, order=1),
+    ]
+    entities = [
+        EntityRecord(
+            h=WORKPLANE,
+            type=EntityType.WORKPLANE,
+            point=("00010001",),
+            normal="00010020",
+            group="00000001",
+        ),
+        EntityRecord(h="00010001", type=EntityType.POINT_IN_3D, group="00000001"),
+        EntityRecord(
+            h="00010020",
+            type=EntityType.NORMAL_IN_3D,
+            point=("00010001",),
+            act_normal=(1.0, 0.0, 0.0, 0.0),
+            group="00000001",
+        ),
+        EntityRecord(
+            h="00020000",
+            type=EntityType.POINT_IN_2D,
+            workplane=WORKPLANE,
+            act_point=(1.0, 0.0, 0.0),
+            group="00000002",
+        ),
+        EntityRecord(
+            h="00030000",
+            type=EntityType.POINT_IN_2D,
+            workplane=WORKPLANE,
+            act_point=(1.0, 1.0, 0.0),
+            group="00000003",
+        ),
+    ]
+    constraints = [
+        ConstraintRecord(
+            h="00000001",
+            type=ConstraintType.POINTS_COINCIDENT,
+            workplane=WORKPLANE,
+            pt_a="00010001",
+            pt_b="00020000",
+            group="00000002",
+        ),
+        ConstraintRecord(
+            h="00000002",
+            type=ConstraintType.PT_PT_DISTANCE,
+            workplane=WORKPLANE,
+            val_a=5.0,
+            pt_a="00020000",
+            pt_b="00030000",
+            group="00000003",
+        ),
+    ]
+    return entities, constraints, groups
+
+
+class TestSetEntityGroups:
+    def test_groups_from_requests_and_derived_handles(self):
+        entities = [
+            EntityRecord(h="00040000", type=EntityType.POINT_IN_2D),
+            EntityRecord(h="00090002", type=EntityType.POINT_IN_2D),
+            EntityRecord(h="80020000", type=EntityType.WORKPLANE),
+            EntityRecord(h="00050000", type=EntityType.POINT_IN_2D),
+        ]
+        requests = [
+            RequestRecord(h="00000004", type=101, group="00000002"),
+            RequestRecord(h="00000009", type=200, group="00000003"),
+        ]
+
+        set_entity_groups(entities, requests)
+
+        assert [record.group for record in entities] == [
+            "00000002",
+            "00000003",
+            "00000002",
+            None,
+        ]
+
+    @pytest.mark.parametrize(
+        "file_path", ["tests/files/crank_rocker.slvs", "tests/files/involute.slvs"]
+    )
+    def test_sample_reference_group_is_first_nine(self, file_path):
+        system_factory = Slvstopy(file_path=file_path)
+
+        entity_groups, constraint_groups = solver_groups(
+            system_factory.entity_definition, system_factory.constraint_definition
+        )
+
+        assert entity_groups == [0] * 9 + [1] * (len(entity_groups) - 9)
+        assert set(constraint_groups) == {1}
+        assert [group.h for group in system_factory.group_definition] == [
+            "00000001",
+            "00000002",
+        ]
+
+
+class TestSolverGroups:
+    def test_default_solves_every_group_together(self):
+        entities, constraints, groups = three_group_model()
+
+        entity_groups, constraint_groups = solver_groups(entities, constraints, groups)
+
+        assert entity_groups == [0, 0, 0, 1, 1]
+        assert constraint_groups == [1, 1]
+
+    def test_grouped_follows_group_order(self):
+        entities, constraints, groups = three_group_model()
+
+        entity_groups, constraint_groups = solver_groups(
+            entities, constraints, groups, grouped=True
+        )
+
+        assert entity_groups == [0, 0, 0, 1, 2]
+        assert constraint_groups == [1, 2]
+
+    def test_records_without_groups_use_first_nine(self):
+        entities, constraints, groups = three_group_model()
+        for record in entities:
+            record.group = None
+
+        entity_groups, _ = solver_groups(entities, constraints, groups, grouped=True)
+
+        assert entity_groups == [0] * 5
+
+
+class TestGroupedPlan:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.entities, self.constraints, self.groups = three_group_model()
+        self.plan = compile_plan(
+            self.entities, self.constraints, self.groups, grouped=True
+        )
+
+    def test_replay_matches_direct_construction(self):
+        expected_system = SolverSystem()
+        expected_entities = construct_system(
+            expected_system, self.entities, self.constraints, self.groups, True
+        )
+        system, entities = self.plan.replay()
+
+        assert entities == expected_entities
+        assert system.constraints() == expected_system.constraints()
+
+    def test_groups(self):
+        assert self.plan.solve_groups == [1, 2]
+        assert self.plan.entity_groups["00030000"] == 2
+        assert self.plan.constraint_groups == {"00000001": 1, "00000002": 2}
+
+
+class TestGroupSolver:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        entities, constraints, groups = three_group_model()
+        self.solver = GroupSolver(
+            compile_plan(entities, constraints, groups, grouped=True)
+        )
+
+    def distance(self, system, entities):
+        a = system.params(entities["00020000"].params)
+        b = system.params(entities["00030000"].params)
+        return math.hypot(b[0] - a[0], b[1] - a[1])
+
+    def test_first_solve_solves_every_group(self):
+        result, system, entities = self.solver.solve()
+
+        assert result == ResultFlag.OKAY
+        assert self.solver.solved_groups == (1, 2)
+        assert self.distance(system, entities) == pytest.approx(5.0)
+
+    def test_resolves_only_downstream_groups(self):
+        self.solver.solve()
+
+        result, system, entities = self.solver.solve({"00000002": 8.0})
+
+        assert result == ResultFlag.OKAY
+        assert self.solver.solved_groups == (2,)
+        assert system.params(entities["00020000"].params) == pytest.approx((0, 0))
+        assert self.distance(system, entities) == pytest.approx(8.0)
+
+    def test_unchanged_overrides_solve_nothing(self):
+        self.solver.solve({"00000002": 8.0})
+
+        result, system, entities = self.solver.solve({"00000002": 8.0})
+
+        assert result == ResultFlag.OKAY
+        assert self.solver.solved_groups == ()
+        assert self.distance(system, entities) == pytest.approx(8.0)
+
+    def test_reset(self):
+        self.solver.solve()
+        self.solver.reset()
+        self.solver.solve()
+
+        assert self.solver.solved_groups == (1, 2)
+
+    def test_slvstopy_group_solver(self):
+        system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+        solver = system_factory.group_solver()
+
+        result, system, entities = solver.solve({"0000000d": 60.0})
+        x, y = system.params(entities["00060000"].params)
+
+        assert result == ResultFlag.OKAY
+        assert math.degrees(math.atan2(y, x)) == pytest.approx(60.0)
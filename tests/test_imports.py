@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def loaded_modules(statement):
+    """Modules loaded by `statement` in a new interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", f"import sys; {statement}; print(*sys.modules)"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(output.split())
+
+
+class TestLazyImports:
+    @pytest.mark.parametrize(
+        "statement",
+        [
+            "import slvstopy",
+            "from slvstopy import iter_records, EntityRecord, ConstraintRecord",
+            "from slvstopy.parser import iter_records_mmap",
+            "from slvstopy.params import ParamTable",
+        ],
+    )
+    def test_parsing_does_not_load_the_solver(self, statement):
+        modules = loaded_modules(statement)
+
+        assert "python_solvespace" not in modules
+        assert "numpy" not in modules
+
+    def test_solver_loads_on_first_use(self):
+        modules = loaded_modules("from slvstopy import Slvstopy")
+
+        assert "python_solvespace" in modules
+
+    def test_shared_memory_loads_only_for_parallel_sweeps(self):
+        # multiprocessing.shared_memory needs Python 3.8
+        modules = loaded_modules("from slvstopy import Slvstopy")
+
+        assert "multiprocessing.shared_memory" not in modules
+
+    def test_lazy_attributes(self):
+        import slvstopy
+        from slvstopy.factory import Slvstopy
+
+        assert slvstopy.Slvstopy is Slvstopy
+        assert set(slvstopy.__all__) <= set(dir(slvstopy))
+        with pytest.raises(AttributeError):
+            slvstopy.missing
@@ -0,0 +1,99 @@
+import pytest
+
+from slvstopy import Instrumentation, Slvstopy
+from slvstopy.instrument import LoadReport, phase
+
+
+class TestInstrumentation:
+    def test_phase_records_and_calls_hooks(self):
+        calls = []
+        instrumentation = Instrumentation(hooks=[lambda *args: calls.append(args)])
+
+        with instrumentation.phase("solve"):
+            pass
+        with instrumentation.phase("solve"):
+            pass
+
+        assert instrumentation.report.calls == {"solve": 2}
+        assert instrumentation.report.phases["solve"] >= 0.0
+        assert [name for name, _ in calls] == ["solve", "solve"]
+
+    def test_phase_records_on_error(self):
+        instrumentation = Instrumentation()
+
+        with pytest.raises(RuntimeError):
+            with instrumentation.phase("build"):
+                raise RuntimeError
+
+        assert instrumentation.report.calls == {"build": 1}
+
+    def test_timed(self):
+        instrumentation = Instrumentation()
+
+        assert list(instrumentation.timed("read", range(3))) == [0, 1, 2]
+        assert instrumentation.report.calls == {"read": 1}
+
+    def test_disabled_phase_is_shared(self):
+        assert phase(None, "solve") is phase(None, "build")
+
+
+class TestLoadReport:
+    def test_type_counts(self):
+        report = LoadReport()
+        system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+        report.count(
+            system_factory.entity_definition, system_factory.constraint_definition
+        )
+
+        assert report.entity_types["POINT_IN_2D"] == 9
+        assert report.constraint_types == {
+            "WHERE_DRAGGED": 2,
+            "PT_PT_DISTANCE": 5,
+            "POINTS_COINCIDENT": 4,
+            "ANGLE": 1,
+        }
+
+    def test_as_dict(self):
+        report = LoadReport()
+        report.add("solve", 0.5)
+        report.add("solve", 0.25)
+
+        assert report.total == 0.75
+        assert report.as_dict() == {
+            "phases": {"solve": 0.75},
+            "calls": {"solve": 2},
+            "entity_types": {},
+            "constraint_types": {},
+        }
+
+
+class TestSlvstopyInstrumentation:
+    def test_load_and_solve_phases(self):
+        system_factory = Slvstopy(
+            file_path="tests/files/crank_rocker.slvs",
+            presolve=True,
+            instrumentation=Instrumentation(),
+        )
+        system_factory.solve()
+        system_factory.solve()
+
+        report = system_factory.load_report
+        assert list(report.phases) == [
+            "read",
+            "seed",
+            "presolve",
+            "entities",
+            "constraints",
+            "build",
+            "solve",
+            "extract",
+        ]
+        assert report.calls["entities"] == 1
+        assert report.calls["solve"] == 2
+        assert "POINTS_COINCIDENT" not in report.constraint_types
+
+    def test_disabled(self):
+        system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+        assert system_factory.load_report is None
@@ -0,0 +1,106 @@
+import io
+import pytest
+
+from slvstopy import Slvstopy
+from slvstopy.constants import EntityType
+from slvstopy.params import ParamTable, entity_param_handles, seed_entities
+from slvstopy.records import EntityRecord, ParamRecord
+
+
+class TestParamTable:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.table = ParamTable.from_records(
+            [
+                ParamRecord(h=0x00040011, val=2.0),
+                ParamRecord(h=0x00040010, val=1.0),
+                ParamRecord(h=0x00010020, val=0.5),
+            ]
+        )
+
+    def test_get(self):
+        assert len(self.table) == 3
+        assert self.table.get(0x00040010) == 1.0
+        assert self.table.get(0x00040011) == 2.0
+        assert self.table.get(0x00040012) is None
+        assert self.table.get(0) is None
+
+    def test_lookup_requires_every_handle(self):
+        assert self.table.lookup((0x00040010, 0x00040011)) == (1.0, 2.0)
+        assert self.table.lookup((0x00040010, 0x00040012)) is None
+        assert self.table.lookup(()) is None
+
+    def test_is_compact(self):
+        assert self.table.handles.itemsize == 4
+        assert self.table.values.itemsize == 8
+
+
+class TestEntityParamHandles:
+    @pytest.mark.parametrize(
+        "entity_id, entity_type, expected",
+        [
+            # point request, the point is entity 0
+            ("00040000", EntityType.POINT_IN_2D, (0x00040010, 0x00040011)),
+            # line request, points are entities 1 and 2
+            ("00090001", EntityType.POINT_IN_2D, (0x00090010, 0x00090011)),
+            ("00090002", EntityType.POINT_IN_2D, (0x00090013, 0x00090014)),
+            ("00010001", EntityType.POINT_IN_3D, (0x00010010, 0x00010011, 0x00010012)),
+            (
+                "00010020",
+                EntityType.NORMAL_IN_3D,
+                (0x00010020, 0x00010021, 0x00010022, 0x00010023),
+            ),
+            ("000b0040", EntityType.DISTANCE, (0x000B0040,)),
+            ("00090000", EntityType.LINE_SEGMENT, ()),
+            ("80020002", EntityType.POINT_N_COPY, ()),
+            ("80020002", EntityType.POINT_IN_3D, ()),
+        ],
+    )
+    def test_handles(self, entity_id, entity_type, expected):
+        assert entity_param_handles(entity_id, entity_type) == expected
+
+
+class TestSeedEntities:
+    def test_seeds_missing_values_only(self):
+        table = ParamTable(
+            [0x00040010, 0x00040011, 0x00050010, 0x00050011, 0x00010020, 0x000B0040],
+            [1.0, 2.0, 3.0, 4.0, 1.0, 7.5],
+        )
+        missing = EntityRecord(h="00040000", type=EntityType.POINT_IN_2D)
+        present = EntityRecord(
+            h="00050000", type=EntityType.POINT_IN_2D, act_point=(9.0, 9.0, 0.0)
+        )
+        normal = EntityRecord(h="00010020", type=EntityType.NORMAL_IN_3D)
+        distance = EntityRecord(h="000b0040", type=EntityType.DISTANCE)
+        unknown = EntityRecord(h="00060000", type=EntityType.POINT_IN_2D)
+
+        seeded = seed_entities([missing, present, normal, distance, unknown], table)
+
+        assert seeded == 2
+        assert missing.act_point == (1.0, 2.0, 0.0)
+        assert present.act_point == (9.0, 9.0, 0.0)
+        assert normal.act_normal is None
+        assert distance.act_distance == 7.5
+        assert unknown.act_point is None
+
+    def test_sample_params_match_saved_values(self):
+        with open(
+            "tests/files/crank_rocker.slvs", encoding="utf8", errors="ignore"
+        ) as f:
+            content = f.read()
+        stripped = "\n".join(
+            line for line in content.split("\n") if ".actPoint." not in line
+        )
+
+        expected = Slvstopy(file_handle=io.StringIO(content))
+        seeded = Slvstopy(file_handle=io.StringIO(stripped))
+
+        for record, expected_record in zip(
+            seeded.entity_definition, expected.entity_definition
+        ):
+            assert record.act_point == (expected_record.act_point or record.act_point)
+        seeded_system, seeded_entities = seeded.generate_system()
+        expected_system, expected_entities = expected.generate_system()
+        assert seeded_system.params(
+            seeded_entities["00070000"].params
+        ) == expected_system.params(expected_entities["00070000"].params)
@@ -0,0 +1,140 @@
+import io
+import pytest
+
+from slvstopy import Slvstopy
+from slvstopy.parser import iter_records, iter_records_mmap
+from slvstopy.records import ConstraintRecord, EntityRecord, GroupRecord, ParamRecord
+
+
+SAMPLE_FILE = """\xb1\xb2\xb3 SolveSpaceREVa
+
+
+Group.h.v=00000001
+Group.type=5000
+Group.remap={
+}
+AddGroup
+
+Param.h.v.=00010020
+Param.val=1.00000000000000000000
+AddParam
+
+Entity.h.v=00010001
+Entity.type=2000
+Entity.construction=0
+AddEntity
+
+Entity.h.v=00040000
+Entity.type=2001
+Entity.workplane.v=80020000
+Entity.actPoint.x=90.00000000000000000000
+AddEntity
+
+Constraint.h.v=00000001
+Constraint.type=200
+Constraint.ptA.v=00040000
+AddConstraint
+
+Triangle 00000000 00000000  0.0 0.0 0.0  0.0 0.0 0.0  0.0 0.0 0.0
+AddSurface
+"""
+
+
+class TestIterRecords:
+    def test_yields_records_in_file_order(self):
+        records = list(iter_records(io.StringIO(SAMPLE_FILE)))
+
+        assert records == [
+            ("Group", GroupRecord(h="00000001", type=5000)),
+            ("Param", ParamRecord(h=0x00010020, val=1.0)),
+            ("Entity", EntityRecord(h="00010001", type=2000)),
+            (
+                "Entity",
+                EntityRecord(
+                    h="00040000",
+                    type=2001,
+                    workplane="80020000",
+                    act_point=(90.0, 0.0, 0.0),
+                ),
+            ),
+            ("Constraint", ConstraintRecord(h="00000001", type=200, pt_a="00040000"),),
+        ]
+
+    def test_handles_windows_line_endings(self):
+        handle = io.StringIO(SAMPLE_FILE.replace("\n", "\r\n"), newline="")
+
+        records = list(iter_records(handle))
+
+        assert len(records) == 5
+        assert records[3][1].act_point == (90.0, 0.0, 0.0)
+
+    def test_consumes_handle_incrementally(self):
+        handle = io.StringIO(SAMPLE_FILE)
+        records = iter_records(handle)
+
+        assert next(records)[0] == "Group"
+        assert next(records)[0] == "Param"
+        record_type, definition = next(records)
+
+        assert record_type == "Entity"
+        assert definition.h == "00010001"
+        assert "Constraint.h.v" in handle.read()
+
+
+class TestIterRecordsMmap:
+    @pytest.mark.parametrize(
+        "file_path", ["tests/files/crank_rocker.slvs", "tests/files/involute.slvs"]
+    )
+    def test_matches_text_parser(self, file_path):
+        with open(file_path, encoding="utf8", errors="ignore") as f:
+            expected = list(iter_records(f))
+
+        assert list(iter_records_mmap(file_path)) == expected
+
+    def test_skips_mesh_sections(self, tmp_path):
+        mesh = (
+            "Triangle 00000000 ff000000  0.0 0.0 0.0  1.0 0.0 0.0  0.0 1.0 0.0\n" * 100
+            + "Surface 00000000 00000000 00000000 1 1\n"
+            + "SCtrl 0.0 0.0 0.0 1.0\n"
+            + "AddSurface\n"
+            + "Curve 00000000 0 0 1 00000000 00000000\n"
+            + "CurvePt 0 0.0 0.0 0.0\n"
+            + "AddCurve\n"
+        )
+        entity = "Entity.h.v=00050000\nEntity.type=2000\nAddEntity\n\n"
+        content = SAMPLE_FILE.replace("Triangle", mesh + entity + "Triangle")
+        file_path = tmp_path / "mesh.slvs"
+        file_path.write_text(content, encoding="utf8")
+
+        records = list(iter_records_mmap(str(file_path)))
+
+        assert records == list(iter_records(io.StringIO(content)))
+        assert records[-1] == ("Entity", EntityRecord(h="00050000", type=2000))
+
+    def test_empty_file(self, tmp_path):
+        file_path = tmp_path / "empty.slvs"
+        file_path.write_bytes(b"")
+
+        assert list(iter_records_mmap(str(file_path))) == []
+
+
+class TestSlvstopyFromHandle:
+    def test_load_from_file_handle(self):
+        with open(
+            "tests/files/crank_rocker.slvs", encoding="utf8", errors="ignore"
+        ) as f:
+            system_factory = Slvstopy(file_handle=f)
+
+        from_path = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+        assert system_factory.entity_definition == from_path.entity_definition
+        assert system_factory.constraint_definition == from_path.constraint_definition
+
+    def test_load_with_memory_map(self):
+        system_factory = Slvstopy(
+            file_path="tests/files/crank_rocker.slvs", memory_map=True
+        )
+        from_path = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+        assert system_factory.entity_definition == from_path.entity_definition
+        assert system_factory.constraint_definition == from_path.constraint_definition
@@ -0,0 +1,121 @@
+import math
+import pytest
+
+from python_solvespace import Entity, SolverSystem, ResultFlag
+from slvstopy import Slvstopy
+from slvstopy.plan import compile_plan, construct_system
+from slvstopy.repositories import ConstraintRepository
+from slvstopy.records import ConstraintRecord
+
+
+class TestConstructionPlan:
+    @pytest.fixture(
+        autouse=True,
+        params=["tests/files/crank_rocker.slvs", "tests/files/involute.slvs"],
+    )
+    def setup(self, request):
+        self.system_factory = Slvstopy(file_path=request.param)
+
+    def test_replay_matches_direct_construction(self):
+        expected_system = SolverSystem()
+        expected_entities = construct_system(
+            expected_system,
+            self.system_factory.entity_definition,
+            self.system_factory.constraint_definition,
+        )
+
+        system, entities = self.system_factory.compile().replay()
+
+        assert entities.keys() == expected_entities.keys()
+        for entity_id, entity in entities.items():
+            assert entity == expected_entities[entity_id]
+            assert system.params(entity.params) == expected_system.params(
+                expected_entities[entity_id].params
+            )
+        assert system.constraints() == expected_system.constraints()
+        assert system.solve() == expected_system.solve() == ResultFlag.OKAY
+
+    def test_replay_creates_independent_systems(self):
+        plan = self.system_factory.compile()
+
+        first_system, _ = plan.replay()
+        second_system, entities = plan.replay()
+        initial = {
+            entity_id: second_system.params(entity.params)
+            for entity_id, entity in entities.items()
+        }
+        first_system.solve()
+
+        assert first_system is not second_system
+        assert initial == {
+            entity_id: second_system.params(entity.params)
+            for entity_id, entity in entities.items()
+        }
+
+    def test_compile_is_cached(self):
+        assert self.system_factory.compile() is self.system_factory.compile()
+
+
+class TestCompilePlan:
+    def test_unsupported_constraint_raises_when_compiling(self):
+        with pytest.raises(NotImplementedError):
+            compile_plan([], [ConstraintRecord(h="00000001", type=1000)])
+
+    def test_records_values_the_repository_copies(self, monkeypatch):
+        system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+        expected = system_factory.compile().constraint_values
+
+        def add_pt_pt_distance(self, e1, e2, value, wp=Entity.FREE_IN_3D):
+            self.system.distance(e1, e2, value * 1.0, wp)
+
+        monkeypatch.setattr(
+            ConstraintRepository, "add_pt_pt_distance", add_pt_pt_distance
+        )
+        plan = compile_plan(
+            system_factory.entity_definition, system_factory.constraint_definition
+        )
+
+        assert plan.constraint_values == expected
+
+
+class TestOverrides:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+    def test_override_dimensions(self):
+        # 0000000d is the crank angle, 00000006 the crank length
+        system, entities = self.system_factory.generate_system(
+            overrides={"0000000d": 60.0, "00000006": 30.0}
+        )
+        result = system.solve()
+        coordinates = system.params(entities["00060000"].params)
+
+        assert result == ResultFlag.OKAY
+        assert coordinates[0] == pytest.approx(30.0 * math.cos(math.radians(60)))
+        assert coordinates[1] == pytest.approx(30.0 * math.sin(math.radians(60)))
+
+    def test_overrides_do_not_change_the_model(self):
+        self.system_factory.generate_system(overrides={"00000006": 30.0})
+        system, entities = self.system_factory.generate_system()
+        system.solve()
+        coordinates = system.params(entities["00060000"].params)
+
+        assert coordinates[0] == pytest.approx(35.0 * math.cos(math.radians(45)))
+        assert coordinates[1] == pytest.approx(35.0 * math.sin(math.radians(45)))
+
+    def test_override_positions(self):
+        system, entities = self.system_factory.generate_system(
+            positions={"00070000": (1.0, 2.0)}
+        )
+
+        assert system.params(entities["00070000"].params) == (1.0, 2.0)
+
+    def test_override_constraint_without_value_raises(self):
+        # 00000008 is a POINTS_COINCIDENT constraint
+        with pytest.raises(KeyError):
+            self.system_factory.generate_system(overrides={"00000008": 1.0})
+
+    def test_override_positions_with_wrong_length_raises(self):
+        with pytest.raises(ValueError):
+            self.system_factory.generate_system(positions={"00070000": (1.0,)})
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from python_solvespace import ResultFlag
+from slvstopy import Slvstopy
+
+FILE_PATH = "tests/files/crank_rocker.slvs"
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+class TestSystemPool:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path=FILE_PATH)
+
+    def test_watermarks(self):
+        with pytest.raises(ValueError):
+            self.system_factory.system_pool(high_watermark=1, low_watermark=2)
+
+    def test_fill_and_acquire(self):
+        pool = self.system_factory.system_pool(
+            high_watermark=3, low_watermark=1, start=False
+        )
+        pool.fill()
+
+        system, entities = pool.acquire()
+
+        assert system.solve() == ResultFlag.OKAY
+        assert pool.stats() == {"hits": 1, "misses": 0, "built": 3, "ready": 2}
+
+    def test_unwatched_overrides_are_cold_builds(self):
+        pool = self.system_factory.system_pool(start=False)
+        expected = self.system_factory.solve({"0000000d": 60.0})
+
+        system, entities = pool.acquire({"0000000d": 60.0})
+
+        assert system.solve() == ResultFlag.OKAY
+        assert system.params(entities["00070000"].params) == pytest.approx(
+            tuple(expected["00070000"])
+        )
+        assert (pool.hits, pool.misses, pool.built) == (0, 1, 0)
+
+    def test_watch(self):
+        pool = self.system_factory.system_pool(
+            high_watermark=2, low_watermark=1, start=False
+        )
+        pool.watch({"0000000d": 60.0})
+        pool.fill()
+        expected = self.system_factory.solve({"0000000d": 60.0})
+
+        system, entities = pool.acquire({"0000000d": 60})
+
+        assert pool.hits == 1
+        assert pool.ready == 3
+        system.solve()
+        assert system.params(entities["00070000"].params) == pytest.approx(
+            tuple(expected["00070000"])
+        )
+
+    def test_watch_unknown_constraint(self):
+        pool = self.system_factory.system_pool(start=False)
+
+        with pytest.raises(KeyError):
+            pool.watch({"000000ff": 1.0})
+
+    def test_background_refill(self):
+        with self.system_factory.system_pool(high_watermark=4, low_watermark=2) as pool:
+            wait_for(lambda: pool.ready == 4)
+
+            for _ in range(3):
+                pool.acquire()
+            # Dropped below the low watermark, refilled up to the high one
+            wait_for(lambda: pool.ready == 4)
+
+            assert pool.hits == 3
+            assert pool.built == 7
+
+        assert not pool._thread.is_alive()
+
+    def test_background_error_is_raised_by_acquire(self, monkeypatch):
+        plan = self.system_factory.compile()
+
+        def fail(*args, **kwargs):
+            raise ValueError("replay failed")
+
+        monkeypatch.setattr(type(plan), "replay", fail)
+        pool = self.system_factory.system_pool()
+        wait_for(lambda: pool.error is not None)
+
+        with pytest.raises(RuntimeError) as raised:
+            pool.acquire()
+
+        assert isinstance(raised.value.__cause__, ValueError)
+        pool.close()
+        assert not pool._thread.is_alive()
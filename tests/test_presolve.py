@@ -0,0 +1,284 @@
+import io
+import pytest
+
+from python_solvespace import ResultFlag
+from slvstopy import Slvstopy
+from slvstopy.constants import ConstraintType, EntityType
+from slvstopy.plan import compile_plan
+from slvstopy.presolve import presolve
+from slvstopy.records import ConstraintRecord, EntityRecord
+
+from factories import (
+    ORIGIN,
+    WORKPLANE,
+    distance_record_factory as distance,
+    handles,
+    point_record_factory as point,
+)
+
+
+def coincident(h, pt_a, pt_b):
+    return ConstraintRecord(
+        h=h,
+        type=ConstraintType.POINTS_COINCIDENT,
+        workplane=WORKPLANE,
+        pt_a=pt_a,
+        pt_b=pt_b,
+        group="00000002",
+    )
+
+
+def chain_model():
+    """
+    A point pinned to the origin, joined by a coincident chain to the end of a
+    line, and a construction line no constraint touches.
+    """
+    entities = [
+        EntityRecord(
+            h=WORKPLANE,
+            type=EntityType.WORKPLANE,
+            point=(ORIGIN,),
+            normal="00010020",
+            group="00000001",
+        ),
+        EntityRecord(h=ORIGIN, type=EntityType.POINT_IN_3D, group="00000001"),
+        EntityRecord(
+            h="00010020",
+            type=EntityType.NORMAL_IN_3D,
+            point=(ORIGIN,),
+            act_normal=(1.0, 0.0, 0.0, 0.0),
+            group="00000001",
+        ),
+        point("00020000", 0.0, 0.0),
+        point("00030000", 0.5, 0.0),
+        EntityRecord(
+            h="00040000",
+            type=EntityType.LINE_SEGMENT,
+            workplane=WORKPLANE,
+            point=("00040001", "00040002"),
+            group="00000002",
+        ),
+        point("00040001", 1.0, 0.0),
+        point("00040002", 3.0, 1.0),
+        EntityRecord(
+            h="00050000",
+            type=EntityType.LINE_SEGMENT,
+            construction=True,
+            workplane=WORKPLANE,
+            point=("00050001", "00050002"),
+            group="00000002",
+        ),
+        point("00050001", 4.0, 4.0),
+        point("00050002", 5.0, 5.0),
+    ]
+    constraints = [
+        coincident("00000001", ORIGIN, "00020000"),
+        coincident("00000002", "00020000", "00030000"),
+        coincident("00000003", "00040001", "00030000"),
+        distance("00000004", "00040001", "00040002", 2.0),
+        ConstraintRecord(
+            h="00000005",
+            type=ConstraintType.HORIZONTAL,
+            workplane=WORKPLANE,
+            entity_a="00040000",
+            group="00000002",
+        ),
+    ]
+    return entities, constraints
+
+
+class TestPresolve:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.entities, self.constraints = chain_model()
+        self.presolved, self.presolved_constraints, self.report = presolve(
+            self.entities, self.constraints
+        )
+
+    def test_removes_unreferenced_entities(self):
+        assert self.report.removed_entities == ("00050000", "00050001", "00050002")
+
+    def test_collapses_coincident_chain(self):
+        assert self.report.merged_points == {
+            "00030000": "00020000",
+            "00040001": "00020000",
+        }
+        assert self.report.removed_constraints == ("00000002", "00000003")
+        assert handles(self.presolved) == [
+            WORKPLANE,
+            ORIGIN,
+            "00010020",
+            "00020000",
+            "00040000",
+            "00040002",
+        ]
+        assert self.presolved[4].point == ("00020000", "00040002")
+        assert self.presolved_constraints[1].pt_a == "00020000"
+
+    def test_keeps_reference_coincidence(self):
+        # The origin is a 3D reference point, so it is not merged
+        assert self.presolved_constraints[0].h == "00000001"
+
+    def test_input_untouched(self):
+        assert self.entities == chain_model()[0]
+        assert self.constraints == chain_model()[1]
+
+    def test_does_not_merge_across_groups(self):
+        self.entities[3].group = "00000003"
+
+        _, _, report = presolve(self.entities, self.constraints)
+
+        assert report.merged_points == {"00040001": "00030000"}
+
+    def test_repr(self):
+        assert repr(self.report) == (
+            "PresolveReport(3 entities removed, 2 points merged, "
+            "2 constraints removed)"
+        )
+
+
+class TestPresolveIsolatedPair:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        # Two free points joined by nothing but one coincident constraint
+        entities, _ = chain_model()
+        self.entities = entities[:3] + [
+            point("00020000", 0.0, 0.0),
+            point("00030000", 0.5, 0.0),
+        ]
+        self.constraints = [coincident("00000001", "00020000", "00030000")]
+
+    def test_keeps_merge_target(self):
+        presolved, presolved_constraints, report = presolve(
+            self.entities, self.constraints
+        )
+
+        assert report.merged_points == {"00030000": "00020000"}
+        assert report.removed_constraints == ("00000001",)
+        assert "00020000" in handles(presolved)
+        assert presolved_constraints == []
+
+    def test_merged_point_reads_kept_point(self):
+        presolved, presolved_constraints, report = presolve(
+            self.entities, self.constraints
+        )
+        system, presolved_entities = compile_plan(
+            presolved, presolved_constraints
+        ).replay()
+
+        assert system.solve() == ResultFlag.OKAY
+        assert report.merged_points["00030000"] in presolved_entities
+
+
+class TestSlvstopyPresolve:
+    @pytest.mark.parametrize(
+        "file_path", ["tests/files/crank_rocker.slvs", "tests/files/involute.slvs"]
+    )
+    def test_solution_matches(self, file_path):
+        expected = Slvstopy(file_path=file_path).solve()
+        system_factory = Slvstopy(file_path=file_path, presolve=True)
+
+        solution = system_factory.solve()
+
+        assert system_factory.presolve_report.merged_points
+        assert solution.result == expected.result
+        for entity_id in expected.rows:
+            assert solution[entity_id] == pytest.approx(expected[entity_id])
+
+    def test_isolated_coincident_pair(self):
+        # crank_rocker.slvs with two free points joined by one coincident constraint
+        requests = "".join(
+            f"Request.h.v={request}\nRequest.type=101\n"
+            "Request.workplane.v=80020000\nRequest.group.v=00000002\nAddRequest\n\n"
+            for request in ("00000020", "00000021")
+        )
+        entities = "".join(
+            f"Entity.h.v={request}0000\nEntity.type=2001\n"
+            f"Entity.workplane.v=80020000\nEntity.actPoint.x={x}\nAddEntity\n\n"
+            for request, x in (("0020", 1.0), ("0021", 2.0))
+        )
+        constraint = (
+            "Constraint.h.v=00000020\nConstraint.type=20\nConstraint.group.v=00000002\n"
+            "Constraint.workplane.v=80020000\nConstraint.ptA.v=00200000\n"
+            "Constraint.ptB.v=00210000\nAddConstraint\n\n"
+        )
+        with open(
+            "tests/files/crank_rocker.slvs", encoding="utf8", errors="ignore"
+        ) as f:
+            contents = f.read()
+        system_factory = Slvstopy(
+            file_handle=io.StringIO(contents + requests + entities + constraint),
+            presolve=True,
+        )
+
+        solution = system_factory.solve()
+
+        assert system_factory.presolve_report.merged_points["00210000"] == "00200000"
+        assert solution["00210000"] == pytest.approx(solution["00200000"])
+
+
+def projected_model():
+    """
+    Two 3D points coincident in the XY workplane, so only their projections
+    meet, and 5 apart in 3D.
+    """
+    entities, _ = chain_model()
+    entities = entities[:3] + [
+        EntityRecord(
+            h="00020000",
+            type=EntityType.POINT_IN_3D,
+            act_point=(0.0, 0.0, 0.0),
+            group="00000002",
+        ),
+        EntityRecord(
+            h="00030000",
+            type=EntityType.POINT_IN_3D,
+            act_point=(1.0, 1.0, 3.0),
+            group="00000002",
+        ),
+    ]
+    constraints = [
+        coincident("00000001", "00020000", "00030000"),
+        ConstraintRecord(
+            h="00000002",
+            type=ConstraintType.PT_PT_DISTANCE,
+            val_a=5.0,
+            pt_a="00020000",
+            pt_b="00030000",
+            group="00000002",
+        ),
+    ]
+    return entities, constraints
+
+
+class TestPresolveProjectedCoincidence:
+    def test_does_not_merge_projected_3d_points(self):
+        entities, constraints = projected_model()
+
+        _, presolved_constraints, report = presolve(entities, constraints)
+
+        assert report.merged_points == {}
+        assert handles(presolved_constraints) == ["00000001", "00000002"]
+
+    def test_merges_3d_points_coincident_in_3d(self):
+        entities, constraints = projected_model()
+        constraints[0].workplane = None
+
+        _, _, report = presolve(entities, constraints)
+
+        assert report.merged_points == {"00030000": "00020000"}
+
+    def test_solution_matches(self):
+        entities, constraints = projected_model()
+        expected_system, expected_entities = compile_plan(
+            entities, constraints
+        ).replay()
+        system, presolved_entities = compile_plan(
+            *presolve(entities, constraints)[:2]
+        ).replay()
+
+        assert system.solve() == expected_system.solve() == ResultFlag.OKAY
+        for entity_id in ("00020000", "00030000"):
+            assert system.params(presolved_entities[entity_id].params) == pytest.approx(
+                expected_system.params(expected_entities[entity_id].params)
+            )
@@ -0,0 +1,156 @@
+import pytest
+
+from slvstopy.records import (
+    ConstraintRecord,
+    EntityRecord,
+    GroupRecord,
+    ParamRecord,
+    RequestRecord,
+)
+
+
+class TestEntityRecord:
+    def test_from_fields__converts_values(self):
+        record = EntityRecord.from_fields(
+            {
+                "h.v": "00090000",
+                "type": "11000",
+                "construction": "1",
+                "point[0].v": "00090001",
+                "point[1].v": "00090002",
+                "workplane.v": "80020000",
+                "actVisible": "1",
+            }
+        )
+
+        assert record == EntityRecord(
+            h="00090000",
+            type=11000,
+            construction=True,
+            workplane="80020000",
+            point=("00090001", "00090002"),
+        )
+
+    def test_from_fields__partial_point_defaults_to_zero(self):
+        record = EntityRecord.from_fields(
+            {"h.v": "00050000", "type": "2001", "actPoint.x": "90.0"}
+        )
+
+        assert record.act_point == (90.0, 0.0, 0.0)
+        assert record.act_normal is None
+
+    def test_from_fields__normal_is_ordered_w_vx_vy_vz(self):
+        record = EntityRecord.from_fields(
+            {
+                "h.v": "00020020",
+                "type": "3000",
+                "actNormal.w": "0.1",
+                "actNormal.vx": "0.2",
+                "actNormal.vy": "0.3",
+                "actNormal.vz": "0.4",
+            }
+        )
+
+        assert record.act_normal == (0.1, 0.2, 0.3, 0.4)
+        assert record.act_point is None
+
+    def test_from_fields__missing_handle_raises(self):
+        with pytest.raises(KeyError):
+            EntityRecord.from_fields({"type": "2000"})
+
+    def test_has_no_instance_dict(self):
+        record = EntityRecord(h="00010001", type=2000)
+
+        assert not hasattr(record, "__dict__")
+
+
+class TestConstraintRecord:
+    def test_from_fields__converts_values(self):
+        record = ConstraintRecord.from_fields(
+            {
+                "h.v": "0000000d",
+                "type": "120",
+                "group.v": "00000002",
+                "workplane.v": "80020000",
+                "valA": "45.00000000000000000000",
+                "entityA.v": "000a0000",
+                "entityB.v": "00090000",
+                "other": "1",
+                "other2": "0",
+                "reference": "0",
+                "disp.offset.x": "17.2",
+            }
+        )
+
+        assert record == ConstraintRecord(
+            h="0000000d",
+            type=120,
+            workplane="80020000",
+            val_a=45.0,
+            entity_a="000a0000",
+            entity_b="00090000",
+            other=True,
+            group="00000002",
+        )
+
+    def test_from_fields__defaults(self):
+        record = ConstraintRecord.from_fields({"type": "20"})
+
+        assert record.h is None
+        assert record.val_a == 0.0
+        assert record.other is False
+        assert record.workplane is None
+
+    def test_has_no_instance_dict(self):
+        record = ConstraintRecord(h="00000001", type=20)
+
+        assert not hasattr(record, "__dict__")
+
+
+class TestParamRecord:
+    def test_from_fields__handle_has_trailing_dot(self):
+        record = ParamRecord.from_fields({"h.v.": "00010020", "val": "1.5"})
+
+        assert record == ParamRecord(h=0x00010020, val=1.5)
+
+    def test_from_fields__missing_value_defaults_to_zero(self):
+        assert ParamRecord.from_fields({"h.v.": "00010010"}).val == 0.0
+
+
+class TestGroupRecord:
+    def test_from_fields__converts_values(self):
+        record = GroupRecord.from_fields(
+            {
+                "h.v": "00000002",
+                "type": "5001",
+                "order": "1",
+                "name": "sketch-in-plane",
+                "remap": "{",
+            }
+        )
+
+        assert record == GroupRecord(
+            h="00000002", type=5001, order=1, name="sketch-in-plane"
+        )
+
+    def test_from_fields__order_defaults_to_zero(self):
+        record = GroupRecord.from_fields({"h.v": "00000001", "type": "5000"})
+
+        assert record.order == 0
+
+
+class TestRequestRecord:
+    def test_from_fields__converts_values(self):
+        record = RequestRecord.from_fields(
+            {
+                "h.v": "00000004",
+                "type": "101",
+                "workplane.v": "80020000",
+                "group.v": "00000002",
+                "construction": "0",
+            }
+        )
+
+        assert record == RequestRecord(
+            h="00000004", type=101, group="00000002", workplane="80020000"
+        )
@@ -0,0 +1,114 @@
+from collections import Counter
+
+import pytest
+
+from python_solvespace import ResultFlag
+from slvstopy import Slvstopy
+from slvstopy.reuse import ReusableSystem
+
+FILE_PATH = "tests/files/crank_rocker.slvs"
+
+
+class KeptSystem(object):
+    """A backend system that survives solving, moving every parameter by one."""
+
+    def __init__(self):
+        self.values = {}
+        self.solves = 0
+
+    def add_point_2d(self, u, v):
+        handle = len(self.values)
+        self.values[handle] = (u, v)
+        return Point(handle)
+
+    def set_params(self, handle, values):
+        self.values[handle] = tuple(values)
+
+    def params(self, handle):
+        return self.values[handle]
+
+    def constraints(self):
+        return Counter({"where dragged": 1})
+
+    def solve(self):
+        self.solves += 1
+        for handle, values in self.values.items():
+            self.values[handle] = tuple(value + 1.0 for value in values)
+        return ResultFlag.OKAY
+
+
+class Point(object):
+    def __init__(self, params):
+        self.params = params
+
+
+class KeptPlan(object):
+    """Just enough of a ConstructionPlan to build KeptSystems."""
+
+    def __init__(self):
+        self.operations = [(KeptSystem.add_point_2d, 0, (1.0, 2.0), ())]
+        self.entity_slots = {"00040000": 0}
+        self.entity_params = {"00040000": (0, (0, 1))}
+        self.built = 0
+
+    def patch(self, overrides, positions):
+        return self.operations
+
+    def build(self, operations):
+        self.built += 1
+        system = KeptSystem()
+        return system, [method(system, *args) for method, _, args, _ in operations]
+
+
+class TestReusableSystem:
+    def test_reuses_a_kept_system(self):
+        plan = KeptPlan()
+        reusable = ReusableSystem(plan)
+
+        reusable.solve()
+        result, system, entities = reusable.solve()
+
+        assert result == ResultFlag.OKAY
+        assert plan.built == 1
+        assert system.solves == 2
+        # Solved from the restored initial parameters, not the last solution
+        assert system.params(entities["00040000"].params) == (2.0, 3.0)
+        assert reusable.reusable is True
+        assert (reusable.reused, reusable.rebuilt) == (1, 1)
+
+    def test_changed_dimensions_rebuild(self):
+        plan = KeptPlan()
+        reusable = ReusableSystem(plan)
+
+        reusable.solve()
+        reusable.solve({"0000000d": 60.0})
+
+        assert plan.built == 2
+        assert reusable.rebuilt == 2
+
+    def test_falls_back_when_the_backend_frees_systems(self):
+        system_factory = Slvstopy(file_path=FILE_PATH)
+        reusable = system_factory.reusable_system()
+        expected = system_factory.solve()
+
+        for _ in range(3):
+            result, system, entities = reusable.solve()
+            assert result == ResultFlag.OKAY
+            assert system.params(entities["00070000"].params) == pytest.approx(
+                tuple(expected["00070000"])
+            )
+
+        assert reusable.reusable is False
+        assert reusable.rebuilt == 3
+
+    def test_overrides(self):
+        system_factory = Slvstopy(file_path=FILE_PATH)
+        reusable = system_factory.reusable_system()
+        expected = system_factory.solve({"0000000d": 60.0})
+
+        result, system, entities = reusable.solve({"0000000d": 60.0})
+
+        assert result == ResultFlag.OKAY
+        assert system.params(entities["00070000"].params) == pytest.approx(
+            tuple(expected["00070000"])
+        )
@@ -0,0 +1,130 @@
+import math
+import numpy as np
+import pytest
+
+from python_solvespace import ResultFlag
+from slvstopy import Slvstopy
+from slvstopy.sweep import parallel_sweep, sweep
+
+
+class TestSweep:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+    def test_sweep_shape(self):
+        result = self.system_factory.sweep(
+            "0000000d", np.linspace(30.0, 90.0, 7), track=["00060000", "00070000"]
+        )
+
+        assert result.coordinates.shape == (7, 2, 2)
+        assert result.results.shape == (7,)
+        assert result.handles == ("00060000", "00070000")
+        assert (result.results == ResultFlag.OKAY).all()
+
+    def test_sweep_matches_generate_system(self):
+        values = [45.0, 60.0, 75.0]
+        result = self.system_factory.sweep(
+            "0000000d", values, track=["00060000", "00070000"]
+        )
+
+        for step, value in enumerate(values):
+            system, entities = self.system_factory.generate_system(
+                overrides={"0000000d": value}
+            )
+            assert system.solve() == result.results[step]
+            for point, entity_id in enumerate(result.handles):
+                assert system.params(entities[entity_id].params) == pytest.approx(
+                    tuple(result.coordinates[step, point])
+                )
+
+    def test_sweep_follows_crank_angle(self):
+        result = self.system_factory.sweep("0000000d", [60.0], track=["00060000"])
+
+        x, y = result.coordinates[0, 0]
+        assert math.degrees(math.atan2(y, x)) == pytest.approx(60.0)
+        assert math.hypot(x, y) == pytest.approx(35.0)
+
+    def test_sweep_pads_missing_parameters(self):
+        result = self.system_factory.sweep(
+            "0000000d", [60.0], track=["00060000", "00090000"]
+        )
+
+        assert result.coordinates.shape == (1, 2, 2)
+        assert np.isnan(result.coordinates[0, 1]).all()
+
+    def test_sweep_unknown_constraint_raises(self):
+        with pytest.raises(KeyError):
+            self.system_factory.sweep("00000008", [1.0], track=["00060000"])
+
+
+class TestParallelSweep:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+
+    def test_parallel_sweep_matches_sweep(self):
+        values = np.linspace(0.0, 350.0, 36)
+        track = ["00060000", "00070000", "00090000"]
+
+        expected = self.system_factory.sweep("0000000d", values, track=track)
+        result = self.system_factory.sweep("0000000d", values, track=track, workers=2)
+
+        np.testing.assert_array_equal(result.results, expected.results)
+        np.testing.assert_allclose(result.coordinates, expected.coordinates)
+
+    def test_parallel_sweep_uneven_chunks(self):
+        values = np.linspace(30.0, 90.0, 7)
+        plan = self.system_factory.compile()
+
+        expected = sweep(plan, "0000000d", values, track=["00070000"])
+        result = parallel_sweep(
+            plan, "0000000d", values, track=["00070000"], workers=2, chunk_size=3
+        )
+
+        np.testing.assert_allclose(result.coordinates, expected.coordinates)
+
+    def test_parallel_sweep_empty(self):
+        result = self.system_factory.sweep(
+            "0000000d", [], track=["00070000"], workers=1
+        )
+
+        assert result.coordinates.shape == (0, 1, 2)
+        assert result.results.shape == (0,)
+
+
+class TestWarmStartSweep:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path="tests/files/crank_rocker.slvs")
+        self.values = np.linspace(10.0, 170.0, 33)
+        self.track = ["00060000", "00070000"]
+
+    @pytest.mark.parametrize(
+        "options", [{"warm_start": True}, {"extrapolate": True}],
+    )
+    def test_warm_start_matches_cold_start(self, options):
+        expected = self.system_factory.sweep("0000000d", self.values, self.track)
+        result = self.system_factory.sweep(
+            "0000000d", self.values, self.track, **options
+        )
+
+        assert (result.results == ResultFlag.OKAY).all()
+        np.testing.assert_allclose(result.coordinates, expected.coordinates, atol=1e-6)
+
+    def test_durations(self):
+        result = self.system_factory.sweep(
+            "0000000d", self.values, self.track, warm_start=True
+        )
+
+        assert result.durations.shape == (33,)
+        assert (result.durations > 0).all()
+
+    def test_parallel_warm_start(self):
+        expected = self.system_factory.sweep("0000000d", self.values, self.track)
+        result = self.system_factory.sweep(
+            "0000000d", self.values, self.track, workers=2, extrapolate=True
+        )
+
+        np.testing.assert_allclose(result.coordinates, expected.coordinates, atol=1e-6)
+        assert (result.durations > 0).all()
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from python_solvespace import ResultFlag
+from slvstopy import Instrumentation, Slvstopy
+
+FILE_PATH = "tests/files/crank_rocker.slvs"
+
+
+class TestGenerateSystems:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.system_factory = Slvstopy(file_path=FILE_PATH)
+
+    def test_systems_are_independent(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            systems = self.system_factory.generate_systems(
+                8, overrides={"0000000d": 60.0}, executor=executor
+            )
+
+        assert len({id(system) for system, _ in systems}) == 8
+        expected = self.system_factory.solve({"0000000d": 60.0})
+        for system, entities in systems:
+            assert system.solve() == ResultFlag.OKAY
+            assert system.params(entities["00070000"].params) == pytest.approx(
+                tuple(expected["00070000"])
+            )
+
+    def test_without_executor(self):
+        systems = self.system_factory.generate_systems(3)
+
+        assert len(systems) == 3
+        assert systems[0][0] is not systems[1][0]
+
+
+class TestConcurrentSolves:
+    def test_first_solves_race(self):
+        instrumentation = Instrumentation()
+        system_factory = Slvstopy(file_path=FILE_PATH, instrumentation=instrumentation)
+        angles = [30.0 + index for index in range(16)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda angle: system_factory.solve({"0000000d": angle}), angles
+                )
+            )
+
+        assert instrumentation.report.calls["entities"] == 1
+        assert instrumentation.report.calls["solve"] == len(angles)
+        for angle, result in zip(angles, results):
+            expected = Slvstopy(file_path=FILE_PATH).solve({"0000000d": angle})
+            assert result.rows == expected.rows
+            assert result["00070000"] == pytest.approx(expected["00070000"])